@@ -0,0 +1,456 @@
+# Benchmark the import and the export of a synthetic SBML model
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import libsbml
+from neo4jsbml import _version, arrows, memory, sbml
+
+PHASES = [
+    "from_sbml",
+    "format_nodes",
+    "format_relationships",
+    "write_nodes",
+    "write_relationships",
+    "annotate",
+    "extract_entities",
+]
+
+
+def generate(
+    path: str,
+    species: int,
+    reactions: int,
+    genes: int,
+    groups: int,
+    layout: bool,
+    compartments: int = 3,
+) -> Dict[str, int]:
+    """Write a synthetic genome-scale model: species, reactions, fbc gene products, groups and layout.
+    The model is deterministic given its size.
+
+    Parameters
+    ----------
+    path: str
+        the SBML file to write
+    species: int
+        number of species
+    reactions: int
+        number of reactions, each one has two reactants and two products
+    genes: int
+        number of fbc gene products
+    groups: int
+        number of groups, reactions are distributed over them
+    layout: bool
+        add a layout with a glyph by species
+    compartments: int (default: 3)
+        number of compartments
+
+    Return
+    ------
+    Dict[str, int]
+        number of elements written
+    """
+    sbmlns = libsbml.SBMLNamespaces(3, 1, "fbc", 2)
+    sbmlns.addPackageNamespace("groups", 1)
+    if layout:
+        sbmlns.addPackageNamespace("layout", 1)
+    document = libsbml.SBMLDocument(sbmlns)
+    document.setPackageRequired("fbc", False)
+    document.setPackageRequired("groups", False)
+    if layout:
+        document.setPackageRequired("layout", False)
+
+    model = document.createModel()
+    model.setId("synthetic")
+    model.setName("Synthetic model")
+    model_fbc = model.getPlugin("fbc")
+    model_fbc.setStrict(True)
+
+    unit_definition = model.createUnitDefinition()
+    unit_definition.setId("mmol_per_gDW_per_hr")
+    for kind, exponent, scale in [
+        (libsbml.UNIT_KIND_MOLE, 1, -3),
+        (libsbml.UNIT_KIND_GRAM, -1, 0),
+        (libsbml.UNIT_KIND_SECOND, -1, 0),
+    ]:
+        unit = unit_definition.createUnit()
+        unit.setKind(kind)
+        unit.setExponent(exponent)
+        unit.setScale(scale)
+        unit.setMultiplier(1)
+
+    for ident, value in [("default_lb", -1000.0), ("default_ub", 1000.0)]:
+        parameter = model.createParameter()
+        parameter.setId(ident)
+        parameter.setValue(value)
+        parameter.setConstant(True)
+        parameter.setSBOTerm(626)
+        parameter.setUnits("mmol_per_gDW_per_hr")
+
+    for ix in range(compartments):
+        compartment = model.createCompartment()
+        compartment.setId("c%s" % (ix,))
+        compartment.setName("Compartment %s" % (ix,))
+        compartment.setConstant(True)
+
+    for ix in range(species):
+        spe = model.createSpecies()
+        spe.setId("M_s%s" % (ix,))
+        spe.setName("Species %s" % (ix,))
+        spe.setMetaId("meta_M_s%s" % (ix,))
+        spe.setCompartment("c%s" % (ix % compartments,))
+        spe.setHasOnlySubstanceUnits(False)
+        spe.setBoundaryCondition(False)
+        spe.setConstant(False)
+        spe_fbc = spe.getPlugin("fbc")
+        spe_fbc.setCharge(ix % 3 - 1)
+        spe_fbc.setChemicalFormula("C%sH%sO%s" % (ix % 10 + 1, ix % 20 + 1, ix % 5))
+
+    for ix in range(genes):
+        gene = model_fbc.createGeneProduct()
+        gene.setId("G_g%s" % (ix,))
+        gene.setLabel("g%s" % (ix,))
+        gene.setName("Gene %s" % (ix,))
+
+    for ix in range(reactions):
+        rxn = model.createReaction()
+        rxn.setId("R_r%s" % (ix,))
+        rxn.setName("Reaction %s" % (ix,))
+        rxn.setMetaId("meta_R_r%s" % (ix,))
+        rxn.setReversible(ix % 2 == 0)
+        rxn.setFast(False)
+        for jx, create in enumerate(
+            [
+                rxn.createReactant,
+                rxn.createReactant,
+                rxn.createProduct,
+                rxn.createProduct,
+            ]
+        ):
+            ref = create()
+            ref.setSpecies("M_s%s" % ((ix * 4 + jx) % max(species, 1),))
+            ref.setStoichiometry(jx + 1)
+            ref.setConstant(True)
+        rxn_fbc = rxn.getPlugin("fbc")
+        rxn_fbc.setLowerFluxBound("default_lb")
+        rxn_fbc.setUpperFluxBound("default_ub")
+        if genes > 0:
+            association = rxn_fbc.createGeneProductAssociation()
+            association.setAssociation(
+                "G_g%s or G_g%s" % (ix % genes, (ix + 1) % genes),
+                True,
+                False,
+            )
+
+    objective = model_fbc.createObjective()
+    objective.setId("obj")
+    objective.setType("maximize")
+    model_fbc.setActiveObjectiveId("obj")
+    if reactions > 0:
+        flux = objective.createFluxObjective()
+        flux.setReaction("R_r0")
+        flux.setCoefficient(1.0)
+
+    model_groups = model.getPlugin("groups")
+    for ix in range(groups):
+        group = model_groups.createGroup()
+        group.setId("g%s" % (ix,))
+        group.setName("Group %s" % (ix,))
+        group.setKind(libsbml.GROUP_KIND_PARTONOMY)
+        for jx in range(ix, reactions, groups):
+            member = group.createMember()
+            member.setIdRef("R_r%s" % (jx,))
+
+    glyphs = 0
+    if layout:
+        model_layout = model.getPlugin("layout")
+        lay = model_layout.createLayout()
+        lay.setId("layout")
+        lay.getDimensions().setWidth(1000.0)
+        lay.getDimensions().setHeight(1000.0)
+        for ix in range(species):
+            glyph = lay.createSpeciesGlyph()
+            glyph.setId("glyph_M_s%s" % (ix,))
+            glyph.setSpeciesId("M_s%s" % (ix,))
+            box = glyph.getBoundingBox()
+            box.setId("bb_M_s%s" % (ix,))
+            box.setX(float(ix % 100) * 10.0)
+            box.setY(float(ix // 100) * 10.0)
+            box.setWidth(5.0)
+            box.setHeight(5.0)
+            glyphs += 1
+
+    if not libsbml.writeSBMLToFile(document, path):
+        raise ValueError("Unable to write the model: %s" % (path,))
+    return dict(
+        species=species,
+        reactions=reactions,
+        genes=genes,
+        groups=groups,
+        glyphs=glyphs,
+        compartments=compartments,
+    )
+
+
+def measure(func: Callable[[], Any], memory: bool) -> Dict[str, Any]:
+    """Run a function, return its result with the time elapsed and the peak of memory allocated.
+
+    Parameters
+    ----------
+    func: Callable[[], Any]
+        a function without argument
+    memory: bool
+        track the peak of memory with tracemalloc
+
+    Return
+    ------
+    Dict[str, Any]
+    """
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    res = func()
+    duration = time.perf_counter() - start
+    peak = None
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return dict(result=res, time=duration, peak_memory=peak)
+
+
+def run(
+    path: str, modelisation_path: str, processes: int, memory_tracking: bool
+) -> Dict[str, Dict[str, Any]]:
+    """Run each phase of the import and the export of a model once.
+
+    Parameters
+    ----------
+    path: str
+        a SBML file
+    modelisation_path: str
+        an Arrows file
+    processes: int
+        number of workers to map the schema to the data
+    memory_tracking: bool
+        track the peak of memory
+
+    Return
+    ------
+    Dict[str, Dict[str, Any]]
+        time and peak of memory by phase, with the number of entities
+    """
+    phases: Dict[str, Dict[str, Any]] = {}
+    modelisation = arrows.Arrows.from_json(path=modelisation_path)
+    con = memory.Memory()
+
+    def _phase(name: str, func: Callable[[], Any]) -> Any:
+        res = measure(func=func, memory=memory_tracking)
+        phases[name] = dict(time=res["time"], peak_memory=res["peak_memory"])
+        return res["result"]
+
+    sbm = _phase(
+        "from_sbml", lambda: sbml.SbmlToNeo4j.from_sbml(path=path, tag="benchmark")
+    )
+    nodes = _phase(
+        "format_nodes",
+        lambda: sbm.format_nodes(nodes=modelisation.nodes, processes=processes),
+    )
+    phases["format_nodes"]["count"] = len(nodes)
+    rels: List = []
+    if modelisation.relationships:
+        rels = _phase(
+            "format_relationships",
+            lambda: sbm.format_relationships(
+                relationships=modelisation.relationships, processes=processes
+            ),
+        )
+        phases["format_relationships"]["count"] = len(rels)
+    _phase("write_nodes", lambda: con.create_nodes(nodes=nodes))
+    _phase("write_relationships", lambda: con.create_relationships(relationships=rels))
+
+    sfn = sbml.SbmlFromNeo4j.from_specifications(
+        connection=con,
+        level=sbm.document.getLevel(),
+        version=sbm.document.getVersion(),
+    )
+    export_modelisation = arrows.Arrows.from_json(path=modelisation_path, add_id=False)
+    _phase("annotate", lambda: sfn.annotate(modelisation=export_modelisation))
+
+    def _extract() -> None:
+        sfn.conciliate_labels()
+        sfn.extract_entities()
+
+    _phase("extract_entities", _extract)
+    return phases
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> List[str]:
+    """Format the ratio between two reports, phase by phase.
+
+    Parameters
+    ----------
+    current: Dict[str, Any]
+        the report of this run
+    previous: Dict[str, Any]
+        a report of a previous run
+
+    Return
+    ------
+    List[str]
+        lines of a table
+    """
+    lines = []
+    if current.get("model") != previous.get("model"):
+        lines.append("Models differ, ratios are not comparable")
+    lines.append(
+        "%-22s %12s %12s %8s %8s" % ("phase", "time", "previous", "ratio", "memory")
+    )
+    for name in PHASES:
+        cur = current["phases"].get(name)
+        pre = previous.get("phases", {}).get(name)
+        if cur is None or pre is None:
+            continue
+        ratio = cur["time"] / pre["time"] if pre["time"] > 0 else float("nan")
+        mem_ratio = "-"
+        if cur.get("peak_memory") and pre.get("peak_memory"):
+            mem_ratio = "%.2f" % (cur["peak_memory"] / pre["peak_memory"],)
+        lines.append(
+            "%-22s %12.4f %12.4f %8.2f %8s"
+            % (name, cur["time"], pre["time"], ratio, mem_ratio)
+        )
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--input-arrows-json",
+        required=True,
+        help="Modelisation file, Arrows .json",
+    )
+    parser.add_argument(
+        "--input-model-sbml",
+        help="Model to benchmark instead of a synthetic one, .xml or .xml.gz",
+    )
+    parser.add_argument(
+        "--input-report-json",
+        help="Report of a previous run to compare with, .json",
+    )
+    parser.add_argument(
+        "--parameter-species-int",
+        type=int,
+        default=2000,
+        help="Number of species of the synthetic model",
+    )
+    parser.add_argument(
+        "--parameter-reaction-int",
+        type=int,
+        default=2500,
+        help="Number of reactions of the synthetic model",
+    )
+    parser.add_argument(
+        "--parameter-gene-int",
+        type=int,
+        default=1500,
+        help="Number of fbc gene products of the synthetic model",
+    )
+    parser.add_argument(
+        "--parameter-group-int",
+        type=int,
+        default=100,
+        help="Number of groups of the synthetic model",
+    )
+    parser.add_argument(
+        "--parameter-layout",
+        action="store_true",
+        help="Add a layout to the synthetic model",
+    )
+    parser.add_argument(
+        "--parameter-repeat-int",
+        type=int,
+        default=1,
+        help="Number of runs, the fastest one is reported by phase",
+    )
+    parser.add_argument(
+        "--parameter-process-int",
+        type=int,
+        default=1,
+        help="Number of workers to map the schema to the data",
+    )
+    parser.add_argument(
+        "--parameter-no-memory",
+        action="store_true",
+        help="Do not track memory, tracemalloc slows down the run",
+    )
+    parser.add_argument(
+        "--output-report-json",
+        required=True,
+        help="Report, .json",
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input_arrows_json):
+        parser.error("File does not exist: %s" % (args.input_arrows_json,))
+    if args.parameter_repeat_int < 1:
+        parser.error("--parameter-repeat-int must be greater than 0")
+
+    tmp = None
+    model_path = args.input_model_sbml
+    model: Dict[str, Any] = dict(path=model_path)
+    if model_path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".xml")
+        model_path = tmp.name
+        model = generate(
+            path=model_path,
+            species=args.parameter_species_int,
+            reactions=args.parameter_reaction_int,
+            genes=args.parameter_gene_int,
+            groups=args.parameter_group_int,
+            layout=args.parameter_layout,
+        )
+    elif not os.path.isfile(model_path):
+        parser.error("File does not exist: %s" % (model_path,))
+
+    best: Dict[str, Dict[str, Any]] = {}
+    for _ in range(args.parameter_repeat_int):
+        phases = run(
+            path=model_path,
+            modelisation_path=args.input_arrows_json,
+            processes=args.parameter_process_int,
+            memory_tracking=not args.parameter_no_memory,
+        )
+        for name, value in phases.items():
+            if name not in best.keys() or value["time"] < best[name]["time"]:
+                best[name] = value
+    if tmp is not None:
+        tmp.close()
+
+    report = dict(
+        version=_version.__version__,
+        python=sys.version.split()[0],
+        platform=platform.platform(),
+        libsbml=libsbml.LIBSBML_DOTTED_VERSION,
+        arrows=os.path.basename(args.input_arrows_json),
+        model=model,
+        repeat=args.parameter_repeat_int,
+        processes=args.parameter_process_int,
+        phases=best,
+        total=sum(x["time"] for x in best.values()),
+    )
+    with open(args.output_report_json, "w") as fod:
+        json.dump(report, fod, indent=4)
+
+    if args.input_report_json:
+        with open(args.input_report_json) as fid:
+            previous = json.load(fid)
+        for line in compare(current=report, previous=previous):
+            print(line)
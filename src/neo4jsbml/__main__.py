@@ -3,18 +3,66 @@ import json
 import logging
 import os
 import sys
+from typing import TYPE_CHECKING, Optional
 
-from neo4jsbml import _version, arrows, connect, options, sbml
+# Heavy dependencies, libsbml, networkx and neo4j, are imported by each command
+from neo4jsbml import _version, metrics, options
+
+if TYPE_CHECKING:
+    from neo4jsbml import connect, shard
 
 AP = argparse.ArgumentParser(description="")
 AP_subparsers = AP.add_subparsers(help="Sub-commnands (use with -h for more info)")
 
 
+def _connect(args) -> "connect.Connect":
+    """Create a connection from the arguments of the command line"""
+    from neo4jsbml import connect
+
+    if args.input_config_ini:
+        if not os.path.isfile(args.input_config_ini):
+            logging.error("File provided does not exist: %s" % (args.input_config_ini,))
+            AP.exit(1)
+        logging.warning("Configuration file is provided, ignore indiviual arguments")
+        return connect.Connect.from_config(path=args.input_config_ini)
+    elif args.input_auradb_txt:
+        if not os.path.isfile(args.input_auradb_txt):
+            logging.error("File provided does not exist: %s" % (args.input_auradb_txt,))
+            AP.exit(1)
+        logging.warning(
+            "Configuration file AuraDB is provided, ignore indiviual arguments"
+        )
+        return connect.Connect.from_auradb(path=args.input_auradb_txt)
+    return connect.Connect(
+        protocol=args.input_protocol_str,
+        url=args.input_url_str,
+        port=args.input_port_int,
+        user=args.input_user_str,
+        database=args.input_database_str,
+        password_path=args.input_password_txt,
+    )
+
+
+def _shards(args) -> Optional["shard.Shards"]:
+    """Create the shards from the arguments of the command line, if provided"""
+    if not args.input_shards_ini:
+        return None
+    from neo4jsbml import shard
+
+    if not os.path.isfile(args.input_shards_ini):
+        logging.error("File provided does not exist: %s" % (args.input_shards_ini,))
+        AP.exit(1)
+    logging.warning("Shards file is provided, ignore other connection arguments")
+    return shard.Shards.from_config(path=args.input_shards_ini)
+
+
 def _cmd_sbml_to_neo4j(args):
     """Import SBML file into Neo4j"""
+    from neo4jsbml import arrows, compressed, pipeline
+
     # Check arguments.
     logging.info("Start - sbml-to-neo4j")
-    if not os.path.isfile(args.input_model_sbml):
+    if not compressed.exists(path=args.input_model_sbml):
         logging.error("Model SBML file does not exist: %s" % (args.input_model_sbml,))
         AP.exit(1)
     if not os.path.isfile(args.input_arrows_json):
@@ -22,6 +70,16 @@ def _cmd_sbml_to_neo4j(args):
             "Modelisation JSON file does not exist: %s" % (args.input_arrows_json,)
         )
         AP.exit(1)
+    if args.parameter_process_int < 1:
+        logging.error(
+            "Number of processes must be greater than 0: %s"
+            % (args.parameter_process_int,)
+        )
+        AP.exit(1)
+
+    if args.parameter_incremental and args.parameter_tag_property_str is None:
+        logging.error("Incremental mode requires a tag")
+        AP.exit(1)
 
     is_dry_run = False
     if args.parameter_dry_run:
@@ -30,61 +88,31 @@ def _cmd_sbml_to_neo4j(args):
 
     # Connection to database
     logging.info("Connection to database")
-    con = None
-    if args.input_config_ini:
-        if not os.path.isfile(args.input_config_ini):
-            logging.error("File provided does not exist: %s" % (args.input_config_ini,))
-            AP.exit(1)
-        logging.warning("Configuration file is provided, ignore indiviual arguments")
-        con = connect.Connect.from_config(path=args.input_config_ini)
-    elif args.input_auradb_file:
-        if not os.path.isfile(args.input_auradb_txt):
-            logging.error("File provided does not exist: %s" % (args.input_auradb_txt,))
-            AP.exit(1)
-        logging.warning(
-            "Configuration file AuraDB is provided, ignore indiviual arguments"
-        )
-        con = connect.Connect.from_auradb(path=args.input_auradb_txt)
+    shards = _shards(args=args)
+    if shards:
+        logging.info("Shard: %s" % (shards.route(tag=args.parameter_tag_property_str),))
+        con = shards.connection(tag=args.parameter_tag_property_str)
     else:
-        con = connect.Connect(
-            protocol=args.input_protocol_str,
-            url=args.input_url_str,
-            port=args.input_port_int,
-            user=args.input_user_str,
-            database=args.input_database_str,
-            password_path=args.input_password_txt,
-        )
+        con = _connect(args=args)
     if con.is_connected() is False and is_dry_run is False:
         logging.error("Unable to connect to the database")
         AP.exit(1)
 
-    # Load model
-    logging.info("Load SBML file")
-    sbm = sbml.SbmlToNeo4j.from_sbml(
-        path=args.input_model_sbml, tag=args.parameter_tag_property_str
-    )
-
     # Load modelisation
     logging.info("Load modelisation file")
     arr = arrows.Arrows.from_json(path=args.input_arrows_json)
 
-    # Mapping
-    logging.info("Map schema to data - nodes")
-    nod = sbm.format_nodes(nodes=arr.nodes)
-
-    logging.info("Map schema to data - relationships")
-    rel = sbm.format_relationships(relationships=arr.relationships)
-
-    # Import into neo4j
-    if is_dry_run is False:
-        logging.info("Import into neo4j - nodes")
-        con.create_nodes(nodes=nod)
-
-        if arr.relationships is not None and len(arr.relationships) > 0:
-            logging.info("Import into neo4j - relationships")
-            con.create_relationships(relationships=rel)
-        else:
-            logging.info("None relationship created")
+    pipeline.import_model(
+        connection=con,
+        modelisation=arr,
+        path=args.input_model_sbml,
+        tag=args.parameter_tag_property_str,
+        dry_run=is_dry_run,
+        processes=args.parameter_process_int,
+        skip_unchanged=args.parameter_skip_unchanged,
+        incremental=args.parameter_incremental,
+        streaming=args.parameter_streaming,
+    )
 
     logging.info("End - sbml-to-neo4j")
     return 0
@@ -92,6 +120,7 @@ def _cmd_sbml_to_neo4j(args):
 
 P_stn = AP_subparsers.add_parser("sbml-to-neo4j", help=_cmd_sbml_to_neo4j.__doc__)
 options.add_dbb_connection(parser=P_stn)
+options.add_input_shards(parser=P_stn)
 # Input
 P_stn_input = P_stn.add_argument_group("Input")
 options.add_input_model(parser=P_stn_input)
@@ -103,15 +132,160 @@ P_stn_params.add_argument(
     action="store_true",
     help="Dry run: parse Schema file only",
 )
+options.add_parameter_process(parser=P_stn_params)
+options.add_parameter_skip_unchanged(parser=P_stn_params)
+options.add_parameter_incremental(parser=P_stn_params)
+options.add_parameter_streaming(parser=P_stn_params)
 P_stn_input.add_argument(
     "--parameter-tag-property-str",
     help='Add a "tag" property for each entity, to set a custom ID',
 )
+options.add_output_metrics(parser=P_stn)
+options.add_profile(parser=P_stn)
 P_stn.set_defaults(func=_cmd_sbml_to_neo4j)
 
 
+def _cmd_sbml_to_neo4j_batch(args):
+    """Import several SBML files into Neo4j"""
+    from neo4jsbml import arrows, pipeline
+
+    # Check arguments.
+    logging.info("Start - sbml-to-neo4j-batch")
+    if not os.path.isfile(args.input_arrows_json):
+        logging.error(
+            "Modelisation JSON file does not exist: %s" % (args.input_arrows_json,)
+        )
+        AP.exit(1)
+    if args.parameter_worker_int < 1:
+        logging.error(
+            "Number of workers must be greater than 0: %s"
+            % (args.parameter_worker_int,)
+        )
+        AP.exit(1)
+    models = []
+    if args.input_model_dir:
+        if not os.path.isdir(args.input_model_dir):
+            logging.error("Directory does not exist: %s" % (args.input_model_dir,))
+            AP.exit(1)
+        models = pipeline.list_models(path=args.input_model_dir)
+    elif args.input_model_archive:
+        if not os.path.isfile(args.input_model_archive):
+            logging.error("Archive does not exist: %s" % (args.input_model_archive,))
+            AP.exit(1)
+        models = pipeline.list_archive(path=args.input_model_archive)
+    else:
+        if not os.path.isfile(args.input_manifest_tsv):
+            logging.error("Manifest does not exist: %s" % (args.input_manifest_tsv,))
+            AP.exit(1)
+        models = pipeline.read_manifest(path=args.input_manifest_tsv)
+    logging.info("Number of models found: %s" % (len(models),))
+
+    is_dry_run = False
+    if args.parameter_dry_run:
+        logging.info("Dry run mode, no data will be loaded into the database")
+        is_dry_run = True
+
+    # Connection to database
+    logging.info("Connection to database")
+    con = _shards(args=args) or _connect(args=args)
+    if con.is_connected() is False and is_dry_run is False:
+        logging.error("Unable to connect to the database")
+        AP.exit(1)
+
+    # Load modelisation
+    logging.info("Load modelisation file")
+    arr = arrows.Arrows.from_json(path=args.input_arrows_json)
+
+    # Import
+    reports = pipeline.import_models(
+        connection=con,
+        modelisation=arr,
+        models=models,
+        dry_run=is_dry_run,
+        workers=args.parameter_worker_int,
+        skip_unchanged=args.parameter_skip_unchanged,
+        incremental=args.parameter_incremental,
+        streaming=args.parameter_streaming,
+    )
+    failures = [x for x in reports if x["status"] == "failure"]
+    for report in reports:
+        logging.info(
+            "Model: %s, tag: %s, shard: %s, status: %s, skipped: %s, duration: %.2fs"
+            % (
+                report["path"],
+                report["tag"],
+                report.get("shard"),
+                report["status"],
+                report.get("skipped", False),
+                report["duration"],
+            )
+        )
+
+    # Write output
+    if args.output_report_json:
+        logging.info("Write output")
+        with open(args.output_report_json, "w") as fod:
+            json.dump(reports, fod, indent=4)
+
+    if len(failures) > 0:
+        logging.error("Number of models failed: %s" % (len(failures),))
+        AP.exit(1)
+    logging.info("End - sbml-to-neo4j-batch")
+    return 0
+
+
+P_stnb = AP_subparsers.add_parser(
+    "sbml-to-neo4j-batch", help=_cmd_sbml_to_neo4j_batch.__doc__
+)
+options.add_dbb_connection(parser=P_stnb)
+options.add_input_shards(parser=P_stnb)
+# Input
+P_stnb_input = P_stnb.add_argument_group("Input")
+P_stnb_models = P_stnb_input.add_mutually_exclusive_group(required=True)
+P_stnb_models.add_argument(
+    "--input-model-dir",
+    help="Directory of SBML files, the tag is built from the file name",
+)
+P_stnb_models.add_argument(
+    "--input-model-archive",
+    help="Zip or tar archive of SBML files, read member by member without extraction",
+)
+P_stnb_models.add_argument(
+    "--input-manifest-tsv",
+    help="Tabulated file listing a SBML file and an optional tag by line",
+)
+options.add_input_modelisation(parser=P_stnb_input)
+# Parameters
+P_stnb_params = P_stnb.add_argument_group("Parameters")
+P_stnb_params.add_argument(
+    "--parameter-dry-run",
+    action="store_true",
+    help="Dry run: parse Schema file only",
+)
+P_stnb_params.add_argument(
+    "--parameter-worker-int",
+    type=int,
+    default=1,
+    help="Number of models imported concurrently (default: 1)",
+)
+options.add_parameter_skip_unchanged(parser=P_stnb_params)
+options.add_parameter_incremental(parser=P_stnb_params)
+options.add_parameter_streaming(parser=P_stnb_params)
+# Output
+P_stnb_output = P_stnb.add_argument_group("Output")
+P_stnb_output.add_argument(
+    "--output-report-json",
+    help="Report by model: status, duration, number of entities",
+)
+options.add_output_metrics(parser=P_stnb)
+options.add_profile(parser=P_stnb)
+P_stnb.set_defaults(func=_cmd_sbml_to_neo4j_batch)
+
+
 def _cmd_sbml_from_neo4j(args):
     """Create SBML file from Neo4j"""
+    from neo4jsbml import arrows, sbml
+
     # Check arguments.
     logging.info("Start - sbml-from-neo4j")
     if not os.path.isfile(args.input_arrows_json):
@@ -122,30 +296,7 @@ def _cmd_sbml_from_neo4j(args):
 
     # Connection to database
     logging.info("Connection to database")
-    con = None
-    if args.input_config_ini:
-        if not os.path.isfile(args.input_config_ini):
-            logging.error("File provided does not exist: %s" % (args.input_config_ini,))
-            AP.exit(1)
-        logging.warning("Configuration file is provided, ignore indiviual arguments")
-        con = connect.Connect.from_config(path=args.input_config_ini)
-    elif args.input_auradb_file:
-        if not os.path.isfile(args.input_auradb_txt):
-            logging.error("File provided does not exist: %s" % (args.input_auradb_txt,))
-            AP.exit(1)
-        logging.warning(
-            "Configuration file AuraDB is provided, ignore indiviual arguments"
-        )
-        con = connect.Connect.from_auradb(path=args.input_auradb_txt)
-    else:
-        con = connect.Connect(
-            protocol=args.input_protocol_str,
-            url=args.input_url_str,
-            port=args.input_port_int,
-            user=args.input_user_str,
-            database=args.input_database_str,
-            password_path=args.input_password_txt,
-        )
+    con = _connect(args=args)
     if con.is_connected() is False:
         logging.error("Unable to connect to the database")
         AP.exit(1)
@@ -164,16 +315,19 @@ def _cmd_sbml_from_neo4j(args):
 
     # Filter modelisation based on libsbml
     logging.info("Filter modelisation based on libsbml")
-    sbml_from_neo4j.annotate(modelisation=arr)
+    with metrics.phase(name="annotate"):
+        sbml_from_neo4j.annotate(modelisation=arr)
 
     # Extract entities
     logging.info("Extract entities")
-    sbml_from_neo4j.conciliate_labels()
-    sbml_from_neo4j.extract_entities()
+    with metrics.phase(name="extract_entities"):
+        sbml_from_neo4j.conciliate_labels()
+        sbml_from_neo4j.extract_entities()
 
     # Write model
     logging.info("Write model")
-    sbml_from_neo4j.to_sbml(path=args.output_model_sbml)
+    with metrics.phase(name="to_sbml"):
+        sbml_from_neo4j.to_sbml(path=args.output_model_sbml)
 
     logging.info("End - sbml-from-neo4j")
     return 0
@@ -202,8 +356,10 @@ P_sfn_params.add_argument(
 P_sfn_output = P_sfn.add_argument_group("Output")
 P_sfn_output.add_argument(
     "--output-model-sbml",
-    help="Output the SBML model",
+    help='Output the SBML model, compressed according to its extension (gz, bz2, zip, xz, zst), "-" for the standard output',
 )
+options.add_output_metrics(parser=P_sfn)
+options.add_profile(parser=P_sfn)
 P_sfn.set_defaults(func=_cmd_sbml_from_neo4j)
 
 
@@ -211,47 +367,26 @@ def _cmd_stats(args):
     """Get statistics: entities and relationships"""
     # Check arguments.
     logging.info("Start - statistics")
+    if args.parameter_worker_int < 1:
+        logging.error(
+            "Number of workers must be greater than 0: %s"
+            % (args.parameter_worker_int,)
+        )
+        AP.exit(1)
     # Connection to database
     logging.info("Connection to database")
-    con = None
-    if args.input_config_ini:
-        if not os.path.isfile(args.input_config_ini):
-            logging.error("File provided does not exist: %s" % (args.input_config_ini,))
-            AP.exit(1)
-        logging.warning("Configuration file is provided, ignore indiviual arguments")
-        con = connect.Connect.from_config(path=args.input_config_ini)
-    elif args.input_auradb_file:
-        if not os.path.isfile(args.input_auradb_txt):
-            logging.error("File provided does not exist: %s" % (args.input_auradb_txt,))
-            AP.exit(1)
-        logging.warning(
-            "Configuration file AuraDB is provided, ignore indiviual arguments"
-        )
-        con = connect.Connect.from_auradb(path=args.input_auradb_txt)
-    else:
-        con = connect.Connect(
-            protocol=args.input_protocol_str,
-            url=args.input_url_str,
-            port=args.input_port_int,
-            user=args.input_user_str,
-            database=args.input_database_str,
-            password_path=args.input_password_txt,
-        )
+    con = _shards(args=args) or _connect(args=args)
     if con.is_connected() is False:
         logging.error("Unable to connect to the database")
         AP.exit(1)
 
     # Statistics
     logging.info("Get number of entities")
-    data = {}
-    query = "CALL db.labels() YIELD label CALL apoc.cypher.run('MATCH (:`'+label+'`) RETURN count(*) as count',{}) YIELD value RETURN label, value.count"
-    res = con.query(value=query, expect_data=True)
-    data["nodes"] = res
-
-    logging.info("Get number of relationships")
-    query = "CALL db.relationshipTypes() YIELD relationshipType as type CALL apoc.cypher.run('MATCH ()-[:`'+type+'`]->() RETURN count(*) as count',{}) YIELD value RETURN type, value.count"
-    res = con.query(value=query, expect_data=True)
-    data["relationships"] = res
+    data = con.query_statistics(
+        by_tag=args.parameter_by_tag,
+        properties=args.parameter_properties,
+        workers=args.parameter_worker_int,
+    )
 
     # Write output
     logging.info("Write output")
@@ -264,11 +399,31 @@ def _cmd_stats(args):
 
 P_stats = AP_subparsers.add_parser("statistics", help=_cmd_stats.__doc__)
 options.add_dbb_connection(parser=P_stats)
+options.add_input_shards(parser=P_stats)
+P_stats_params = P_stats.add_argument_group("Parameters")
+P_stats_params.add_argument(
+    "--parameter-by-tag",
+    action="store_true",
+    help="Count entities by tag, scan the data",
+)
+P_stats_params.add_argument(
+    "--parameter-properties",
+    action="store_true",
+    help="Count nodes having each property by label, scan the data",
+)
+P_stats_params.add_argument(
+    "--parameter-worker-int",
+    type=int,
+    default=8,
+    help="Number of queries issued concurrently (default: 8)",
+)
 P_out = P_stats.add_argument_group("Output")
 P_out.add_argument(
     "--output-statistics-json",
     help="Statistics output as Json file",
 )
+options.add_output_metrics(parser=P_stats)
+options.add_profile(parser=P_stats)
 P_stats.set_defaults(func=_cmd_stats)
 
 
@@ -278,37 +433,22 @@ def _cmd_clean(args):
     logging.info("Start - clean")
     # Connection to database
     logging.info("Connection to database")
-    con = None
-    if args.input_config_ini:
-        if not os.path.isfile(args.input_config_ini):
-            logging.error("File provided does not exist: %s" % (args.input_config_ini,))
-            AP.exit(1)
-        logging.warning("Configuration file is provided, ignore indiviual arguments")
-        con = connect.Connect.from_config(path=args.input_config_ini)
-    elif args.input_auradb_file:
-        if not os.path.isfile(args.input_auradb_txt):
-            logging.error("File provided does not exist: %s" % (args.input_auradb_txt,))
-            AP.exit(1)
-        logging.warning(
-            "Configuration file AuraDB is provided, ignore indiviual arguments"
-        )
-        con = connect.Connect.from_auradb(path=args.input_auradb_txt)
-    else:
-        con = connect.Connect(
-            protocol=args.input_protocol_str,
-            url=args.input_url_str,
-            port=args.input_port_int,
-            user=args.input_user_str,
-            database=args.input_database_str,
-            password_path=args.input_password_txt,
-        )
+    con = _connect(args=args)
     if con.is_connected() is False:
         logging.error("Unable to connect to the database")
         AP.exit(1)
 
+    if args.parameter_chunk_int < 1:
+        logging.error(
+            "Size of chunks must be greater than 0: %s" % (args.parameter_chunk_int,)
+        )
+        AP.exit(1)
+
     # Clean
     logging.info("Clean database")
-    con.clean()
+    if args.parameter_tag_property_str:
+        logging.info("Remove nodes with tag: %s" % (args.parameter_tag_property_str,))
+    con.clean(tag=args.parameter_tag_property_str, chunk_size=args.parameter_chunk_int)
 
     logging.info("End - clean")
     return 0
@@ -316,9 +456,216 @@ def _cmd_clean(args):
 
 P_clean = AP_subparsers.add_parser("clean", help=_cmd_clean.__doc__)
 options.add_dbb_connection(parser=P_clean)
+P_clean_params = P_clean.add_argument_group("Parameters")
+P_clean_params.add_argument(
+    "--parameter-tag-property-str",
+    help="Remove only the entities having this tag",
+)
+P_clean_params.add_argument(
+    "--parameter-chunk-int",
+    type=int,
+    default=10000,
+    help="Number of nodes deleted by transaction (default: 10000)",
+)
+options.add_output_metrics(parser=P_clean)
+options.add_profile(parser=P_clean)
 P_clean.set_defaults(func=_cmd_clean)
 
 
+def _cmd_convert_properties(args):
+    """Convert properties stored as string into numbers or booleans"""
+    # Check arguments.
+    logging.info("Start - convert properties")
+    # Connection to database
+    logging.info("Connection to database")
+    con = _connect(args=args)
+    if con.is_connected() is False:
+        logging.error("Unable to connect to the database")
+        AP.exit(1)
+
+    if args.parameter_chunk_int < 1:
+        logging.error(
+            "Size of chunks must be greater than 0: %s" % (args.parameter_chunk_int,)
+        )
+        AP.exit(1)
+
+    # Convert
+    logging.info("Convert properties")
+    if args.parameter_tag_property_str:
+        logging.info("Convert nodes with tag: %s" % (args.parameter_tag_property_str,))
+    con.convert_properties(
+        tag=args.parameter_tag_property_str, chunk_size=args.parameter_chunk_int
+    )
+
+    logging.info("End - convert properties")
+    return 0
+
+
+P_convert = AP_subparsers.add_parser(
+    "convert-properties", help=_cmd_convert_properties.__doc__
+)
+options.add_dbb_connection(parser=P_convert)
+P_convert_params = P_convert.add_argument_group("Parameters")
+P_convert_params.add_argument(
+    "--parameter-tag-property-str",
+    help="Convert only the entities having this tag",
+)
+P_convert_params.add_argument(
+    "--parameter-chunk-int",
+    type=int,
+    default=10000,
+    help="Number of nodes updated by transaction (default: 10000)",
+)
+options.add_output_metrics(parser=P_convert)
+options.add_profile(parser=P_convert)
+P_convert.set_defaults(func=_cmd_convert_properties)
+
+
+def _cmd_stoichiometry(args):
+    """Extract the stoichiometry matrix of a model"""
+    from neo4jsbml import stoichiometry
+
+    # Check arguments.
+    logging.info("Start - stoichiometry")
+    if not args.output_stoichiometry_npz:
+        logging.error("Output file is required: --output-stoichiometry-npz")
+        AP.exit(1)
+    # Connection to database
+    logging.info("Connection to database")
+    con = _connect(args=args)
+    if con.is_connected() is False:
+        logging.error("Unable to connect to the database")
+        AP.exit(1)
+
+    # Build matrix
+    logging.info("Query relationships")
+    substrates, products = None, None
+    if args.parameter_substrate_str:
+        substrates = args.parameter_substrate_str.split(",")
+    if args.parameter_product_str:
+        products = args.parameter_product_str.split(",")
+    try:
+        sto = stoichiometry.Stoichiometry.from_backend(
+            connection=con,
+            tag=args.parameter_tag_property_str,
+            substrates=substrates,
+            products=products,
+        )
+    except ImportError as error:
+        logging.error(str(error))
+        AP.exit(1)
+    logging.info("Species: %s, reactions: %s" % (len(sto.species), len(sto.reactions)))
+
+    # Write output
+    logging.info("Write output")
+    sto.to_npz(path=args.output_stoichiometry_npz)
+
+    logging.info("End - stoichiometry")
+    return 0
+
+
+P_sto = AP_subparsers.add_parser("stoichiometry", help=_cmd_stoichiometry.__doc__)
+options.add_dbb_connection(parser=P_sto)
+P_sto_params = P_sto.add_argument_group("Parameters")
+P_sto_params.add_argument(
+    "--parameter-tag-property-str",
+    help="Extract only the reactions having this tag",
+)
+P_sto_params.add_argument(
+    "--parameter-substrate-str",
+    help="Types of the relationships of the substrates, separated by commas "
+    "(default: HAS_REACTANT,IS_REACTANT,HAS_SUBSTRATE)",
+)
+P_sto_params.add_argument(
+    "--parameter-product-str",
+    help="Types of the relationships of the products, separated by commas "
+    "(default: HAS_PRODUCT)",
+)
+P_out = P_sto.add_argument_group("Output")
+P_out.add_argument(
+    "--output-stoichiometry-npz",
+    help="Matrix, species and reactions ids as .npz file, read by scipy.sparse.load_npz",
+)
+options.add_output_metrics(parser=P_sto)
+options.add_profile(parser=P_sto)
+P_sto.set_defaults(func=_cmd_stoichiometry)
+
+
+def _cmd_serve(args):
+    """Serve import and export jobs over HTTP, keeping warm the connection"""
+    from neo4jsbml import memory, server
+
+    # Check arguments.
+    logging.info("Start - serve")
+    for name, value in [
+        ("workers", args.parameter_worker_int),
+        ("jobs queued", args.parameter_queue_int),
+    ]:
+        if value < 1:
+            logging.error("Number of %s must be greater than 0: %s" % (name, value))
+            AP.exit(1)
+
+    # Connection to database
+    if args.parameter_in_memory:
+        logging.info("Use an in-memory store, data are lost at exit")
+        con = memory.Memory()
+    else:
+        logging.info("Connection to database")
+        con = _connect(args=args)
+        if con.is_connected() is False:
+            logging.error("Unable to connect to the database")
+            AP.exit(1)
+
+    # Serve
+    app = server.Server(
+        connection=con,
+        host=args.parameter_host_str,
+        port=args.parameter_port_int,
+        workers=args.parameter_worker_int,
+        queue_size=args.parameter_queue_int,
+    )
+    app.serve_forever()
+
+    logging.info("End - serve")
+    return 0
+
+
+P_serve = AP_subparsers.add_parser("serve", help=_cmd_serve.__doc__)
+options.add_dbb_connection(parser=P_serve)
+P_serve_params = P_serve.add_argument_group("Parameters")
+P_serve_params.add_argument(
+    "--parameter-host-str",
+    default="127.0.0.1",
+    help="Address to listen to (default: 127.0.0.1)",
+)
+P_serve_params.add_argument(
+    "--parameter-port-int",
+    type=int,
+    default=8765,
+    help="Port to listen to (default: 8765)",
+)
+P_serve_params.add_argument(
+    "--parameter-worker-int",
+    type=int,
+    default=1,
+    help="Number of jobs run concurrently (default: 1)",
+)
+P_serve_params.add_argument(
+    "--parameter-queue-int",
+    type=int,
+    default=16,
+    help="Number of jobs waiting at most, others are rejected (default: 16)",
+)
+P_serve_params.add_argument(
+    "--parameter-in-memory",
+    action="store_true",
+    help="Store data in memory instead of Neo4j, for testing",
+)
+options.add_output_metrics(parser=P_serve)
+options.add_profile(parser=P_serve)
+P_serve.set_defaults(func=_cmd_serve)
+
+
 # Help.
 def print_help():
     """Display this program"s help"""
@@ -353,7 +700,28 @@ def main():
     # No arguments or subcommands were given.
     if len(args.__dict__) < 1:
         print_help()
-    args.func(args)
+    output_metrics = getattr(args, "output_metrics_json", None)
+    profile_cpu = getattr(args, "profile_cpu", None)
+    profile_memory = getattr(args, "profile_memory", None)
+    if output_metrics is None and profile_cpu is None and profile_memory is None:
+        return args.func(args)
+    metrics.METRICS.enabled = True
+    prof = None
+    if profile_cpu or profile_memory:
+        from neo4jsbml import profiler
+
+        prof = profiler.Profiler(cpu_path=profile_cpu, memory_path=profile_memory)
+        prof.start()
+    try:
+        with metrics.phase(name=args.metrics_phase):
+            return args.func(args)
+    finally:
+        if prof:
+            logging.info("Write profiles")
+            prof.stop()
+        if output_metrics:
+            logging.info("Write metrics")
+            metrics.METRICS.to_json(path=output_metrics)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, List, Optional, Union
+
+from neo4jsbml import batch, snode, srelationship
+
+
+class Backend(metaclass=ABCMeta):
+    """Interface of a graph store used to import and export SBML models.
+    Connect implements it with Neo4j, memory.Memory with an in-process store.
+    All methods are abstract: a backend missing one of them can not be instanciated.
+
+    Attributes
+    ----------
+    LABEL_LEDGER: str
+        label of the node storing the fingerprint of an import
+
+    Methods
+    -------
+    is_connected() -> bool
+        test if the store is reachable
+
+    create_nodes(nodes: Union[List[snode.SNode], batch.NodeBatch]) -> None
+        insert nodes
+
+    create_relationships(relationships: Union[List[srelationship.SRelationship], batch.RelationshipBatch]) -> None
+        insert relationships
+
+    update_nodes(nodes: List[snode.SNode]) -> None
+        replace properties of existing nodes
+
+    delete_nodes(nodes: List[snode.SNode]) -> None
+        remove nodes and their relationships
+
+    update_relationships(relationships: List[srelationship.SRelationship]) -> None
+        replace properties of existing relationships
+
+    delete_relationships(relationships: List[srelationship.SRelationship]) -> None
+        remove relationships
+
+    query_labels() -> List
+        return the labels of each node
+
+    query_node(label: str) -> List
+        return all nodes based on a label with their ids
+
+    query_neighbor(elementId: str) -> List
+        return neighbors of a node
+
+    query_tagged_nodes(tag: str) -> List[Dict[str, Any]]
+        return nodes of a tag with their labels and properties
+
+    query_tagged_relationships(tag: str) -> List[Dict[str, Any]]
+        return relationships of a tag with the ids of their nodes and their properties
+
+    query_statistics(by_tag: bool, properties: bool, workers: int) -> Dict[str, List[Dict[str, Any]]]
+        count nodes by label and relationships by type
+
+    query_fingerprint(tag: Optional[str]) -> Optional[str]
+        return the fingerprint of the last import of a model
+
+    save_fingerprint(fingerprint: str, tag: Optional[str]) -> None
+        store the fingerprint of a model imported
+
+    create_indexes(labels: List[str]) -> None
+        create an index on the tag, and one on the tag and the id, for each label
+
+    clean(tag: Optional[str], chunk_size: int) -> None
+        remove all nodes or only nodes of a tag
+
+    convert_properties(tag: Optional[str], chunk_size: int) -> int
+        convert the properties stored as string to numbers or booleans
+
+    query_stoichiometry(types: List[str], tag: Optional[str]) -> List[Dict[str, Any]]
+        return the species of each reaction with their stoichiometry
+    """
+
+    LABEL_LEDGER = "ImportLedger"
+    # Patterns of the values converted by convert_properties(), tested in order
+    CONVERSIONS = [
+        ("int", r"-?\d+"),
+        ("float", r"-?\d+(\.\d+)?([eE][-+]?\d+)?"),
+        ("bool", r"(?i)true|false"),
+    ]
+    # Properties always stored as string
+    STRING_PROPERTIES = ["id", "tag"]
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        pass
+
+    @abstractmethod
+    def create_nodes(self, nodes: Union[List[snode.SNode], batch.NodeBatch]) -> None:
+        pass
+
+    @abstractmethod
+    def create_relationships(
+        self,
+        relationships: Union[
+            List[srelationship.SRelationship], batch.RelationshipBatch
+        ],
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def update_nodes(self, nodes: List[snode.SNode]) -> None:
+        pass
+
+    @abstractmethod
+    def delete_nodes(self, nodes: List[snode.SNode]) -> None:
+        pass
+
+    @abstractmethod
+    def update_relationships(
+        self, relationships: List[srelationship.SRelationship]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def delete_relationships(
+        self, relationships: List[srelationship.SRelationship]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def query_labels(self) -> List:
+        pass
+
+    @abstractmethod
+    def query_node(self, label: str) -> List:
+        pass
+
+    @abstractmethod
+    def query_neighbor(self, elementId: str) -> List:
+        pass
+
+    @abstractmethod
+    def query_tagged_nodes(self, tag: str) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def query_tagged_relationships(self, tag: str) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def query_statistics(
+        self, by_tag: bool = False, properties: bool = False, workers: int = 8
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    def query_fingerprint(self, tag: Optional[str] = None) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def save_fingerprint(self, fingerprint: str, tag: Optional[str] = None) -> None:
+        pass
+
+    @abstractmethod
+    def create_indexes(self, labels: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    def clean(self, tag: Optional[str] = None, chunk_size: int = 10000) -> None:
+        pass
+
+    @abstractmethod
+    def convert_properties(
+        self, tag: Optional[str] = None, chunk_size: int = 10000
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def query_stoichiometry(
+        self, types: List[str], tag: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        pass
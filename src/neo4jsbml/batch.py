@@ -0,0 +1,409 @@
+import csv
+from typing import Any, Dict, Generator, List, Tuple
+
+from neo4jsbml import snode, srelationship
+
+
+class NodeBatch(object):
+    """Nodes stored by column: labels, id and one column by property.
+    A property missing for a node is None into its column.
+    The batch is turned into rows of UNWIND queries or into a CSV file.
+
+    Attributes
+    ----------
+    labels: List[Tuple[str, ...]]
+        labels of each node
+    ids: List[str]
+        id of each node
+    columns: Dict[str, List[Any]]
+        values of each property
+
+    Methods
+    -------
+    __init__()
+        Instanciate an empty batch
+
+    append(id: str, labels: List[str], properties: Dict[str, Any]) -> None
+        Add a node
+
+    to_parameters(size: int) -> Generator[Tuple[Tuple[Tuple[str, ...], bool], List[Dict[str, Any]]], None, None]
+        Group the rows by labels and by presence of a tag, yield them by chunk
+
+    to_csv(path: str, delimiter: str = ",") -> None
+        Write a row by node
+
+    @classmethod
+    from_nodes(nodes: List[snode.SNode]) -> "NodeBatch"
+        Create a batch from nodes
+    """
+
+    # Separator of the labels into the CSV file
+    LABEL_SEPARATOR = ";"
+
+    def __init__(self) -> None:
+        self.labels: List[Tuple[str, ...]] = []
+        self.ids: List[str] = []
+        self.columns: Dict[str, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, id: str, labels: List[str], properties: Dict[str, Any]) -> None:
+        """Add a node.
+
+        Parameters
+        ----------
+        id: str
+            id of the node
+        labels: List[str]
+            labels of the node
+        properties: Dict[str, Any]
+            properties of the node
+
+        Return
+        ------
+        None
+        """
+        size = len(self.ids)
+        self.labels.append(tuple(labels))
+        self.ids.append(id)
+        for key, value in properties.items():
+            if key not in self.columns.keys():
+                self.columns[key] = [None] * size
+            self.columns[key].append(value)
+        for column in self.columns.values():
+            if len(column) == size:
+                column.append(None)
+        return None
+
+    def _properties(self, ix: int) -> Dict[str, Any]:
+        return {k: v[ix] for k, v in self.columns.items() if v[ix] is not None}
+
+    def __iter__(self) -> Generator[snode.SNode, None, None]:
+        for ix, ident in enumerate(self.ids):
+            yield snode.SNode(
+                id=ident, labels=list(self.labels[ix]), properties=self._properties(ix)
+            )
+
+    def to_parameters(
+        self, size: int
+    ) -> Generator[
+        Tuple[Tuple[Tuple[str, ...], bool], List[Dict[str, Any]]], None, None
+    ]:
+        """Group the rows by labels and by presence of a tag, a query is built by group.
+        Rows are built chunk by chunk, only the indexes of the nodes are grouped.
+        Numbers and booleans keep their type, other values are stored as string.
+
+        Parameters
+        ----------
+        size: int
+            number of rows by chunk
+
+        Return
+        ------
+        Generator[Tuple[Tuple[Tuple[str, ...], bool], List[Dict[str, Any]]], None, None]
+            (labels, has tag) and a chunk of rows, keys of a row: id, tag, properties
+        """
+        groups: Dict[Tuple[Tuple[str, ...], bool], List[int]] = {}
+        tags = self.columns.get("tag", [None] * len(self))
+        for ix in range(len(self)):
+            groups.setdefault((self.labels[ix], tags[ix] is not None), []).append(ix)
+        for key, indexes in groups.items():
+            for chunk in chunks(rows=indexes, size=size):
+                rows = []
+                for ix in chunk:
+                    properties = {
+                        k: snode.SNode.to_parameter(v)
+                        for k, v in self._properties(ix).items()
+                    }
+                    rows.append(
+                        dict(
+                            id=self.ids[ix],
+                            tag=properties.get("tag"),
+                            properties=properties,
+                        )
+                    )
+                yield key, rows
+
+    def to_csv(self, path: str, delimiter: str = ",") -> None:
+        """Write a row by node: id, labels and the properties.
+
+        Parameters
+        ----------
+        path: str
+            a CSV file
+        delimiter: str (default: ",")
+            separator of the fields
+
+        Return
+        ------
+        None
+        """
+        keys = list(self.columns.keys())
+        with open(path, "w", newline="") as fod:
+            writer = csv.writer(fod, delimiter=delimiter)
+            writer.writerow(["id", "labels"] + keys)
+            for ix, ident in enumerate(self.ids):
+                row = [ident, NodeBatch.LABEL_SEPARATOR.join(self.labels[ix])]
+                for key in keys:
+                    value = self.columns[key][ix]
+                    row.append("" if value is None else value)
+                writer.writerow(row)
+        return None
+
+    @classmethod
+    def from_nodes(cls, nodes: List[snode.SNode]) -> "NodeBatch":
+        """Create a batch from nodes.
+
+        Parameters
+        ----------
+        nodes: List[snode.SNode]
+            nodes
+
+        Return
+        ------
+        NodeBatch
+        """
+        batch = NodeBatch()
+        for node in nodes:
+            batch.append(id=node.id, labels=node.labels, properties=node.properties)
+        return batch
+
+
+class RelationshipBatch(object):
+    """Relationships stored by column: type, labels and ids of their nodes,
+    and one column by property.
+    A property missing for a relationship is None into its column.
+    The batch is turned into rows of UNWIND queries or into a CSV file.
+
+    Attributes
+    ----------
+    ids: List[str]
+        id of each relationship
+    types: List[str]
+        type of each relationship
+    from_labels: List[str]
+        label of the node starting each relationship
+    to_labels: List[str]
+        label of the node ending each relationship
+    from_ids: List[str]
+        id of the node starting each relationship
+    to_ids: List[str]
+        id of the node ending each relationship
+    columns: Dict[str, List[Any]]
+        values of each property
+
+    Methods
+    -------
+    __init__()
+        Instanciate an empty batch
+
+    append(id: str, label: str, from_label: str, to_label: str, from_id: str, to_id: str, properties: Dict[str, Any]) -> None
+        Add a relationship
+
+    to_parameters(size: int) -> Generator[Tuple[Tuple[str, str, str, bool], List[Dict[str, Any]]], None, None]
+        Group the rows by type, labels of the nodes and presence of a tag, yield them by chunk
+
+    to_csv(path: str, delimiter: str = ",") -> None
+        Write a row by relationship
+
+    @classmethod
+    from_relationships(relationships: List[srelationship.SRelationship]) -> "RelationshipBatch"
+        Create a batch from relationships
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.types: List[str] = []
+        self.from_labels: List[str] = []
+        self.to_labels: List[str] = []
+        self.from_ids: List[str] = []
+        self.to_ids: List[str] = []
+        self.columns: Dict[str, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(
+        self,
+        id: str,
+        label: str,
+        from_label: str,
+        to_label: str,
+        from_id: str,
+        to_id: str,
+        properties: Dict[str, Any],
+    ) -> None:
+        """Add a relationship.
+
+        Parameters
+        ----------
+        id: str
+            id of the relationship
+        label: str
+            type of the relationship
+        from_label: str
+            label of the node starting the relationship
+        to_label: str
+            label of the node ending the relationship
+        from_id: str
+            id of the node starting the relationship
+        to_id: str
+            id of the node ending the relationship
+        properties: Dict[str, Any]
+            properties of the relationship
+
+        Return
+        ------
+        None
+        """
+        size = len(self.ids)
+        self.ids.append(id)
+        self.types.append(label)
+        self.from_labels.append(from_label)
+        self.to_labels.append(to_label)
+        self.from_ids.append(from_id)
+        self.to_ids.append(to_id)
+        for key, value in properties.items():
+            if key not in self.columns.keys():
+                self.columns[key] = [None] * size
+            self.columns[key].append(value)
+        for column in self.columns.values():
+            if len(column) == size:
+                column.append(None)
+        return None
+
+    def _properties(self, ix: int) -> Dict[str, Any]:
+        return {k: v[ix] for k, v in self.columns.items() if v[ix] is not None}
+
+    def __iter__(self) -> Generator[srelationship.SRelationship, None, None]:
+        for ix, ident in enumerate(self.ids):
+            yield srelationship.SRelationship(
+                id=ident,
+                label=self.types[ix],
+                from_label=self.from_labels[ix],
+                to_label=self.to_labels[ix],
+                from_id=self.from_ids[ix],
+                to_id=self.to_ids[ix],
+                properties=self._properties(ix),
+            )
+
+    def to_parameters(
+        self, size: int
+    ) -> Generator[Tuple[Tuple[str, str, str, bool], List[Dict[str, Any]]], None, None]:
+        """Group the rows by type, labels of the nodes and presence of a tag,
+        a query is built by group.
+        Rows are built chunk by chunk, only the indexes of the relationships are grouped.
+
+        Parameters
+        ----------
+        size: int
+            number of rows by chunk
+
+        Return
+        ------
+        Generator[Tuple[Tuple[str, str, str, bool], List[Dict[str, Any]]], None, None]
+            (from label, type, to label, has tag) and a chunk of rows, keys of a row: from_id, to_id, tag, properties
+        """
+        groups: Dict[Tuple[str, str, str, bool], List[int]] = {}
+        tags = self.columns.get("tag", [None] * len(self))
+        for ix in range(len(self)):
+            key = (
+                self.from_labels[ix],
+                self.types[ix],
+                self.to_labels[ix],
+                tags[ix] is not None,
+            )
+            groups.setdefault(key, []).append(ix)
+        for key, indexes in groups.items():
+            for chunk in chunks(rows=indexes, size=size):
+                yield key, [
+                    dict(
+                        from_id=self.from_ids[ix],
+                        to_id=self.to_ids[ix],
+                        tag=tags[ix],
+                        properties=self._properties(ix),
+                    )
+                    for ix in chunk
+                ]
+
+    def to_csv(self, path: str, delimiter: str = ",") -> None:
+        """Write a row by relationship: type, labels and ids of the nodes and the properties.
+
+        Parameters
+        ----------
+        path: str
+            a CSV file
+        delimiter: str (default: ",")
+            separator of the fields
+
+        Return
+        ------
+        None
+        """
+        keys = list(self.columns.keys())
+        with open(path, "w", newline="") as fod:
+            writer = csv.writer(fod, delimiter=delimiter)
+            writer.writerow(
+                ["id", "type", "from_label", "from_id", "to_label", "to_id"] + keys
+            )
+            for ix, ident in enumerate(self.ids):
+                row = [
+                    ident,
+                    self.types[ix],
+                    self.from_labels[ix],
+                    self.from_ids[ix],
+                    self.to_labels[ix],
+                    self.to_ids[ix],
+                ]
+                for key in keys:
+                    value = self.columns[key][ix]
+                    row.append("" if value is None else value)
+                writer.writerow(row)
+        return None
+
+    @classmethod
+    def from_relationships(
+        cls, relationships: List[srelationship.SRelationship]
+    ) -> "RelationshipBatch":
+        """Create a batch from relationships.
+
+        Parameters
+        ----------
+        relationships: List[srelationship.SRelationship]
+            relationships
+
+        Return
+        ------
+        RelationshipBatch
+        """
+        batch = RelationshipBatch()
+        for rel in relationships:
+            batch.append(
+                id=rel.id,
+                label=rel.label,
+                from_label=rel.from_label,
+                to_label=rel.to_label,
+                from_id=rel.from_id,
+                to_id=rel.to_id,
+                properties=rel.properties,
+            )
+        return batch
+
+
+def chunks(rows: List[Any], size: int) -> Generator[List[Any], None, None]:
+    """Split rows into chunks.
+
+    Parameters
+    ----------
+    rows: List[Any]
+        rows
+    size: int
+        number of rows by chunk
+
+    Return
+    ------
+    Generator[List[Any], None, None]
+    """
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
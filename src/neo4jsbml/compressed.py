@@ -0,0 +1,322 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import sys
+import tarfile
+import zipfile
+from typing import IO, Generator, List, Optional, Tuple
+
+# Compression by extension, a codec reads a single stream
+CODECS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+# Archives by extension, an archive holds several members
+ARCHIVES = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "tar",
+    ".tgz": "tar",
+    ".tar.bz2": "tar",
+    ".tar.xz": "tar",
+}
+# Leading bytes of each format, used when the extension is unknown
+MAGICS = [
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"PK\x03\x04", "zip"),
+]
+CHUNK_SIZE = 1 << 20
+
+
+def compression(path: str) -> Optional[str]:
+    """Return the format of a file from its extension, or else from its leading bytes.
+
+    Parameters
+    ----------
+    path: str
+        a file
+
+    Return
+    ------
+    Optional[str]
+        gzip, bz2, xz, zstd, zip or tar, None if the file is not compressed
+    """
+    name = path.lower()
+    for extension, kind in ARCHIVES.items():
+        if name.endswith(extension):
+            return kind
+    for extension, kind in CODECS.items():
+        if name.endswith(extension):
+            return kind
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as fid:
+        head = fid.read(8)
+    for magic, kind in MAGICS:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def split(path: str) -> Tuple[str, Optional[str]]:
+    """Split a path into an archive and a member, as zipimport does: "models.zip/iML1515.xml".
+
+    Parameters
+    ----------
+    path: str
+        a file, or a member of an archive
+
+    Return
+    ------
+    Tuple[str, Optional[str]]
+        the file and the member, None if the path is not inside an archive
+    """
+    if os.path.isfile(path):
+        return path, None
+    parent, member = path, ""
+    while True:
+        head, tail = os.path.split(parent)
+        if head == parent or tail == "":
+            return path, None
+        member = tail if member == "" else tail + "/" + member
+        parent = head
+        if os.path.isfile(parent):
+            if compression(path=parent) in ["zip", "tar"]:
+                return parent, member
+            return path, None
+
+
+def exists(path: str) -> bool:
+    """Test if a file, or a member of an archive, exists.
+
+    Parameters
+    ----------
+    path: str
+        a file, or a member of an archive
+
+    Return
+    ------
+    bool
+    """
+    archive, member = split(path=path)
+    if member is None:
+        return os.path.isfile(archive)
+    return member in members(path=archive)
+
+
+def members(path: str) -> List[str]:
+    """List the files of an archive, without reading them.
+
+    Parameters
+    ----------
+    path: str
+        a zip or tar archive
+
+    Return
+    ------
+    List[str]
+    """
+    if compression(path=path) == "zip":
+        with zipfile.ZipFile(path) as archive:
+            return [x.filename for x in archive.infolist() if not x.is_dir()]
+    with tarfile.open(path, "r:*") as archive:
+        return [x.name for x in archive.getmembers() if x.isfile()]
+
+
+class _Member(io.BufferedReader):
+    """Member of an archive, closing the archive with it"""
+
+    def __init__(self, raw: IO[bytes], archive: tarfile.TarFile) -> None:
+        super().__init__(raw)  # type: ignore
+        self._archive = archive
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._archive.close()
+
+
+def _open_zstd(path: str, mode: str = "rb") -> IO[bytes]:
+    try:
+        import zstandard
+    except ImportError:
+        try:
+            from compression import zstd  # type: ignore
+        except ImportError:
+            raise ImportError(
+                "Package zstandard is required to read or write the file: %s" % (path,)
+            )
+        return zstd.open(path, mode)
+    fid = open(path, mode)
+    if mode == "wb":
+        return zstandard.ZstdCompressor().stream_writer(fid, closefd=True)
+    return zstandard.ZstdDecompressor().stream_reader(fid, closefd=True)
+
+
+def _open_member(archive: str, member: Optional[str]) -> IO[bytes]:
+    if compression(path=archive) == "zip":
+        zfile = zipfile.ZipFile(archive)
+        if member is None:
+            names = [x.filename for x in zfile.infolist() if not x.is_dir()]
+            if len(names) != 1:
+                zfile.close()
+                raise ValueError(
+                    "Archive holds %s files, a member is required: %s"
+                    % (len(names), archive)
+                )
+            member = names[0]
+        # The stream keeps a reference to the archive, closed with it
+        fid = zfile.open(member)
+        zfile.close()
+        return fid
+    tfile = tarfile.open(archive, "r:*")
+    if member is None:
+        names = [x.name for x in tfile.getmembers() if x.isfile()]
+        if len(names) != 1:
+            tfile.close()
+            raise ValueError(
+                "Archive holds %s files, a member is required: %s"
+                % (len(names), archive)
+            )
+        member = names[0]
+    fid = tfile.extractfile(member)
+    if fid is None:
+        tfile.close()
+        raise ValueError("Member is not a file: %s" % (member,))
+    return _Member(raw=fid, archive=tfile)
+
+
+def open_binary(path: str) -> IO[bytes]:
+    """Open a file, decompressed on the fly, or a member of an archive.
+    A zip or tar archive holding a single file is opened as this file.
+
+    Parameters
+    ----------
+    path: str
+        a file, or a member of an archive
+
+    Raises
+    ------
+    ImportError
+        if a zstd file is read without zstandard
+    ValueError
+        if an archive holds several files and no member is given
+
+    Return
+    ------
+    IO[bytes]
+    """
+    archive, member = split(path=path)
+    kind = compression(path=archive)
+    if member is not None or kind in ["zip", "tar"]:
+        return _open_member(archive=archive, member=member)
+    if kind == "gzip":
+        return gzip.open(archive, "rb")
+    elif kind == "bz2":
+        return bz2.open(archive, "rb")
+    elif kind == "xz":
+        return lzma.open(archive, "rb")
+    elif kind == "zstd":
+        return _open_zstd(path=archive)
+    return open(archive, "rb")
+
+
+def open_output(path: str) -> IO[bytes]:
+    """Open a file to write, compressed on the fly according to its extension: gz, bz2, xz or zst.
+    "-" is the standard output.
+
+    Parameters
+    ----------
+    path: str
+        a file, or "-"
+
+    Raises
+    ------
+    ImportError
+        if a zstd file is written without zstandard
+    ValueError
+        if the file is an archive
+
+    Return
+    ------
+    IO[bytes]
+    """
+    if path == "-":
+        # Keep the standard output open once written
+        sys.stdout.flush()
+        return os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    kind = compression(path=path)
+    if kind in ["zip", "tar"]:
+        raise ValueError("Writing into an archive is not supported: %s" % (path,))
+    elif kind == "gzip":
+        return gzip.open(path, "wb")
+    elif kind == "bz2":
+        return bz2.open(path, "wb")
+    elif kind == "xz":
+        return lzma.open(path, "wb")
+    elif kind == "zstd":
+        return _open_zstd(path=path, mode="wb")
+    return open(path, "wb")
+
+
+def read_text(path: str, encoding: str = "utf-8") -> str:
+    """Read a file, decompressed on the fly, or a member of an archive.
+
+    Parameters
+    ----------
+    path: str
+        a file, or a member of an archive
+    encoding: str (default: "utf-8")
+        encoding of the text
+
+    Return
+    ------
+    str
+    """
+    with open_binary(path=path) as fid:
+        return fid.read().decode(encoding)
+
+
+def iter_members(
+    path: str, extensions: Optional[List[str]] = None
+) -> Generator[Tuple[str, IO[bytes]], None, None]:
+    """Iterate over the files of an archive, decompressed one by one without extracting them.
+    The archive is read once: a stream must be consumed before the next one is requested.
+
+    Parameters
+    ----------
+    path: str
+        a zip or tar archive
+    extensions: Optional[List[str]] (default: None)
+        keep only the members ending with one of them
+
+    Return
+    ------
+    Generator[Tuple[str, IO[bytes]], None, None]
+        the path of the member, as accepted by open_binary(), and its stream
+    """
+
+    def _keep(name: str) -> bool:
+        return not extensions or any(name.lower().endswith(x) for x in extensions)
+
+    if compression(path=path) == "zip":
+        with zipfile.ZipFile(path) as zfile:
+            for info in zfile.infolist():
+                if info.is_dir() or not _keep(info.filename):
+                    continue
+                with zfile.open(info) as fid:
+                    yield os.path.join(path, info.filename), fid
+        return
+    # Sequential mode: a compressed tar is decompressed once
+    with tarfile.open(path, "r|*") as tfile:
+        for tinfo in tfile:
+            if not tinfo.isfile() or not _keep(tinfo.name):
+                continue
+            tfid = tfile.extractfile(tinfo)
+            if tfid is None:
+                continue
+            with tfid:
+                yield os.path.join(path, tinfo.name), tfid
@@ -1,13 +1,29 @@
+import collections
+import concurrent.futures
 import configparser
-from typing import Any, Dict, List, Optional
+import inspect
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import neo4j
 
-from neo4jsbml import _version, singleton, snode, srelationship
+from neo4jsbml import (
+    _version,
+    backend,
+    batch,
+    metrics,
+    singleton,
+    snode,
+    srelationship,
+)
 
 
-class Connect(metaclass=singleton.Singleton):
-    """Connect
+class Connect(backend.Backend, metaclass=singleton.Registry):
+    """Connect, the Neo4j implementation of backend.Backend
+    An object, and its pool of connections, is shared by (uri, user, database):
+    calling Connect() twice with the same arguments returns the same object,
+    with other arguments another object, so several databases can be used at once.
 
     Attributes
     ----------
@@ -35,15 +51,65 @@ class Connect(metaclass=singleton.Singleton):
     is_connected -> bool
         test if the connection is established
 
+    close() -> None
+        close the driver and remove the object from the registry
+
+    @classmethod
+    registry_key(*args, **kwargs) -> Tuple[str, Optional[str], str]
+        build the key of the registry from the arguments of Connect()
+
+    @classmethod
+    build_uri(protocol: str, url: str, port: Optional[str]) -> str
+        build the uri of the database
+
     @classmethod
     def read_password(path: str) -> str
         read a password from a file
 
-    def create_nodes(nodes: List[Dict[str, Any]]) -> None
-        insert nodes into Neo4j
+    def create_nodes(nodes: Union[List[snode.SNode], batch.NodeBatch]) -> None
+        insert nodes into Neo4j, by batch
+
+    def create_relationships(relationships: Union[List[srelationship.SRelationship], batch.RelationshipBatch]) -> None
+        insert relationships into Neo4j, by batch
+
+    def update_nodes(nodes: List[snode.SNode]) -> None
+        replace properties of nodes existing into Neo4j
+
+    def delete_nodes(nodes: List[snode.SNode]) -> None
+        remove nodes, and their relationships, from Neo4j
+
+    def update_relationships(relationships: List[srelationship.SRelationship]) -> None
+        replace properties of relationships existing into Neo4j
+
+    def delete_relationships(relationships: List[srelationship.SRelationship]) -> None
+        remove relationships from Neo4j
+
+    def query_tagged_nodes(tag: str) -> List[Dict[str, Any]]
+        return nodes of a tag with their labels and properties
+
+    def query_tagged_relationships(tag: str) -> List[Dict[str, Any]]
+        return relationships of a tag with the ids of their nodes and their properties
+
+    def clean(tag: Optional[str], chunk_size: int) -> None
+        remove all nodes or only nodes of a tag, by chunk
 
-    def create_relationships(relations: List[Any]) -> None
-        insert relationships into Neo4j
+    def convert_properties(tag: Optional[str], chunk_size: int) -> int
+        convert the properties stored as string to numbers or booleans, by chunk
+
+    def query_stoichiometry(types: List[str], tag: Optional[str]) -> List[Dict[str, Any]]
+        return the species of each reaction with their stoichiometry, in one query
+
+    def create_indexes(labels: List[str]) -> None
+        create an index on the tag, and one on the tag and the id, for each label
+
+    def query_statistics(by_tag: bool, properties: bool, workers: int) -> Dict[str, List[Dict[str, Any]]]
+        count nodes by label and relationships by type
+
+    def query_fingerprint(tag: Optional[str]) -> Optional[str]
+        return the fingerprint of the last import of a model
+
+    def save_fingerprint(fingerprint: str, tag: Optional[str]) -> None
+        store the fingerprint of a model imported into a ledger node
 
     @classmethod
     def from_config(cls, path: str) -> "Connect"
@@ -51,6 +117,13 @@ class Connect(metaclass=singleton.Singleton):
     """
 
     PROTOCOLS = ["neo4j", "neo4j+s", "neo4j+ssc", "bolt", "bolt+s", "bolt+ssc"]
+    PROGRESS_CHUNKS = 10
+    # Records pulled by request, default of the driver
+    FETCH_SIZE = 1000
+    # Rows written by UNWIND query
+    BATCH_SIZE = 5000
+    # Cypher functions applied by convert_properties(), by type
+    CONVERTERS = {"int": "toInteger", "float": "toFloat", "bool": "toBoolean"}
 
     def __init__(
         self,
@@ -78,6 +151,7 @@ class Connect(metaclass=singleton.Singleton):
             self.driver = neo4j.GraphDatabase.driver(self.uri)
         self.stats: Dict[str, int] = {}
 
+    @metrics.measure()
     def is_connected(self) -> bool:
         """Test if the connection is established.
 
@@ -94,9 +168,62 @@ class Connect(metaclass=singleton.Singleton):
 
     @property
     def uri(self) -> str:
-        if self.port:
-            return self.protocol + "://" + self.url + ":" + str(self.port)
-        return self.protocol + "://" + self.url
+        return Connect.build_uri(protocol=self.protocol, url=self.url, port=self.port)
+
+    @classmethod
+    def build_uri(cls, protocol: str, url: str, port: Optional[str] = None) -> str:
+        """Build the uri of the database.
+
+        Parameters
+        ----------
+        protocol: str
+            the name of the protocol
+        url: str
+            the domain name
+        port: Optional[str] (default: None)
+            the port number
+
+        Return
+        ------
+        str
+        """
+        if port:
+            return protocol + "://" + url + ":" + str(port)
+        return protocol + "://" + url
+
+    @classmethod
+    def registry_key(cls, *args, **kwargs) -> Tuple[str, Optional[str], str]:
+        """Build the key of the registry from the arguments of Connect().
+
+        Parameters
+        ----------
+        *args, **kwargs
+            the arguments of Connect()
+
+        Return
+        ------
+        Tuple[str, Optional[str], str]
+            uri, user, database
+        """
+        bound = inspect.signature(cls.__init__).bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        data = bound.arguments
+        uri = Connect.build_uri(
+            protocol=data["protocol"], url=data["url"], port=data["port"]
+        )
+        return (uri, data["user"], data["database"])
+
+    def close(self) -> None:
+        """Close the driver and remove the object from the registry,
+        the next call of Connect() with the same arguments opens a new driver.
+
+        Return
+        ------
+        None
+        """
+        singleton.Registry.discard(instance=self)
+        self.driver.close()
+        return None
 
     @classmethod
     def read_password(cls, path: str) -> str:
@@ -114,61 +241,218 @@ class Connect(metaclass=singleton.Singleton):
         with open(path) as fid:
             return fid.read().splitlines()[0]
 
-    def create_nodes(self, nodes: List[snode.SNode]) -> None:
+    @metrics.measure()
+    def create_nodes(self, nodes: Union[List[snode.SNode], batch.NodeBatch]) -> None:
         """Insert nodes into Neo4j.
+        Nodes are grouped by labels, each group is written by UNWIND queries of BATCH_SIZE rows.
 
         Parameters
         ----------
-        nodes: List[Dict[str, Any]]
+        nodes: Union[List[snode.SNode], batch.NodeBatch]
             the nodes to create
         """
-        for node in nodes:
-            with self.driver.session(default_access_mode=neo4j.WRITE_ACCESS) as session:
-                que = (
-                    "MERGE (n:"
-                    + ":".join(node.labels)
-                    + " "
-                    + node.id_to_neo4j()
-                    + ") ON CREATE SET n += "
-                    + node.properties_to_neo4j()
-                    + " ON MATCH SET n += "
-                    + node.properties_to_neo4j()
-                    + " RETURN n;"
-                )
-                res = session.run(que)
-                res.single()
+        if not isinstance(nodes, batch.NodeBatch):
+            nodes = batch.NodeBatch.from_nodes(nodes=nodes)
+        for (labels, has_tag), chunk in nodes.to_parameters(size=self.BATCH_SIZE):
+            match = "{id: row.id, tag: row.tag}" if has_tag else "{id: row.id}"
+            que = (
+                "UNWIND $rows AS row MERGE (n:"
+                + ":".join(labels)
+                + " "
+                + match
+                + ") SET n += row.properties"
+            )
+            self.query(value=que, parameters=dict(rows=chunk))
 
+    @metrics.measure()
     def create_relationships(
-        self, relationships: List[srelationship.SRelationship]
+        self,
+        relationships: Union[
+            List[srelationship.SRelationship], batch.RelationshipBatch
+        ],
     ) -> None:
         """Insert relationships into Neo4j.
+        Relationships are grouped by type and labels of their nodes,
+        each group is written by UNWIND queries of BATCH_SIZE rows.
 
         Parameters
         ----------
-        relationships: List[Any]
+        relationships: Union[List[srelationship.SRelationship], batch.RelationshipBatch]
             the relationships to create
         """
+        if not isinstance(relationships, batch.RelationshipBatch):
+            relationships = batch.RelationshipBatch.from_relationships(
+                relationships=relationships
+            )
+        for key, chunk in relationships.to_parameters(size=self.BATCH_SIZE):
+            from_label, label, to_label, has_tag = key
+            tag = ", tag: row.tag" if has_tag else ""
+            que = (
+                "UNWIND $rows AS row MATCH (a:"
+                + from_label
+                + " {id: row.from_id"
+                + tag
+                + "}) MATCH (b:"
+                + to_label
+                + " {id: row.to_id"
+                + tag
+                + "}) MERGE (a)-[r:"
+                + label
+                + "]->(b) ON CREATE SET r += row.properties"
+            )
+            self.query(value=que, parameters=dict(rows=chunk))
+
+    @metrics.measure()
+    def update_nodes(self, nodes: List[snode.SNode]) -> None:
+        """Replace properties of nodes existing into Neo4j.
+
+        Parameters
+        ----------
+        nodes: List[snode.SNode]
+            the nodes to update
+        """
+        for node in nodes:
+            que = (
+                "MATCH (n:"
+                + ":".join(node.labels)
+                + " "
+                + node.id_to_neo4j()
+                + ") SET n = $properties, n.id = $id"
+            )
+            self.query(
+                value=que,
+                parameters=dict(properties=node.properties_to_parameters(), id=node.id),
+            )
+
+    @metrics.measure()
+    def delete_nodes(self, nodes: List[snode.SNode]) -> None:
+        """Remove nodes, and their relationships, from Neo4j.
+
+        Parameters
+        ----------
+        nodes: List[snode.SNode]
+            the nodes to remove
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = collections.defaultdict(list)
+        for node in nodes:
+            groups[":".join(node.labels)].append(
+                dict(id=node.id, tag=node.properties.get("tag"))
+            )
+        for labels, rows in groups.items():
+            que = (
+                "UNWIND $rows AS row MATCH (n:"
+                + labels
+                + ") WHERE n.id = row.id AND n.tag = row.tag DETACH DELETE n"
+            )
+            self.query(value=que, parameters=dict(rows=rows))
+
+    @metrics.measure()
+    def update_relationships(
+        self, relationships: List[srelationship.SRelationship]
+    ) -> None:
+        """Replace properties of relationships existing into Neo4j.
+
+        Parameters
+        ----------
+        relationships: List[srelationship.SRelationship]
+            the relationships to update
+        """
         for rel in relationships:
-            with self.driver.session(default_access_mode=neo4j.WRITE_ACCESS) as session:
-                que = (
-                    "MATCH (a:"
-                    + rel.from_label
-                    + " "
-                    + rel.id_to_neo4j(id='$rel["from_id"]')
-                    + ") MATCH (b:"
-                    + rel.to_label
-                    + " "
-                    + rel.id_to_neo4j(id='$rel["to_id"]')
-                    + ") MERGE (a)-[r:"
-                    + rel.label
-                    + ']->(b) ON CREATE SET r += $rel["properties"] RETURN r'
-                )
-                res = session.run(
-                    que,
-                    rel=rel.to_dict(),
-                )
-                res.single()
+            que = (
+                "MATCH (a:"
+                + rel.from_label
+                + " "
+                + rel.id_to_neo4j(id='$rel["from_id"]')
+                + ")-[r:"
+                + rel.label
+                + "]->(b:"
+                + rel.to_label
+                + " "
+                + rel.id_to_neo4j(id='$rel["to_id"]')
+                + ') SET r = $rel["properties"]'
+            )
+            self.query(value=que, parameters=dict(rel=rel.to_dict()))
+
+    @metrics.measure()
+    def delete_relationships(
+        self, relationships: List[srelationship.SRelationship]
+    ) -> None:
+        """Remove relationships from Neo4j.
+
+        Parameters
+        ----------
+        relationships: List[srelationship.SRelationship]
+            the relationships to remove
+        """
+        for rel in relationships:
+            que = (
+                "MATCH (a:"
+                + rel.from_label
+                + " "
+                + rel.id_to_neo4j(id='$rel["from_id"]')
+                + ")-[r:"
+                + rel.label
+                + "]->(b:"
+                + rel.to_label
+                + " "
+                + rel.id_to_neo4j(id='$rel["to_id"]')
+                + ") DELETE r"
+            )
+            self.query(value=que, parameters=dict(rel=rel.to_dict()))
+
+    @metrics.measure()
+    def query_tagged_nodes(self, tag: str) -> List[Dict[str, Any]]:
+        """Return nodes of a tag with their labels and properties.
+
+        Parameters
+        ----------
+        tag: str
+            the tag of the model
+
+        Return
+        ------
+        List[Dict[str, Any]]
+        """
+        que = (
+            "MATCH (n) WHERE n.tag = $tag AND NOT n:"
+            + self.LABEL_LEDGER
+            + " RETURN labels(n) AS labels, properties(n) AS properties"
+        )
+        res = self.query(
+            value=que,
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+            parameters=dict(tag=tag),
+        )
+        return res or []
+
+    @metrics.measure()
+    def query_tagged_relationships(self, tag: str) -> List[Dict[str, Any]]:
+        """Return relationships of a tag with the ids of their nodes and their properties.
 
+        Parameters
+        ----------
+        tag: str
+            the tag of the model
+
+        Return
+        ------
+        List[Dict[str, Any]]
+        """
+        que = (
+            "MATCH (a)-[r]->(b) WHERE r.tag = $tag RETURN type(r) AS label, "
+            "labels(a)[0] AS from_label, a.id AS from_id, "
+            "labels(b)[0] AS to_label, b.id AS to_id, properties(r) AS properties"
+        )
+        res = self.query(
+            value=que,
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+            parameters=dict(tag=tag),
+        )
+        return res or []
+
+    @metrics.measure()
     def query_labels(self) -> List:
         """Return all labels found in the database.
 
@@ -182,6 +466,7 @@ class Connect(metaclass=singleton.Singleton):
             return res
         return []
 
+    @metrics.measure()
     def query_node(self, label: str) -> List:
         """Return all nodes based on a label with their ids.
 
@@ -197,11 +482,15 @@ class Connect(metaclass=singleton.Singleton):
         with self.driver.session(
             database=self.database, default_access_mode=neo4j.READ_ACCESS
         ) as session:
-            res = session.run(
-                "MATCH (n: " + label + ") RETURN n AS node, elementId(n) AS nodeId",
+            return self._run(
+                session=session,
+                value="MATCH (n: "
+                + label
+                + ") RETURN n AS node, elementId(n) AS nodeId",
+                expect_data=True,
             )
-            return res.data()
 
+    @metrics.measure()
     def query_neighbor(self, elementId: str) -> List:
         """Return neighbors of a node based on a label.
 
@@ -217,26 +506,372 @@ class Connect(metaclass=singleton.Singleton):
         with self.driver.session(
             database=self.database, default_access_mode=neo4j.READ_ACCESS
         ) as session:
-            res = session.run(
-                "MATCH (n)-[r*1..1]-(m) WHERE elementId(n) = $elementId RETURN m AS nodeNeighbor, labels(m) as nodeLabels, elementId(m) as nodeId, r AS relationship",
-                elementId=elementId,
+            return self._run(
+                session=session,
+                value="MATCH (n)-[r*1..1]-(m) WHERE elementId(n) = $elementId RETURN m AS nodeNeighbor, labels(m) as nodeLabels, elementId(m) as nodeId, r AS relationship",
+                expect_data=True,
+                parameters=dict(elementId=elementId),
             )
-            return res.data()
 
-    def clean(self) -> None:
-        """Remove data into Neo4j
+    @metrics.measure()
+    def clean(self, tag: Optional[str] = None, chunk_size: int = 10000) -> None:
+        """Remove data into Neo4j, all nodes or only nodes of a tag.
+        Nodes are deleted by chunk, each one into its own transaction,
+        progress is reported every PROGRESS_CHUNKS chunks.
+
+        Parameters
+        ----------
+        tag: Optional[str] (default: None)
+            remove only the nodes having this tag
+        chunk_size: int (default: 10000)
+            number of nodes deleted by transaction
 
         Return
         ------
         None
         """
-        with self.driver.session(default_access_mode=neo4j.WRITE_ACCESS) as session:
-            res = session.run("MATCH (n) DETACH DELETE n")
-            res.single()
-            return None
+        patterns = ["(n)"]
+        if tag is not None:
+            # Match by label to use the index on tag
+            res = self.query(
+                value="CALL db.labels() YIELD label RETURN label",
+                expect_data=True,
+                access=neo4j.READ_ACCESS,
+            )
+            patterns = ["(n:`%s`)" % (x["label"],) for x in res or []]
+        condition = ""
+        if tag is not None:
+            condition = " WHERE n.tag = $tag"
+
+        # Counted once, a node may have several labels
+        res = self.query(
+            value="MATCH (n)" + condition + " RETURN count(n) AS count",
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+            parameters=dict(tag=tag),
+        )
+        total = res[0]["count"] if res else 0
+        logging.info("Number of nodes to delete: %s" % (total,))
+
+        que = (
+            "MATCH "
+            + "%s"
+            + condition
+            + " WITH n LIMIT $limit CALL { WITH n DETACH DELETE n }"
+            + " IN TRANSACTIONS OF $size ROWS RETURN count(n) AS count"
+        )
+        limit = chunk_size * self.PROGRESS_CHUNKS
+        deleted = 0
+        for pattern in patterns:
+            while True:
+                res = self.query(
+                    value=que % (pattern,),
+                    expect_data=True,
+                    parameters=dict(tag=tag, limit=limit, size=chunk_size),
+                )
+                count = res[0]["count"] if res else 0
+                deleted += count
+                if count > 0:
+                    logging.info("Nodes deleted: %s/%s" % (deleted, total))
+                if count < limit:
+                    break
+        return None
+
+    @metrics.measure()
+    def convert_properties(
+        self, tag: Optional[str] = None, chunk_size: int = 10000
+    ) -> int:
+        """Convert the properties stored as string to numbers or booleans, in place.
+        A property is converted for a label if all its values match the same pattern
+        of CONVERSIONS, "nan" excepted. Ids and tags are kept as string.
+        Nodes are updated by chunk, each one into its own transaction.
+
+        Parameters
+        ----------
+        tag: Optional[str] (default: None)
+            convert only the nodes having this tag
+        chunk_size: int (default: 10000)
+            number of nodes updated by transaction
+
+        Return
+        ------
+        int
+            number of values converted
+        """
+        res = self.query(
+            value="CALL db.labels() YIELD label RETURN label",
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+        )
+        labels = [x["label"] for x in res or [] if x["label"] != self.LABEL_LEDGER]
+        condition = "" if tag is None else " WHERE n.tag = $tag"
+        patterns = {"p%s" % (ix,): x[1] for ix, x in enumerate(self.CONVERSIONS)}
+        counts = ", ".join(
+            "sum(CASE WHEN value =~ $%s THEN 1 ELSE 0 END) AS %s" % (x, x)
+            for x in patterns.keys()
+        )
+        limit = chunk_size * self.PROGRESS_CHUNKS
+        converted = 0
+        for label in labels:
+            # Count the values stored as string matching each pattern, by property
+            que = (
+                "MATCH (n:`%s`)" % (label.replace("`", "``"),)
+                + condition
+                + " UNWIND keys(n) AS key WITH key, n[key] AS value"
+                + " WHERE NOT key IN $strings AND toString(value) = value"
+                + " AND value <> 'nan' RETURN key, count(*) AS count, "
+                + counts
+            )
+            res = self.query(
+                value=que,
+                expect_data=True,
+                access=neo4j.READ_ACCESS,
+                parameters=dict(tag=tag, strings=self.STRING_PROPERTIES, **patterns),
+            )
+            for row in res or []:
+                kinds = [
+                    kind
+                    for (kind, _), key in zip(self.CONVERSIONS, patterns.keys())
+                    if row[key] == row["count"]
+                ]
+                if not kinds:
+                    continue
+                prop = "`%s`" % (row["key"].replace("`", "``"),)
+                pattern = dict(self.CONVERSIONS)[kinds[0]]
+                que = (
+                    "MATCH (n:`%s`)" % (label.replace("`", "``"),)
+                    + (" WHERE" if tag is None else condition + " AND")
+                    + " n.%s =~ $pattern WITH n LIMIT $limit" % (prop,)
+                    + " CALL { WITH n SET n.%s = %s(n.%s) }"
+                    % (prop, self.CONVERTERS[kinds[0]], prop)
+                    + " IN TRANSACTIONS OF $size ROWS RETURN count(n) AS count"
+                )
+                while True:
+                    res_convert = self.query(
+                        value=que,
+                        expect_data=True,
+                        parameters=dict(
+                            tag=tag, pattern=pattern, limit=limit, size=chunk_size
+                        ),
+                    )
+                    count = res_convert[0]["count"] if res_convert else 0
+                    converted += count
+                    if count < limit:
+                        break
+                logging.info(
+                    "Property %s of %s converted to %s" % (row["key"], label, kinds[0])
+                )
+        logging.info("Values converted: %s" % (converted,))
+        return converted
+
+    @metrics.measure()
+    def query_stoichiometry(
+        self, types: List[str], tag: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the species of each reaction with their stoichiometry, in one query.
+        A species is linked to a reaction either directly or by a SpeciesReference
+        linked to the species by HAS_SPECIES. The stoichiometry is read on the
+        species, or the species reference, or else on the relationship, 1 by default.
+
+        Parameters
+        ----------
+        types: List[str]
+            types of the relationships between a reaction and its species
+        tag: Optional[str] (default: None)
+            return only the reactions having this tag
+
+        Return
+        ------
+        List[Dict[str, Any]]
+            keys: reaction, species, type, stoichiometry
+        """
+        condition = "" if tag is None else " AND r.tag = $tag"
+        que = (
+            "MATCH (r:Reaction)-[rel]-(s) WHERE type(rel) IN $types"
+            + condition
+            + " OPTIONAL MATCH (s)-[:HAS_SPECIES]->(sp:Species)"
+            + " RETURN r.id AS reaction, coalesce(sp.id, s.id) AS species,"
+            + " type(rel) AS type,"
+            + " toFloat(coalesce(s.stoichiometry, rel.stoichiometry, 1)) AS stoichiometry"
+        )
+        res = self.query(
+            value=que,
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+            parameters=dict(types=types, tag=tag),
+        )
+        return res or []
+
+    @metrics.measure()
+    def create_indexes(self, labels: List[str]) -> None:
+        """Create the indexes of each label, if they do not exist:
+        one on the tag, used by clean(tag) and the queries by tag,
+        one on the tag and the id, used to match the nodes of a model.
+
+        Parameters
+        ----------
+        labels: List[str]
+            labels of the nodes
+
+        Return
+        ------
+        None
+        """
+        for label in sorted(set(labels)):
+            for keys in ["n.tag", "n.tag, n.id"]:
+                que = "CREATE INDEX IF NOT EXISTS FOR (n:`%s`) ON (%s)" % (label, keys)
+                self.query(value=que)
+
+    @metrics.measure()
+    def query_statistics(
+        self, by_tag: bool = False, properties: bool = False, workers: int = 8
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Count nodes by label and relationships by type.
+        Counts are served by the count store, queries are issued concurrently.
+        Breakdowns by tag and by property scan the data, they are optional.
+
+        Parameters
+        ----------
+        by_tag: bool (default: False)
+            count entities by tag
+        properties: bool (default: False)
+            count nodes having each property, by label
+        workers: int (default: 8)
+            number of queries issued concurrently
+
+        Return
+        ------
+        Dict[str, List[Dict[str, Any]]]
+            Keys: nodes, relationships and optionally nodes_by_tag, relationships_by_tag, properties
+        """
+        res = self.query(
+            value="CALL db.labels() YIELD label RETURN label",
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+        )
+        labels = [x["label"] for x in res or []]
+        res = self.query(
+            value="CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType AS type",
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+        )
+        types = [x["type"] for x in res or []]
+
+        queries = []
+        for label in labels:
+            queries.append("MATCH (:`%s`) RETURN count(*) AS count" % (label,))
+        for rtype in types:
+            queries.append("MATCH ()-[:`%s`]->() RETURN count(*) AS count" % (rtype,))
+        if by_tag:
+            for label in labels:
+                queries.append(
+                    "MATCH (n:`%s`) WHERE n.tag IS NOT NULL RETURN n.tag AS tag, count(*) AS count"
+                    % (label,)
+                )
+            for rtype in types:
+                queries.append(
+                    "MATCH ()-[r:`%s`]->() WHERE r.tag IS NOT NULL RETURN r.tag AS tag, count(*) AS count"
+                    % (rtype,)
+                )
+        if properties:
+            for label in labels:
+                queries.append(
+                    "MATCH (n:`%s`) UNWIND keys(n) AS property RETURN property, count(*) AS count"
+                    % (label,)
+                )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    metrics.METRICS.bind(
+                        lambda x: self.query(
+                            value=x, expect_data=True, access=neo4j.READ_ACCESS
+                        )
+                    ),
+                    queries,
+                )
+            )
+        results.reverse()
+
+        data: Dict[str, List[Dict[str, Any]]] = {}
+        data["nodes"] = [
+            {"label": x, "value.count": results.pop()[0]["count"]} for x in labels
+        ]
+        data["relationships"] = [
+            {"type": x, "value.count": results.pop()[0]["count"]} for x in types
+        ]
+        if by_tag:
+            data["nodes_by_tag"] = []
+            for label in labels:
+                for record in results.pop():
+                    data["nodes_by_tag"].append(dict(label=label, **record))
+            data["relationships_by_tag"] = []
+            for rtype in types:
+                for record in results.pop():
+                    data["relationships_by_tag"].append(dict(type=rtype, **record))
+        if properties:
+            data["properties"] = []
+            for label in labels:
+                for record in results.pop():
+                    data["properties"].append(dict(label=label, **record))
+        return data
+
+    @metrics.measure()
+    def query_fingerprint(self, tag: Optional[str] = None) -> Optional[str]:
+        """Return the fingerprint of the last import of a model.
+
+        Parameters
+        ----------
+        tag: Optional[str] (default: None)
+            the tag of the model
+
+        Return
+        ------
+        Optional[str]
+        """
+        que = (
+            "MATCH (n:"
+            + self.LABEL_LEDGER
+            + " {tag: $tag}) RETURN n.fingerprint AS fingerprint"
+        )
+        res = self.query(
+            value=que,
+            expect_data=True,
+            access=neo4j.READ_ACCESS,
+            parameters=dict(tag=tag or ""),
+        )
+        if res:
+            return res[0]["fingerprint"]
+        return None
+
+    @metrics.measure()
+    def save_fingerprint(self, fingerprint: str, tag: Optional[str] = None) -> None:
+        """Store the fingerprint of a model imported into a ledger node.
+
+        Parameters
+        ----------
+        fingerprint: str
+            the fingerprint of the import
+        tag: Optional[str] (default: None)
+            the tag of the model
+
+        Return
+        ------
+        None
+        """
+        que = (
+            "MERGE (n:"
+            + self.LABEL_LEDGER
+            + " {tag: $tag}) SET n.fingerprint = $fingerprint, n.date = datetime()"
+        )
+        self.query(value=que, parameters=dict(tag=tag or "", fingerprint=fingerprint))
 
     def query(
-        self, value: str, expect_data: bool = False, access: str = neo4j.WRITE_ACCESS
+        self,
+        value: str,
+        expect_data: bool = False,
+        access: str = neo4j.WRITE_ACCESS,
+        parameters: Optional[Dict[str, Any]] = None,
     ) -> Optional[List]:
         """Execute query into Neo4j.
 
@@ -248,18 +883,75 @@ class Connect(metaclass=singleton.Singleton):
             return or not a value
         access: str (default: neo4j.WRITE_ACCESS)
             Choices between [neo4j.READ_ACCESS, WRITE_ACCESS]
+        parameters: Optional[Dict[str, Any]] (default: None)
+            parameters of the query
 
         Return
         ------
         A list of results if expect_data is set
         """
-        with self.driver.session(default_access_mode=access) as session:
-            res = session.run(value)
+        with self.driver.session(
+            database=self.database, default_access_mode=access
+        ) as session:
+            res = self._run(
+                session=session,
+                value=value,
+                expect_data=expect_data,
+                parameters=parameters,
+            )
             if expect_data:
-                return res.data()
-            res.single()
+                return res
             return None
 
+    def _run(
+        self,
+        session: neo4j.Session,
+        value: str,
+        expect_data: bool = False,
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Run a query into a session, count it with the metrics.
+
+        Parameters
+        ----------
+        session: neo4j.Session
+            an opened session
+        value: str
+            the query
+        expect_data: bool (default: False)
+            return all records or only the first one
+        parameters: Optional[Dict[str, Any]] (default: None)
+            parameters of the query
+
+        Return
+        ------
+        The list of records if expect_data is set, the first record otherwise
+        """
+        res = session.run(value, parameters=parameters)
+        if expect_data:
+            data = res.data()
+            records = len(data)
+        else:
+            data = res.single()
+            records = int(data is not None)
+        if metrics.METRICS.enabled:
+            counters = res.consume().counters
+            metrics.count(key="queries")
+            metrics.count(
+                key="round_trips",
+                value=max(1, math.ceil(records / self.FETCH_SIZE)),
+            )
+            metrics.count(key="records_read", value=records)
+            metrics.count(
+                key="rows_written",
+                value=counters.nodes_created
+                + counters.nodes_deleted
+                + counters.relationships_created
+                + counters.relationships_deleted,
+            )
+            metrics.count(key="properties_set", value=counters.properties_set)
+        return data
+
     def __del__(self):
         """Close the driver"""
         self.driver.close()
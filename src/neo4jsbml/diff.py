@@ -0,0 +1,178 @@
+from typing import Any, Dict, List, Tuple
+
+from neo4jsbml import entity, snode, srelationship
+
+
+class Diff(object):
+    """Differences between entities freshly formatted and entities stored into Neo4j.
+    Entities are compared by their key and the hash of their properties.
+
+    Attributes
+    ----------
+    creates: List[entity.Entity]
+        entities not stored
+    updates: List[entity.Entity]
+        entities stored with other properties
+    deletes: List[entity.Entity]
+        entities stored but not formatted anymore
+
+    Methods
+    -------
+    __init__(creates: List[entity.Entity], updates: List[entity.Entity], deletes: List[entity.Entity])
+        Instanciate a new object
+
+    is_empty() -> bool
+        Check if there is no difference
+
+    @classmethod
+    node_key(node: snode.SNode) -> Tuple
+        Identify a node: its labels and its id
+
+    @classmethod
+    relationship_key(rel: srelationship.SRelationship) -> Tuple
+        Identify a relationship: its type and the ids of its nodes
+
+    @classmethod
+    from_nodes(nodes: List[snode.SNode], records: List[Dict[str, Any]]) -> "Diff"
+        Compare nodes with the records queried from Neo4j
+
+    @classmethod
+    from_relationships(relationships: List[srelationship.SRelationship], records: List[Dict[str, Any]]) -> "Diff"
+        Compare relationships with the records queried from Neo4j
+    """
+
+    def __init__(
+        self,
+        creates: List[entity.Entity],
+        updates: List[entity.Entity],
+        deletes: List[entity.Entity],
+    ) -> None:
+        self.creates = creates
+        self.updates = updates
+        self.deletes = deletes
+
+    def is_empty(self) -> bool:
+        """Check if there is no difference.
+
+        Return
+        ------
+        bool
+        """
+        return (
+            len(self.creates) == 0 and len(self.updates) == 0 and len(self.deletes) == 0
+        )
+
+    @classmethod
+    def node_key(cls, node: snode.SNode) -> Tuple:
+        """Identify a node: its labels and its id.
+
+        Parameters
+        ----------
+        node: snode.SNode
+            a node
+
+        Return
+        ------
+        Tuple
+        """
+        return (tuple(sorted(node.labels)), node.id)
+
+    @classmethod
+    def relationship_key(cls, rel: srelationship.SRelationship) -> Tuple:
+        """Identify a relationship: its type and the ids of its nodes.
+
+        Parameters
+        ----------
+        rel: srelationship.SRelationship
+            a relationship
+
+        Return
+        ------
+        Tuple
+        """
+        return (rel.label, rel.from_id, rel.to_id)
+
+    @classmethod
+    def _compare(
+        cls, fresh: Dict[Tuple, entity.Entity], stored: Dict[Tuple, entity.Entity]
+    ) -> "Diff":
+        creates, updates, deletes = [], [], []
+        for key, value in fresh.items():
+            if key not in stored.keys():
+                creates.append(value)
+            elif value.hash_properties() != stored[key].hash_properties():
+                updates.append(value)
+        for key, value in stored.items():
+            if key not in fresh.keys():
+                deletes.append(value)
+        return Diff(creates=creates, updates=updates, deletes=deletes)
+
+    @classmethod
+    def from_nodes(
+        cls, nodes: List[snode.SNode], records: List[Dict[str, Any]]
+    ) -> "Diff":
+        """Compare nodes with the records queried from Neo4j.
+
+        Parameters
+        ----------
+        nodes: List[snode.SNode]
+            nodes formatted from the SBML file
+        records: List[Dict[str, Any]]
+            nodes stored, keys: labels, properties
+
+        Return
+        ------
+        Diff
+        """
+        fresh = {Diff.node_key(node=x): x for x in nodes}
+        stored = {}
+        for record in records:
+            properties = dict(record["properties"])
+            node = snode.SNode(
+                id=properties.pop("id", ""),
+                labels=record["labels"],
+                properties=properties,
+            )
+            stored[Diff.node_key(node=node)] = node
+        return cls._compare(fresh=fresh, stored=stored)
+
+    @classmethod
+    def from_relationships(
+        cls,
+        relationships: List[srelationship.SRelationship],
+        records: List[Dict[str, Any]],
+    ) -> "Diff":
+        """Compare relationships with the records queried from Neo4j.
+
+        Parameters
+        ----------
+        relationships: List[srelationship.SRelationship]
+            relationships formatted from the SBML file
+        records: List[Dict[str, Any]]
+            relationships stored, keys: label, from_label, from_id, to_label, to_id, properties
+
+        Return
+        ------
+        Diff
+        """
+        fresh = {Diff.relationship_key(rel=x): x for x in relationships}
+        stored = {}
+        for record in records:
+            rel = srelationship.SRelationship(
+                id="",
+                from_label=record["from_label"],
+                to_label=record["to_label"],
+                from_id=record["from_id"],
+                to_id=record["to_id"],
+                label=record["label"],
+                properties=dict(record["properties"]),
+            )
+            stored[Diff.relationship_key(rel=rel)] = rel
+        return cls._compare(fresh=fresh, stored=stored)
+
+    def __repr__(self):
+        return "creates: %s, updates: %s, deletes: %s" % (
+            len(self.creates),
+            len(self.updates),
+            len(self.deletes),
+        )
@@ -1,6 +1,9 @@
 import copy
+import hashlib
 import json
 import logging
+import math
+import sys
 from abc import ABCMeta
 from typing import Any, Dict, List, Optional
 
@@ -9,6 +12,8 @@ from neo4jsbml import _version
 
 class Entity(metaclass=ABCMeta):
     """Associate a Node from arrows to the Node object.
+    Attributes are slotted and the keys of the properties interned:
+    millions of entities are held in memory before being written.
 
     Attributes
     ----------
@@ -35,8 +40,24 @@ class Entity(metaclass=ABCMeta):
 
     properties_to_neo4j() -> str
         Format properties to insert in query
+
+    properties_to_parameters() -> Dict[str, Any]
+        Format properties to pass as parameters of a query
+
+    hash_properties() -> str
+        Compute a hash of the properties as stored into Neo4j
+
+    @classmethod
+    copy_properties(properties: Dict[str, Any]) -> Dict[str, Any]
+        Copy properties, sharing their keys
+
+    @classmethod
+    to_parameter(value: Any) -> Any
+        Format a value to pass as parameter of a query
     """
 
+    __slots__ = ("id", "properties")
+
     def __init__(self, id: str, properties: Dict[str, str], *args, **kwargs) -> None:
         self.id = id
         self.properties = properties
@@ -97,7 +118,23 @@ class Entity(metaclass=ABCMeta):
         if (self.has_property(label=label) and overwrite) or not self.has_property(
             label=label
         ):
-            self.properties[label] = value
+            self.properties[sys.intern(label)] = value
+
+    @classmethod
+    def copy_properties(cls, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy properties, sharing their keys.
+        Values are scalars, a shallow copy is enough.
+
+        Parameters
+        ----------
+        properties: Dict[str, Any]
+            properties
+
+        Return
+        ------
+        Dict[str, Any]
+        """
+        return {sys.intern(k): v for k, v in properties.items()}
 
     def id_to_neo4j(self, id: Optional[str] = None) -> str:
         """Format ids to insert in query
@@ -120,7 +157,8 @@ class Entity(metaclass=ABCMeta):
         return data
 
     def properties_to_neo4j(self) -> str:
-        """Format properties to insert in query
+        """Format properties to insert in query.
+        Numbers and booleans are written as literals, other values as strings.
 
         Return
         ------
@@ -129,9 +167,56 @@ class Entity(metaclass=ABCMeta):
         data = "{"
         for k, v in self.properties.items():
             data += k
-            data += ': "'
-            data += str(v)
-            data += '", '
+            data += ": "
+            if isinstance(v, bool):
+                data += "true" if v else "false"
+            elif isinstance(v, (int, float)) and math.isfinite(v):
+                data += str(v)
+            else:
+                data += '"' + str(v) + '"'
+            data += ", "
         data = data[:-2]
         data += "}"
         return data
+
+    def properties_to_parameters(self) -> Dict[str, Any]:
+        """Format properties to pass as parameters of a query, their types are kept.
+
+        Return
+        ------
+        Dict[str, Any]
+        """
+        return {k: Entity.to_parameter(v) for k, v in self.properties.items()}
+
+    @classmethod
+    def to_parameter(cls, value: Any) -> Any:
+        """Format a value to pass as parameter of a query.
+        Numbers and booleans are kept, quotes escaped by clean_properties() are restored.
+
+        Parameters
+        ----------
+        value: Any
+            a value of a property
+
+        Return
+        ------
+        Any
+        """
+        if isinstance(value, (bool, int, float)):
+            return value
+        return str(value).replace('\\"', '"')
+
+    def hash_properties(self) -> str:
+        """Compute a hash of the properties as stored into Neo4j.
+        Values are compared as string, whatever their type into Neo4j: a property
+        stored as string or converted by convert_properties() has the same hash.
+        Quotes escaped by clean_properties() are not.
+
+        Return
+        ------
+        str
+        """
+        data = {}
+        for k, v in self.properties.items():
+            data[k] = str(v).replace('\\"', '"')
+        return hashlib.md5(json.dumps(data, sort_keys=True).encode("utf8")).hexdigest()
@@ -356,7 +356,9 @@ class GraphMethod(object):
                     if obj:
                         label = method.replace("create", "")
                         count += 1
-                        graph.add_node(count, labels=label, level=level + 1, obj=obj)
+                        # Keep a copy owned by python: a later call, e.g. Reaction.createKineticLaw,
+                        # may replace and free the object created into the document
+                        graph.add_node(count, labels=label, level=level + 1, obj=obj.clone())
                         graph.add_edge(node_id, count)
                 del cur_obj  # rm warning var unused
             if len(node_ids) == len(graph.nodes):
@@ -0,0 +1,440 @@
+import collections
+import functools
+import itertools
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from neo4jsbml import backend, batch, snode, srelationship
+
+
+def _synchronized(func: Callable) -> Callable:
+    """Run a method of Memory holding its lock, the store is shared between threads.
+
+    Parameters
+    ----------
+    func: Callable
+        a method
+
+    Return
+    ------
+    Callable
+    """
+
+    @functools.wraps(func)
+    def _wrapper(self, *args, **kwargs):
+        with self._lock:
+            return func(self, *args, **kwargs)
+
+    return _wrapper
+
+
+class Memory(backend.Backend):
+    """In-process graph store, a replacement of Connect without Neo4j.
+    Nodes are indexed by label and by (label, id), relationships by (from, type, to).
+    Values of node properties are stored as string, as Connect does.
+    Public methods are serialized by a lock, the object can be shared between threads.
+
+    Attributes
+    ----------
+    nodes: Dict[str, Dict[str, Any]]
+        nodes by element id, keys: labels, properties
+    relationships: Dict[str, Dict[str, Any]]
+        relationships by element id, keys: type, from, to, properties
+
+    Methods
+    -------
+    __init__()
+        Instanciate an empty store
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.relationships: Dict[str, Dict[str, Any]] = {}
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        self._index_label: Dict[str, Dict[str, None]] = collections.defaultdict(dict)
+        self._index_id: Dict[Tuple[str, str], Set[str]] = collections.defaultdict(set)
+        self._index_relationship: Dict[Tuple[str, str, str], str] = {}
+        self._adjacency: Dict[str, Dict[str, None]] = collections.defaultdict(dict)
+
+    def is_connected(self) -> bool:
+        return True
+
+    def _new_id(self) -> str:
+        return str(next(self._counter))
+
+    def _match_nodes(
+        self, label: str, ident: str, tag: Optional[str] = None
+    ) -> List[str]:
+        res = []
+        for node_id in sorted(self._index_id.get((label, ident), set()), key=int):
+            if tag is None or self.nodes[node_id]["properties"].get("tag") == tag:
+                res.append(node_id)
+        return res
+
+    def _add_node(self, labels: List[str], properties: Dict[str, Any]) -> str:
+        node_id = self._new_id()
+        self.nodes[node_id] = dict(labels=list(labels), properties={})
+        for label in labels:
+            self._index_label[label][node_id] = None
+        self._set_node_properties(node_id=node_id, properties=properties)
+        return node_id
+
+    def _set_node_properties(
+        self, node_id: str, properties: Dict[str, Any], replace: bool = False
+    ) -> None:
+        node = self.nodes[node_id]
+        ident = node["properties"].get("id")
+        if ident is not None:
+            for label in node["labels"]:
+                self._index_id[(label, ident)].discard(node_id)
+        if replace:
+            node["properties"] = {}
+        for key, value in properties.items():
+            node["properties"][key] = snode.SNode.to_parameter(value)
+        ident = node["properties"].get("id")
+        if ident is not None:
+            for label in node["labels"]:
+                self._index_id[(label, ident)].add(node_id)
+
+    def _remove_node(self, node_id: str) -> None:
+        for rel_id in list(self._adjacency.get(node_id, {}).keys()):
+            self._remove_relationship(rel_id=rel_id)
+        node = self.nodes.pop(node_id)
+        for label in node["labels"]:
+            self._index_label[label].pop(node_id, None)
+            ident = node["properties"].get("id")
+            if ident is not None:
+                self._index_id[(label, ident)].discard(node_id)
+        self._adjacency.pop(node_id, None)
+
+    def _remove_relationship(self, rel_id: str) -> None:
+        rel = self.relationships.pop(rel_id)
+        self._index_relationship.pop((rel["from"], rel["type"], rel["to"]), None)
+        self._adjacency[rel["from"]].pop(rel_id, None)
+        self._adjacency[rel["to"]].pop(rel_id, None)
+
+    def _find_relationships(
+        self, rel: srelationship.SRelationship
+    ) -> List[Tuple[str, str, str]]:
+        tag = rel.properties.get("tag")
+        res = []
+        for from_node_id in self._match_nodes(
+            label=rel.from_label, ident=rel.from_id, tag=tag
+        ):
+            for to_node_id in self._match_nodes(
+                label=rel.to_label, ident=rel.to_id, tag=tag
+            ):
+                res.append((from_node_id, rel.label, to_node_id))
+        return res
+
+    @_synchronized
+    @_synchronized
+    def create_nodes(self, nodes: Union[List[snode.SNode], batch.NodeBatch]) -> None:
+        for node in nodes:
+            tag = node.properties.get("tag")
+            candidates = [
+                x
+                for x in self._match_nodes(label=node.labels[0], ident=node.id, tag=tag)
+                if set(node.labels).issubset(self.nodes[x]["labels"])
+            ]
+            if candidates:
+                node_id = candidates[0]
+            else:
+                node_id = self._add_node(
+                    labels=node.labels, properties=dict(id=node.id)
+                )
+            self._set_node_properties(node_id=node_id, properties=node.properties)
+
+    @_synchronized
+    def create_relationships(
+        self,
+        relationships: Union[
+            List[srelationship.SRelationship], batch.RelationshipBatch
+        ],
+    ) -> None:
+        for rel in relationships:
+            for key in self._find_relationships(rel=rel):
+                if key in self._index_relationship.keys():
+                    continue
+                rel_id = self._new_id()
+                self.relationships[rel_id] = dict(
+                    type=key[1],
+                    properties=dict(rel.properties),
+                    **{"from": key[0], "to": key[2]},
+                )
+                self._index_relationship[key] = rel_id
+                self._adjacency[key[0]][rel_id] = None
+                self._adjacency[key[2]][rel_id] = None
+
+    @_synchronized
+    def update_nodes(self, nodes: List[snode.SNode]) -> None:
+        for node in nodes:
+            tag = node.properties.get("tag")
+            for node_id in self._match_nodes(
+                label=node.labels[0], ident=node.id, tag=tag
+            ):
+                properties = dict(node.properties)
+                properties["id"] = node.id
+                self._set_node_properties(
+                    node_id=node_id, properties=properties, replace=True
+                )
+
+    @_synchronized
+    def delete_nodes(self, nodes: List[snode.SNode]) -> None:
+        for node in nodes:
+            tag = node.properties.get("tag")
+            for node_id in self._match_nodes(
+                label=node.labels[0], ident=node.id, tag=tag
+            ):
+                self._remove_node(node_id=node_id)
+
+    @_synchronized
+    def update_relationships(
+        self, relationships: List[srelationship.SRelationship]
+    ) -> None:
+        for rel in relationships:
+            for key in self._find_relationships(rel=rel):
+                rel_id = self._index_relationship.get(key)
+                if rel_id is not None:
+                    self.relationships[rel_id]["properties"] = dict(rel.properties)
+
+    @_synchronized
+    def delete_relationships(
+        self, relationships: List[srelationship.SRelationship]
+    ) -> None:
+        for rel in relationships:
+            for key in self._find_relationships(rel=rel):
+                rel_id = self._index_relationship.get(key)
+                if rel_id is not None:
+                    self._remove_relationship(rel_id=rel_id)
+
+    @_synchronized
+    def query_labels(self) -> List:
+        return [dict(label=list(x["labels"])) for x in self.nodes.values()]
+
+    @_synchronized
+    def query_node(self, label: str) -> List:
+        res = []
+        for node_id in self._index_label.get(label, {}).keys():
+            res.append(
+                dict(node=dict(self.nodes[node_id]["properties"]), nodeId=node_id)
+            )
+        return res
+
+    @_synchronized
+    def query_neighbor(self, elementId: str) -> List:
+        res = []
+        for rel_id in self._adjacency.get(elementId, {}).keys():
+            rel = self.relationships[rel_id]
+            neighbor_id = rel["to"] if rel["from"] == elementId else rel["from"]
+            relationship = (
+                dict(self.nodes[rel["from"]]["properties"]),
+                rel["type"],
+                dict(self.nodes[rel["to"]]["properties"]),
+            )
+            res.append(
+                dict(
+                    nodeNeighbor=dict(self.nodes[neighbor_id]["properties"]),
+                    nodeLabels=list(self.nodes[neighbor_id]["labels"]),
+                    nodeId=neighbor_id,
+                    relationship=[relationship],
+                )
+            )
+        return res
+
+    @_synchronized
+    def query_tagged_nodes(self, tag: str) -> List[Dict[str, Any]]:
+        res = []
+        for node in self.nodes.values():
+            if self.LABEL_LEDGER in node["labels"]:
+                continue
+            if node["properties"].get("tag") == tag:
+                res.append(
+                    dict(
+                        labels=list(node["labels"]), properties=dict(node["properties"])
+                    )
+                )
+        return res
+
+    @_synchronized
+    def query_tagged_relationships(self, tag: str) -> List[Dict[str, Any]]:
+        res = []
+        for rel in self.relationships.values():
+            if rel["properties"].get("tag") != tag:
+                continue
+            from_node = self.nodes[rel["from"]]
+            to_node = self.nodes[rel["to"]]
+            res.append(
+                dict(
+                    label=rel["type"],
+                    from_label=from_node["labels"][0],
+                    from_id=from_node["properties"].get("id"),
+                    to_label=to_node["labels"][0],
+                    to_id=to_node["properties"].get("id"),
+                    properties=dict(rel["properties"]),
+                )
+            )
+        return res
+
+    @_synchronized
+    def query_statistics(
+        self, by_tag: bool = False, properties: bool = False, workers: int = 8
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        data: Dict[str, List[Dict[str, Any]]] = {}
+        data["nodes"] = [
+            {"label": label, "value.count": len(node_ids)}
+            for label, node_ids in self._index_label.items()
+        ]
+        types: Dict[str, int] = collections.Counter(
+            x["type"] for x in self.relationships.values()
+        )
+        data["relationships"] = [
+            {"type": rtype, "value.count": count} for rtype, count in types.items()
+        ]
+        if by_tag:
+            counter: Dict[Tuple[str, str], int] = collections.Counter()
+            for label, node_ids in self._index_label.items():
+                for node_id in node_ids.keys():
+                    tag = self.nodes[node_id]["properties"].get("tag")
+                    if tag is not None:
+                        counter[(label, tag)] += 1
+            data["nodes_by_tag"] = [
+                dict(label=label, tag=tag, count=count)
+                for (label, tag), count in counter.items()
+            ]
+            counter = collections.Counter()
+            for rel in self.relationships.values():
+                tag = rel["properties"].get("tag")
+                if tag is not None:
+                    counter[(rel["type"], tag)] += 1
+            data["relationships_by_tag"] = [
+                dict(type=rtype, tag=tag, count=count)
+                for (rtype, tag), count in counter.items()
+            ]
+        if properties:
+            counter = collections.Counter()
+            for label, node_ids in self._index_label.items():
+                for node_id in node_ids.keys():
+                    for key in self.nodes[node_id]["properties"].keys():
+                        counter[(label, key)] += 1
+            data["properties"] = [
+                dict(label=label, property=key, count=count)
+                for (label, key), count in counter.items()
+            ]
+        return data
+
+    @_synchronized
+    def query_stoichiometry(
+        self, types: List[str], tag: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        res = []
+        for rel in self.relationships.values():
+            if rel["type"] not in types:
+                continue
+            ends = [rel["from"], rel["to"]]
+            if "Reaction" not in self.nodes[ends[0]]["labels"]:
+                ends.reverse()
+            reaction, species = (self.nodes[x] for x in ends)
+            if "Reaction" not in reaction["labels"]:
+                continue
+            if tag is not None and reaction["properties"].get("tag") != tag:
+                continue
+            # A species reference points to its species
+            ident = species["properties"].get("id")
+            for rel_id in self._adjacency.get(ends[1], {}).keys():
+                sub = self.relationships[rel_id]
+                target = self.nodes[sub["to"]]
+                if (
+                    sub["type"] == "HAS_SPECIES"
+                    and sub["from"] == ends[1]
+                    and "Species" in target["labels"]
+                ):
+                    ident = target["properties"].get("id")
+                    break
+            stoichiometry = species["properties"].get(
+                "stoichiometry", rel["properties"].get("stoichiometry", 1)
+            )
+            res.append(
+                dict(
+                    reaction=reaction["properties"].get("id"),
+                    species=ident,
+                    type=rel["type"],
+                    stoichiometry=float(stoichiometry),
+                )
+            )
+        return res
+
+    @_synchronized
+    def query_fingerprint(self, tag: Optional[str] = None) -> Optional[str]:
+        for node_id in self._index_label.get(self.LABEL_LEDGER, {}).keys():
+            properties = self.nodes[node_id]["properties"]
+            if properties.get("tag") == (tag or ""):
+                return properties.get("fingerprint")
+        return None
+
+    @_synchronized
+    def save_fingerprint(self, fingerprint: str, tag: Optional[str] = None) -> None:
+        for node_id in self._index_label.get(self.LABEL_LEDGER, {}).keys():
+            if self.nodes[node_id]["properties"].get("tag") == (tag or ""):
+                self._set_node_properties(
+                    node_id=node_id, properties=dict(fingerprint=fingerprint)
+                )
+                return None
+        self._add_node(
+            labels=[self.LABEL_LEDGER],
+            properties=dict(tag=tag or "", fingerprint=fingerprint),
+        )
+        return None
+
+    @_synchronized
+    def create_indexes(self, labels: List[str]) -> None:
+        # Nodes are always indexed by label and id
+        return None
+
+    @_synchronized
+    def clean(self, tag: Optional[str] = None, chunk_size: int = 10000) -> None:
+        for node_id in list(self.nodes.keys()):
+            if tag is None or self.nodes[node_id]["properties"].get("tag") == tag:
+                self._remove_node(node_id=node_id)
+        return None
+
+    @_synchronized
+    def convert_properties(
+        self, tag: Optional[str] = None, chunk_size: int = 10000
+    ) -> int:
+        converters = {"int": int, "float": float, "bool": lambda x: x.lower() == "true"}
+        patterns = [(x, re.compile(y)) for x, y in self.CONVERSIONS]
+        converted = 0
+        for label, node_ids in self._index_label.items():
+            if label == self.LABEL_LEDGER:
+                continue
+            values: Dict[str, List[Tuple[str, str]]] = collections.defaultdict(list)
+            for node_id in node_ids.keys():
+                properties = self.nodes[node_id]["properties"]
+                if tag is not None and properties.get("tag") != tag:
+                    continue
+                for key, value in properties.items():
+                    if key in self.STRING_PROPERTIES or not isinstance(value, str):
+                        continue
+                    if value != "nan":
+                        values[key].append((node_id, value))
+            for key, items in values.items():
+                kinds = [
+                    kind
+                    for kind, regex in patterns
+                    if all(regex.fullmatch(x) for _, x in items)
+                ]
+                if not kinds:
+                    continue
+                for node_id, value in items:
+                    self.nodes[node_id]["properties"][key] = converters[kinds[0]](value)
+                converted += len(items)
+        return converted
+
+    def __repr__(self):
+        return "Nodes: %s\nRelationships: %s" % (
+            len(self.nodes),
+            len(self.relationships),
+        )
@@ -0,0 +1,300 @@
+import collections
+import contextlib
+import functools
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+
+class Metrics(object):
+    """Collect wall time, CPU time and counters by phase.
+    A phase is identified by its path, the names of the phases opened by the current thread.
+    Calls of a same path are aggregated into one record.
+    Counters are added to the global counters and to each phase opened by the current thread.
+    Listeners are notified when a phase starts and ends, e.g. profiling.Profiler.
+    Nothing is collected while the object is disabled.
+
+    Attributes
+    ----------
+    enabled: bool
+        collect or not
+    records: Dict[str, Dict[str, Any]]
+        records by path, keys: name, path, calls, wall_time, cpu_time, counters
+    counters: collections.Counter
+        counters of the whole run
+    listeners: List[Any]
+        objects with the methods enter(path: str) and exit(path: str)
+
+    Methods
+    -------
+    __init__(enabled: bool = False)
+        Instanciate a new object
+
+    phase(name: str, notify: bool = True) -> Generator
+        Context manager measuring a phase
+
+    count(key: str, value: int = 1) -> None
+        Increment a counter
+
+    bind(func: Callable) -> Callable
+        Run a function into the phases of the current thread, from another thread
+
+    reset() -> None
+        Remove all records
+
+    to_dict() -> Dict[str, Any]
+        Export records, counters and cache hit rates
+
+    to_json(path: str) -> None
+        Write the export into a JSON file
+    """
+
+    CACHE_HIT = ".hits"
+    CACHE_MISS = ".misses"
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.counters: collections.Counter = collections.Counter()
+        self.listeners: List[Any] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def phase(self, name: str, notify: bool = True) -> Generator:
+        """Context manager measuring a phase: wall time, CPU time of the process and counters.
+
+        Parameters
+        ----------
+        name: str
+            name of the phase
+        notify: bool (default: True)
+            notify the listeners
+
+        Return
+        ------
+        Generator
+        """
+        if self.enabled is False:
+            yield None
+            return
+        stack = self._stack()
+        path = "/".join([x["name"] for x in stack] + [name])
+        with self._lock:
+            if path not in self.records.keys():
+                self.records[path] = dict(
+                    name=name,
+                    path=path,
+                    calls=0,
+                    wall_time=0.0,
+                    cpu_time=0.0,
+                    counters=collections.Counter(),
+                )
+            record = self.records[path]
+        stack.append(record)
+        listeners = self.listeners if notify else []
+        for listener in listeners:
+            listener.enter(path=path)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            for listener in reversed(listeners):
+                listener.exit(path=path)
+            stack.pop()
+            with self._lock:
+                record["calls"] += 1
+                record["wall_time"] += wall
+                record["cpu_time"] += cpu
+
+    def count(self, key: str, value: int = 1) -> None:
+        """Increment a counter globally and for each phase opened by the current thread.
+
+        Parameters
+        ----------
+        key: str
+            name of the counter
+        value: int (default: 1)
+            increment
+
+        Return
+        ------
+        None
+        """
+        if self.enabled is False:
+            return None
+        with self._lock:
+            self.counters[key] += value
+            for record in self._stack():
+                record["counters"][key] += value
+        return None
+
+    def bind(self, func: Callable) -> Callable:
+        """Run a function into the phases of the current thread, for a pool of threads.
+
+        Parameters
+        ----------
+        func: Callable
+            a function
+
+        Return
+        ------
+        Callable
+        """
+        stack = list(self._stack())
+
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            previous = self._stack()
+            self._local.stack = list(stack)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.stack = previous
+
+        return _wrapper
+
+    def reset(self) -> None:
+        """Remove all records and counters.
+
+        Return
+        ------
+        None
+        """
+        with self._lock:
+            self.records = {}
+            self.counters = collections.Counter()
+        return None
+
+    @classmethod
+    def cache_rates(cls, counters: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+        """Compute hit rates from the counters "<cache>.hits" and "<cache>.misses".
+
+        Parameters
+        ----------
+        counters: Dict[str, int]
+            counters
+
+        Return
+        ------
+        Dict[str, Dict[str, Any]]
+        """
+        caches: Dict[str, Dict[str, Any]] = {}
+        for key, value in counters.items():
+            for suffix, kind in [(cls.CACHE_HIT, "hits"), (cls.CACHE_MISS, "misses")]:
+                if key.endswith(suffix):
+                    name = key[: -len(suffix)]
+                    caches.setdefault(name, dict(hits=0, misses=0))[kind] = value
+        for value in caches.values():
+            total = value["hits"] + value["misses"]
+            value["rate"] = value["hits"] / total if total > 0 else None
+        return caches
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export records, counters and cache hit rates.
+
+        Return
+        ------
+        Dict[str, Any]
+        """
+        with self._lock:
+            phases = []
+            for record in self.records.values():
+                phase = dict(record)
+                phase["counters"] = dict(record["counters"])
+                phase["cache"] = Metrics.cache_rates(counters=record["counters"])
+                phases.append(phase)
+            return dict(
+                phases=phases,
+                counters=dict(self.counters),
+                cache=Metrics.cache_rates(counters=self.counters),
+            )
+
+    def to_json(self, path: str) -> None:
+        """Write the export into a JSON file.
+
+        Parameters
+        ----------
+        path: str
+            a JSON file
+
+        Return
+        ------
+        None
+        """
+        with open(path, "w") as fod:
+            json.dump(self.to_dict(), fod, indent=4)
+        return None
+
+
+METRICS = Metrics()
+
+
+def phase(name: str, notify: bool = True) -> contextlib.AbstractContextManager:
+    """Measure a phase with the shared Metrics object.
+
+    Parameters
+    ----------
+    name: str
+        name of the phase
+    notify: bool (default: True)
+        notify the listeners
+
+    Return
+    ------
+    contextlib.AbstractContextManager
+    """
+    return METRICS.phase(name=name, notify=notify)
+
+
+def count(key: str, value: int = 1) -> None:
+    """Increment a counter of the shared Metrics object.
+
+    Parameters
+    ----------
+    key: str
+        name of the counter
+    value: int (default: 1)
+        increment
+
+    Return
+    ------
+    None
+    """
+    METRICS.count(key=key, value=value)
+
+
+def measure(name: Optional[str] = None) -> Callable:
+    """Decorator measuring each call of a function as a phase of the shared Metrics object.
+    Listeners are not notified, these phases are too fine-grained to be profiled.
+
+    Parameters
+    ----------
+    name: Optional[str] (default: None)
+        name of the phase, the qualified name of the function if None
+
+    Return
+    ------
+    Callable
+    """
+
+    def _decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            if METRICS.enabled is False:
+                return func(*args, **kwargs)
+            with METRICS.phase(name=label, notify=False):
+                return func(*args, **kwargs)
+
+        return _wrapper
+
+    return _decorator
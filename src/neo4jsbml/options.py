@@ -4,15 +4,16 @@ import os
 import sys
 from typing import Union
 
-from neo4jsbml import connect
+# Same as connect.Connect.PROTOCOLS, not imported to not load the driver of Neo4j
+PROTOCOLS = ["neo4j", "neo4j+s", "neo4j+ssc", "bolt", "bolt+s", "bolt+ssc"]
 
 
 def add_dbb_connection(parser: argparse._ActionsContainer) -> None:
     pind = parser.add_argument_group("Database connection - Individual parameter")
     pind.add_argument(
         "--input-protocol-str",
-        default=connect.Connect.PROTOCOLS[0],
-        choices=connect.Connect.PROTOCOLS,
+        default=PROTOCOLS[0],
+        choices=PROTOCOLS,
         help="Protocol used to connect the database",
     )
     pind.add_argument(
@@ -50,11 +51,19 @@ def add_dbb_connection(parser: argparse._ActionsContainer) -> None:
     )
 
 
+def add_input_shards(parser: argparse.ArgumentParser) -> None:
+    pshards = parser.add_argument_group("Database connection - Shards")
+    pshards.add_argument(
+        "--input-shards-ini",
+        help='Databases to route the models to by tag, sections [shard:<name>] and [routing], format "ini"',
+    )
+
+
 def add_input_model(parser: argparse._ActionsContainer) -> None:
     parser.add_argument(
         "--input-model-sbml",
         required=True,
-        help="SBML file model",
+        help="SBML file model, compressed (gz, bz2, xz, zst, zip) or not, or a member of an archive: models.zip/model.xml",
     )
 
 
@@ -64,3 +73,58 @@ def add_input_modelisation(parser: argparse._ActionsContainer) -> None:
         required=True,
         help="Modelisation created and downloaded from arrow",
     )
+
+
+def add_parameter_process(parser: argparse._ActionsContainer) -> None:
+    parser.add_argument(
+        "--parameter-process-int",
+        type=int,
+        default=1,
+        help="Number of processes used to map the schema to the data, nodes and relationships (default: 1)",
+    )
+
+
+def add_parameter_skip_unchanged(parser: argparse._ActionsContainer) -> None:
+    parser.add_argument(
+        "--parameter-skip-unchanged",
+        action="store_true",
+        help="Skip the import if the model, the schema and the tag are unchanged since the last import, a fingerprint is stored in the database",
+    )
+
+
+def add_parameter_incremental(parser: argparse._ActionsContainer) -> None:
+    parser.add_argument(
+        "--parameter-incremental",
+        action="store_true",
+        help="Compare entities with the ones stored with the same tag, write only the differences",
+    )
+
+
+def add_parameter_streaming(parser: argparse._ActionsContainer) -> None:
+    parser.add_argument(
+        "--parameter-streaming",
+        action="store_true",
+        help="Read the SBML file in one pass without libsbml, to lower the memory used by large models",
+    )
+
+
+def add_output_metrics(parser: argparse.ArgumentParser) -> None:
+    # Name of the top-level phase of the metrics
+    parser.set_defaults(metrics_phase=parser.prog.split()[-1])
+    poutput = parser.add_argument_group("Metrics")
+    poutput.add_argument(
+        "--output-metrics-json",
+        help="Time, counters and cache hit rates by phase, format JSON",
+    )
+
+
+def add_profile(parser: argparse.ArgumentParser) -> None:
+    pprofile = parser.add_argument_group("Profiling")
+    pprofile.add_argument(
+        "--profile-cpu",
+        help="Profile with cProfile, write the pstats of the run and one file by phase beside: <file>.<phase>",
+    )
+    pprofile.add_argument(
+        "--profile-memory",
+        help="Profile with tracemalloc, write the top allocations by phase, text file",
+    )
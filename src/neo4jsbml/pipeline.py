@@ -0,0 +1,438 @@
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from neo4jsbml import (
+    arrows,
+    backend,
+    compressed,
+    diff,
+    metrics,
+    sbml,
+    shard,
+    snode,
+    srelationship,
+    stream,
+)
+
+MODEL_EXTENSIONS = [".xml", ".sbml"]
+COMPRESSION_EXTENSIONS = [".gz", ".zip", ".bz2", ".xz", ".zst"]
+CHUNK_SIZE = 1 << 20
+
+
+def fingerprint(
+    path: str, modelisation: arrows.Arrows, tag: Optional[str] = None
+) -> str:
+    """Compute a hash identifying an import: the bytes of the SBML file, the modelisation and the tag.
+
+    Parameters
+    ----------
+    path: str
+        a SBML file, or a member of an archive
+    modelisation: arrows.Arrows
+        A modelisation
+    tag: Optional[str] (default: None)
+        an extra identifier for the entities
+
+    Return
+    ------
+    str
+    """
+    hasher = hashlib.sha256()
+    # A member of an archive is hashed decompressed, a file as stored
+    _, member = compressed.split(path=path)
+    fid = open(path, "rb") if member is None else compressed.open_binary(path=path)
+    with fid:
+        for chunk in iter(lambda: fid.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    schema = dict(
+        nodes=[x.to_dict() for x in modelisation.nodes],
+        relationships=[x.to_dict() for x in modelisation.relationships or []],
+    )
+    hasher.update(json.dumps(schema, sort_keys=True).encode("utf8"))
+    hasher.update((tag or "").encode("utf8"))
+    return hasher.hexdigest()
+
+
+def import_model(
+    connection: backend.Backend,
+    modelisation: arrows.Arrows,
+    path: str,
+    tag: Optional[str] = None,
+    dry_run: bool = False,
+    processes: int = 1,
+    skip_unchanged: bool = False,
+    incremental: bool = False,
+    streaming: bool = False,
+) -> Dict[str, Any]:
+    """Import a SBML model into Neo4j given a modelisation.
+    With skip_unchanged, the import is skipped if the fingerprint stored by the last import
+    of the tag is the same.
+    With incremental, entities are compared to the ones stored with the same tag,
+    only differences are written.
+    With streaming, the SBML file is read in one pass by stream.SbmlStream instead of libsbml.
+
+    Parameters
+    ----------
+    connection: backend.Backend
+        Connection object
+    modelisation: arrows.Arrows
+        A modelisation
+    path: str
+        a SBML file
+    tag: Optional[str] (default: None)
+        an extra identifier for the entities
+    dry_run: bool (default: False)
+        map the schema to the data without loading them into the database
+    processes: int (default: 1)
+        number of workers to map the schema to the data
+    skip_unchanged: bool (default: False)
+        skip the import if the model, the modelisation and the tag are unchanged
+    incremental: bool (default: False)
+        write only the differences with the entities stored, a tag is required
+    streaming: bool (default: False)
+        read the SBML file in one pass, without building the document
+
+    Raises
+    ------
+    ValueError
+        if incremental is set without tag
+
+    Return
+    ------
+    Dict[str, Any]
+        Number of nodes and relationships mapped, the import is skipped or not
+    """
+    if incremental and tag is None:
+        raise ValueError("Incremental import requires a tag")
+    ident = None
+    if skip_unchanged and dry_run is False:
+        with metrics.phase(name="fingerprint"):
+            ident = fingerprint(path=path, modelisation=modelisation, tag=tag)
+            if connection.query_fingerprint(tag=tag) == ident:
+                logging.info(
+                    "Model unchanged since the last import, skip: %s" % (path,)
+                )
+                metrics.count(key="models_skipped")
+                return dict(nodes=0, relationships=0, skipped=True)
+
+    if streaming:
+        logging.info("Map schema to data - streaming")
+        with metrics.phase(name="stream"):
+            nod, rel = stream.SbmlStream(path=path, tag=tag).format(
+                nodes=modelisation.nodes, relationships=modelisation.relationships
+            )
+            metrics.count(key="nodes", value=len(nod))
+            metrics.count(key="relationships", value=len(rel))
+    else:
+        logging.info("Load SBML file")
+        with metrics.phase(name="from_sbml"):
+            sbm = sbml.SbmlToNeo4j.from_sbml(path=path, tag=tag)
+
+        # Mapping, appended into batches if the entities are only written
+        as_batch = not incremental and processes <= 1
+        logging.info("Map schema to data - nodes")
+        with metrics.phase(name="format_nodes"):
+            nod = sbm.format_nodes(
+                nodes=modelisation.nodes, processes=processes, as_batch=as_batch
+            )
+            metrics.count(key="nodes", value=len(nod))
+
+        logging.info("Map schema to data - relationships")
+        rel = []
+        if modelisation.relationships:
+            with metrics.phase(name="format_relationships"):
+                rel = sbm.format_relationships(
+                    relationships=modelisation.relationships,
+                    processes=processes,
+                    as_batch=as_batch,
+                )
+                metrics.count(key="relationships", value=len(rel))
+
+    # Import into neo4j
+    if dry_run is False and tag is not None:
+        logging.info("Create indexes")
+        labels = [x.labels[0] for x in modelisation.nodes if len(x.labels) > 0]
+        with metrics.phase(name="create_indexes"):
+            connection.create_indexes(labels=labels + [connection.LABEL_LEDGER])
+    if dry_run is False and incremental:
+        with metrics.phase(name="update"):
+            update_model(connection=connection, nodes=nod, relationships=rel, tag=tag)
+    elif dry_run is False:
+        logging.info("Import into neo4j - nodes")
+        with metrics.phase(name="write_nodes"):
+            connection.create_nodes(nodes=nod)
+
+        if len(rel) > 0:
+            logging.info("Import into neo4j - relationships")
+            with metrics.phase(name="write_relationships"):
+                connection.create_relationships(relationships=rel)
+        else:
+            logging.info("None relationship created")
+    if ident is not None:
+        connection.save_fingerprint(fingerprint=ident, tag=tag)
+    return dict(nodes=len(nod), relationships=len(rel), skipped=False)
+
+
+def update_model(
+    connection: backend.Backend,
+    nodes: List[snode.SNode],
+    relationships: List[srelationship.SRelationship],
+    tag: str,
+) -> None:
+    """Write the differences between entities formatted and entities stored with the same tag.
+
+    Parameters
+    ----------
+    connection: backend.Backend
+        Connection object
+    nodes: List[snode.SNode]
+        nodes formatted from the SBML file
+    relationships: List[srelationship.SRelationship]
+        relationships formatted from the SBML file
+    tag: str
+        the tag of the model
+
+    Return
+    ------
+    None
+    """
+    logging.info("Compare with neo4j - nodes")
+    diff_nodes = diff.Diff.from_nodes(
+        nodes=nodes, records=connection.query_tagged_nodes(tag=tag)
+    )
+    logging.info("Nodes - %s" % (diff_nodes,))
+    logging.info("Compare with neo4j - relationships")
+    diff_rels = diff.Diff.from_relationships(
+        relationships=relationships,
+        records=connection.query_tagged_relationships(tag=tag),
+    )
+    logging.info("Relationships - %s" % (diff_rels,))
+
+    logging.info("Update neo4j - relationships deleted")
+    connection.delete_relationships(relationships=diff_rels.deletes)
+    logging.info("Update neo4j - nodes deleted")
+    connection.delete_nodes(nodes=diff_nodes.deletes)
+    logging.info("Update neo4j - nodes created")
+    connection.create_nodes(nodes=diff_nodes.creates)
+    logging.info("Update neo4j - nodes updated")
+    connection.update_nodes(nodes=diff_nodes.updates)
+    logging.info("Update neo4j - relationships created")
+    connection.create_relationships(relationships=diff_rels.creates)
+    logging.info("Update neo4j - relationships updated")
+    connection.update_relationships(relationships=diff_rels.updates)
+
+
+def import_models(
+    connection: Union[backend.Backend, shard.Shards],
+    modelisation: arrows.Arrows,
+    models: List[Tuple[str, Optional[str]]],
+    dry_run: bool = False,
+    workers: int = 1,
+    skip_unchanged: bool = False,
+    incremental: bool = False,
+    streaming: bool = False,
+) -> List[Dict[str, Any]]:
+    """Import several SBML models into Neo4j, sharing the modelisation and the connection.
+    A failure is reported for the model concerned without stopping the others.
+    With shards, each model goes to the shard of its tag, each shard has its own pool of workers.
+
+    Parameters
+    ----------
+    connection: Union[backend.Backend, shard.Shards]
+        Connection object, or the shards to route the models to
+    modelisation: arrows.Arrows
+        A modelisation
+    models: List[Tuple[str, Optional[str]]]
+        the SBML files and their tag
+    dry_run: bool (default: False)
+        map the schema to the data without loading them into the database
+    workers: int (default: 1)
+        number of models imported concurrently, by shard
+    skip_unchanged: bool (default: False)
+        skip the models unchanged since their last import
+    incremental: bool (default: False)
+        write only the differences with the entities stored by model
+    streaming: bool (default: False)
+        read the SBML files in one pass, without building the documents
+
+    Return
+    ------
+    List[Dict[str, Any]]
+        A report for each model: path, tag, status, duration, error, number of entities and shard
+    """
+
+    def _import(
+        name: Optional[str], con: backend.Backend, path: str, tag: Optional[str]
+    ) -> Dict[str, Any]:
+        report: Dict[str, Any] = dict(path=path, tag=tag, status="success", error=None)
+        if name is not None:
+            report["shard"] = name
+        start = time.perf_counter()
+        logging.info("Start model: %s" % (path,))
+        try:
+            with metrics.phase(name="import_model"):
+                report.update(
+                    import_model(
+                        connection=con,
+                        modelisation=modelisation,
+                        path=path,
+                        tag=tag,
+                        dry_run=dry_run,
+                        skip_unchanged=skip_unchanged,
+                        incremental=incremental,
+                        streaming=streaming,
+                    )
+                )
+        except Exception as error:
+            metrics.count(key="models_failed")
+            logging.error("Model failed: %s, %s" % (path, error))
+            report["status"] = "failure"
+            report["error"] = str(error)
+        report["duration"] = time.perf_counter() - start
+        logging.info("End model: %s (%.2fs)" % (path, report["duration"]))
+        return report
+
+    executors: Dict[Optional[str], concurrent.futures.ThreadPoolExecutor] = {}
+    futures = []
+    try:
+        for path, tag in models:
+            name, con = None, connection
+            if isinstance(connection, shard.Shards):
+                name = connection.route(tag=tag)
+                con = connection.connections[name]
+            if name not in executors.keys():
+                executors[name] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=workers
+                )
+            futures.append(
+                executors[name].submit(
+                    metrics.METRICS.bind(_import), name, con, path, tag
+                )
+            )
+        return [future.result() for future in futures]
+    finally:
+        for executor in executors.values():
+            executor.shutdown()
+
+
+def model_tag(path: str) -> str:
+    """Build a tag from the name of a SBML file, without its extensions.
+
+    Parameters
+    ----------
+    path: str
+        a SBML file
+
+    Return
+    ------
+    str
+    """
+    name = os.path.basename(path)
+    for extensions in [COMPRESSION_EXTENSIONS, MODEL_EXTENSIONS]:
+        for extension in extensions:
+            if name.lower().endswith(extension):
+                name = name[: -len(extension)]
+                break
+    return name
+
+
+def is_model(path: str) -> bool:
+    """Check if a file is a SBML file from its extensions.
+
+    Parameters
+    ----------
+    path: str
+        a file
+
+    Return
+    ------
+    bool
+    """
+    name = path.lower()
+    for extension in COMPRESSION_EXTENSIONS:
+        if name.endswith(extension):
+            name = name[: -len(extension)]
+            break
+    return any(name.endswith(x) for x in MODEL_EXTENSIONS)
+
+
+def list_models(path: str) -> List[Tuple[str, Optional[str]]]:
+    """List SBML files of a directory with a tag built from their name.
+    The SBML files of the zip and tar archives of the directory are listed too.
+
+    Parameters
+    ----------
+    path: str
+        a directory
+
+    Return
+    ------
+    List[Tuple[str, Optional[str]]]
+    """
+    models: List[Tuple[str, Optional[str]]] = []
+    for name in sorted(os.listdir(path)):
+        fpath = os.path.join(path, name)
+        if not os.path.isfile(fpath):
+            continue
+        if is_model(path=name):
+            models.append((fpath, model_tag(path=name)))
+        elif compressed.compression(path=fpath) in ["zip", "tar"]:
+            models.extend(list_archive(path=fpath))
+    return models
+
+
+def list_archive(path: str) -> List[Tuple[str, Optional[str]]]:
+    """List SBML files of a zip or tar archive with a tag built from their name.
+    The members are not extracted, their path is the path of the archive followed by their name.
+
+    Parameters
+    ----------
+    path: str
+        a zip or tar archive
+
+    Return
+    ------
+    List[Tuple[str, Optional[str]]]
+    """
+    models: List[Tuple[str, Optional[str]]] = []
+    for name in compressed.members(path=path):
+        if not is_model(path=name):
+            continue
+        models.append((os.path.join(path, name), model_tag(path=name)))
+    return models
+
+
+def read_manifest(path: str) -> List[Tuple[str, Optional[str]]]:
+    """Read a manifest, a tabulated file: SBML file and an optional tag by line.
+    Lines starting with "#" are ignored, relative paths are resolved from the manifest directory.
+    The tag is built from the name of the file if it is missing.
+
+    Parameters
+    ----------
+    path: str
+        a manifest
+
+    Return
+    ------
+    List[Tuple[str, Optional[str]]]
+    """
+    models: List[Tuple[str, Optional[str]]] = []
+    dirname = os.path.dirname(os.path.abspath(path))
+    with open(path) as fid:
+        for line in fid.read().splitlines():
+            if line.strip() == "" or line.startswith("#"):
+                continue
+            tab = line.split("\t")
+            fpath = tab[0].strip()
+            if not os.path.isabs(fpath):
+                fpath = os.path.join(dirname, fpath)
+            tag = model_tag(path=fpath)
+            if len(tab) > 1 and tab[1].strip() != "":
+                tag = tab[1].strip()
+            models.append((fpath, tag))
+    return models
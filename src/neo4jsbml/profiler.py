@@ -0,0 +1,247 @@
+import cProfile
+import collections
+import os
+import pstats
+import threading
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from neo4jsbml import metrics
+
+
+class Profiler(object):
+    """Profile CPU with cProfile and memory with tracemalloc, phase by phase.
+    It listens to the phases of metrics.METRICS: each phase is profiled apart,
+    the time spent into a nested phase is attributed to the nested phase only.
+    cProfile follows the thread which opens a phase, tracemalloc follows all threads.
+
+    Attributes
+    ----------
+    cpu_path: Optional[str]
+        file of the pstats of the whole run, a file by phase is written beside
+    memory_path: Optional[str]
+        report of the allocations by phase, text file
+    top: int
+        number of lines reported by phase
+
+    Methods
+    -------
+    __init__(cpu_path: Optional[str] = None, memory_path: Optional[str] = None, top: int = 10)
+        Instanciate a new object
+
+    start() -> None
+        Start profiling and listening to the phases
+
+    stop() -> None
+        Stop profiling and write the outputs
+
+    enter(path: str) -> None
+        Switch profiling to a phase starting
+
+    exit(path: str) -> None
+        Switch profiling back to the parent of a phase ending
+
+    @classmethod
+    phase_path(path: str, phase: str) -> str
+        Build the pstats file of a phase from the pstats file of the whole run
+    """
+
+    FILTERS = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, metrics.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ]
+
+    def __init__(
+        self,
+        cpu_path: Optional[str] = None,
+        memory_path: Optional[str] = None,
+        top: int = 10,
+    ) -> None:
+        self.cpu_path = cpu_path
+        self.memory_path = memory_path
+        self.top = top
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: List[Tuple[str, cProfile.Profile]] = []
+        self._allocations: Dict[str, collections.Counter] = collections.defaultdict(
+            collections.Counter
+        )
+        self._peaks: Dict[str, int] = collections.defaultdict(int)
+        self._calls: Dict[str, int] = collections.defaultdict(int)
+
+    def _stack(self) -> List[Dict]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+
+    def _peak(self, frame: Dict) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        # Without reset_peak (python < 3.9) the peak is the one of the whole run:
+        # not exceeded since the phase started, it is bounded by the current sizes
+        if frame["base"] is not None and peak <= frame["base"]:
+            peak = max(current, frame["current"])
+        return peak
+
+    def start(self) -> None:
+        """Start profiling and listening to the phases of metrics.METRICS.
+
+        Return
+        ------
+        None
+        """
+        metrics.METRICS.enabled = True
+        metrics.METRICS.listeners.append(self)
+        if self.memory_path:
+            tracemalloc.start()
+        return None
+
+    def enter(self, path: str) -> None:
+        """Switch profiling to a phase starting.
+
+        Parameters
+        ----------
+        path: str
+            path of the phase
+
+        Return
+        ------
+        None
+        """
+        stack = self._stack()
+        if stack and stack[-1]["profile"]:
+            stack[-1]["profile"].disable()
+        # Snapshot before profiling, to not attribute it to the phase
+        snapshot = None
+        base, current = None, 0
+        if self.memory_path:
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], self._peak(stack[-1]))
+            snapshot = self._snapshot()
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                current, base = tracemalloc.get_traced_memory()
+        profile = None
+        if self.cpu_path:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                with self._lock:
+                    self._profiles.append((path, profile))
+            except ValueError:
+                # A profiler is already active into another thread
+                profile = None
+        stack.append(
+            dict(
+                path=path,
+                profile=profile,
+                snapshot=snapshot,
+                peak=0,
+                base=base,
+                current=current,
+            )
+        )
+        return None
+
+    def exit(self, path: str) -> None:
+        """Switch profiling back to the parent of a phase ending.
+
+        Parameters
+        ----------
+        path: str
+            path of the phase
+
+        Return
+        ------
+        None
+        """
+        stack = self._stack()
+        frame = stack.pop()
+        if frame["profile"]:
+            frame["profile"].disable()
+        if self.memory_path:
+            peak = max(self._peak(frame), frame["peak"])
+            stats = self._snapshot().compare_to(frame["snapshot"], "lineno")
+            with self._lock:
+                self._calls[path] += 1
+                self._peaks[path] = max(self._peaks[path], peak)
+                for stat in stats:
+                    if stat.size_diff != 0:
+                        self._allocations[path][str(stat.traceback)] += stat.size_diff
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        if stack and stack[-1]["profile"]:
+            stack[-1]["profile"].enable()
+        return None
+
+    @classmethod
+    def phase_path(cls, path: str, phase: str) -> str:
+        """Build the pstats file of a phase from the pstats file of the whole run.
+
+        Parameters
+        ----------
+        path: str
+            pstats file of the whole run
+        phase: str
+            path of the phase
+
+        Return
+        ------
+        str
+        """
+        root, ext = os.path.splitext(path)
+        return root + "." + phase.replace("/", ".") + ext
+
+    def _write_cpu(self) -> None:
+        by_phase: Dict[str, List[cProfile.Profile]] = collections.defaultdict(list)
+        for phase, profile in self._profiles:
+            by_phase[phase].append(profile)
+        overall = None
+        for phase, profiles in by_phase.items():
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(Profiler.phase_path(path=self.cpu_path, phase=phase))
+            if overall is None:
+                overall = stats
+            else:
+                overall.add(stats)
+        if overall is not None:
+            overall.dump_stats(self.cpu_path)
+
+    def _write_memory(self, snapshot: tracemalloc.Snapshot) -> None:
+        kib = 1024
+        with open(self.memory_path, "w") as fod:
+            for phase, allocations in self._allocations.items():
+                fod.write(
+                    "# Phase: %s, calls: %s, peak: %.1f KiB\n"
+                    % (phase, self._calls[phase], self._peaks[phase] / kib)
+                )
+                for line, size in allocations.most_common(self.top):
+                    fod.write("%s: %+.1f KiB\n" % (line, size / kib))
+                fod.write("\n")
+            fod.write("# Top allocations at the end\n")
+            for stat in snapshot.statistics("lineno")[: self.top]:
+                fod.write("%s\n" % (stat,))
+
+    def stop(self) -> None:
+        """Stop profiling and write the outputs.
+
+        Return
+        ------
+        None
+        """
+        if self in metrics.METRICS.listeners:
+            metrics.METRICS.listeners.remove(self)
+        if self.memory_path:
+            snapshot = self._snapshot()
+            tracemalloc.stop()
+            self._write_memory(snapshot=snapshot)
+        if self.cpu_path:
+            self._write_cpu()
+        return None
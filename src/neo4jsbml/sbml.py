@@ -1,12 +1,62 @@
 import hashlib
 import itertools
 import logging
+import multiprocessing
+import os
 import re
-from typing import Any, Dict, Generator, List, Optional, Union
+import shutil
+import tempfile
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Union
 
 import libsbml
 import networkx as nx
-from neo4jsbml import arrows, connect, graph_method, snode, srelationship
+from neo4jsbml import (
+    arrows,
+    backend,
+    batch,
+    compressed,
+    graph_method,
+    metrics,
+    snode,
+    srelationship,
+)
+
+# Object shared with the workers forked by SbmlToNeo4j.map(), only set into the workers
+_SNAPSHOT: Optional["SbmlToNeo4j"] = None
+
+
+def _init_snapshot(snapshot: "SbmlToNeo4j") -> None:
+    """Set the object shared into a worker, when it starts.
+    With the fork start method, the object is inherited by the worker without being pickled.
+
+    Parameters
+    ----------
+    snapshot: SbmlToNeo4j
+        the object calling the pool of workers
+
+    Return
+    ------
+    None
+    """
+    global _SNAPSHOT
+    _SNAPSHOT = snapshot
+    return None
+
+
+def _call_snapshot(args: Tuple[str, Any]) -> Any:
+    """Call a method of the object shared at fork time.
+
+    Parameters
+    ----------
+    args: Tuple[str, Any]
+        the name of the method and its argument
+
+    Return
+    ------
+    Any
+    """
+    method, value = args
+    return getattr(_SNAPSHOT, method)(value)
 
 
 class Sbml(object):
@@ -35,9 +85,26 @@ class Sbml(object):
     @classmethod
     find_method(obj: Any, label: str, exact: bool, start: str) -> List[str]
         Given an object, search a method name by intropection
+
+    @classmethod
+    cast_column(values: List[Any], kind: Optional[str] = None) -> Tuple[str, List[Any]]
+        Cast the values of a property across nodes
     """
 
     PLUGINS = ["fbc", "groups", "layout", "qual"]
+    # Type of a column of values, a value by line, tested in order by cast_column()
+    COLUMN_TYPES = [
+        ("int", re.compile(r"-?\d+(\n-?\d+)*")),
+        (
+            "float",
+            re.compile(
+                r"-?\d+(\.\d+)?(e[-+]?\d+)?(\n-?\d+(\.\d+)?(e[-+]?\d+)?)*", re.I
+            ),
+        ),
+        ("bool", re.compile(r"(true|false)(\n(true|false))*", re.I)),
+    ]
+    # Results of find_method() by class, shared between documents
+    METHODS: Dict[Tuple[type, str, bool, str], List[str]] = {}
 
     def __init__(self, document: libsbml.SBML_DOCUMENT, *args, **kwargs) -> None:
         self.document = document
@@ -93,6 +160,7 @@ class Sbml(object):
         cls, obj: Any, label: str, exact: bool = False, start: str = "get"
     ) -> List[str]:
         """Given an object, search a method name by intropection.
+        Results are cached by class of the object.
 
         Parameters
         ----------
@@ -109,6 +177,18 @@ class Sbml(object):
         ------
         List[str]
         """
+        key = (type(obj), label, exact, start)
+        if key not in cls.METHODS.keys():
+            metrics.count(key="cache.find_method" + metrics.Metrics.CACHE_MISS)
+            cls.METHODS[key] = cls._find_method(
+                obj=obj, label=label, exact=exact, start=start
+            )
+        else:
+            metrics.count(key="cache.find_method" + metrics.Metrics.CACHE_HIT)
+        return list(cls.METHODS[key])
+
+    @classmethod
+    def _find_method(cls, obj: Any, label: str, exact: bool, start: str) -> List[str]:
         # Exact match
         regex = re.compile(r"^" + start + label + "$", re.IGNORECASE)
         candidates = list(filter(regex.match, obj.__dir__()))
@@ -121,6 +201,78 @@ class Sbml(object):
         candidates = list(filter(regex.search, obj.__dir__()))
         return candidates
 
+    @classmethod
+    def cast_column(
+        cls, values: List[Any], kind: Optional[str] = None
+    ) -> Tuple[str, List[Any]]:
+        """Cast the values of a property across nodes, the type is inferred once for the column.
+        Empty values, "", "nan" or NaN, are None, values already typed are kept as is.
+
+        Parameters
+        ----------
+        values: List[Any]
+            values of a property, a value by node
+        kind: Optional[str] (default: None)
+            type of the column if already known: int, float, bool or str
+
+        Return
+        ------
+        Tuple[str, List[Any]]
+            type of the column and the values casted
+        """
+        ixs = [
+            ix
+            for ix, x in enumerate(values)
+            if isinstance(x, str) and x not in ["", "nan"]
+        ]
+        strs = [values[ix] for ix in ixs]
+        # Strings are casted below, numbers not a number are empty
+        casted: List[Any] = [
+            None if isinstance(x, (str, type(None))) or x != x else x for x in values
+        ]
+        if kind is None or kind == "none":
+            kind = cls._infer_column(strs=strs)
+        try:
+            converted = cls._convert_column(strs=strs, kind=kind)
+        except ValueError:
+            # Type cached for a label no longer matches its values
+            kind = cls._infer_column(strs=strs)
+            converted = cls._convert_column(strs=strs, kind=kind)
+        for ix, value in zip(ixs, converted):
+            casted[ix] = value
+        return kind, casted
+
+    @classmethod
+    def _infer_column(cls, strs: List[str]) -> str:
+        if len(strs) < 1:
+            return "none"
+        # A single pass of the regex over the whole column
+        joined = "\n".join(strs)
+        for kind, regex in Sbml.COLUMN_TYPES:
+            if regex.fullmatch(joined):
+                return kind
+        return "str"
+
+    @classmethod
+    def _convert_column(cls, strs: List[str], kind: str) -> List[Any]:
+        if kind in ["int", "float"]:
+            try:
+                import numpy as np
+            except ImportError:
+                return list(map(int if kind == "int" else float, strs))
+            dtype = np.int64 if kind == "int" else np.float64
+            try:
+                return np.asarray(strs).astype(dtype).tolist()
+            except OverflowError:
+                return list(map(int, strs))
+        elif kind == "bool":
+            booleans = {"true": True, "false": False}
+            try:
+                return [booleans[x.lower()] for x in strs]
+            except KeyError:
+                raise ValueError("Column is not boolean")
+        return strs
+
     @classmethod
     def cast_properties(cls, value: str) -> Optional[Union[str, float, int, bool]]:
         # Check isdigit
@@ -161,6 +313,9 @@ class SbmlFromNeo4j(Sbml):
      extract_entities(self, current_id: Optional[str]) -> None
         Extract entities of Neo4j based on the graph, GraphMethod
 
+    cast_nodes(self, label: str, datas: List[Dict[str, Any]], props: Dict[str, Any]) -> None
+        Cast the properties of the nodes of a label, a column by property
+
     add_node_properties(self, current: Any, data: Dict[str, Any], props: Dict[str, Any]) -> None
         Set properties found in Arrows, mapping to Neo4j, to a libsbml object
 
@@ -177,14 +332,24 @@ class SbmlFromNeo4j(Sbml):
         Export the document attribute to a SBML file
 
     @classmethod
-    from_specifications(level: int, version: int, connection: connect.Connect) -> "SbmlFromNeo4j"
+    from_specifications(level: int, version: int, connection: backend.Backend, gm: Optional[graph_method.GraphMethod] = None) -> "SbmlFromNeo4j"
         Create an Sbml object given a SBML file
     """
 
-    def __init__(self, connection: connect.Connect, *args, **kwargs) -> None:
+    def __init__(
+        self,
+        connection: backend.Backend,
+        *args,
+        gm: Optional[graph_method.GraphMethod] = None,
+        **kwargs
+    ) -> None:
         super(SbmlFromNeo4j, self).__init__(*args, **kwargs)
-        self.gm = graph_method.GraphMethod.from_document(document=self.document)
+        if gm is None:
+            gm = graph_method.GraphMethod.from_document(document=self.document)
+        self.gm = gm
         self.connection = connection
+        # Type of the values by label and property, inferred once by cast_nodes()
+        self._cast_kinds: Dict[Tuple[str, str], str] = {}
 
     def extract_entities(self) -> None:
         """Extract entities of Neo4j based on the graph, GraphMethod
@@ -198,10 +363,18 @@ class SbmlFromNeo4j(Sbml):
             if level == 0:
                 model = self.document.createModel()
                 model_id = self.gm.retrieve_id(prop="labels", value="Model")
-                if self.gm.graph.nodes[model_id]["modelisation"]:
+                if (
+                    self.gm.graph.nodes[model_id]["modelisation"]
+                    and "labels_neo4j" in self.gm.graph.nodes[model_id].keys()
+                ):
                     datas = self.connection.query_node(
                         label=self.gm.graph.nodes[model_id]["labels_neo4j"]
                     )
+                    self.cast_nodes(
+                        label=self.gm.graph.nodes[model_id]["labels_neo4j"],
+                        datas=datas,
+                        props=self.gm.graph.nodes[model_id].get("properties", {}),
+                    )
                     if datas and len(datas) == 1:
                         self.add_node_properties(
                             current=model,
@@ -214,10 +387,18 @@ class SbmlFromNeo4j(Sbml):
                 label = self.gm.graph.nodes[child_id]["labels"]
                 if self.gm.graph.nodes[child_id]["modelisation"] is False:
                     continue
+                # Label not found in the database
+                if "labels_neo4j" not in self.gm.graph.nodes[child_id].keys():
+                    continue
                 # Query Neo4j
                 datas = self.connection.query_node(
                     label=self.gm.graph.nodes[child_id]["labels_neo4j"],
                 )
+                self.cast_nodes(
+                    label=self.gm.graph.nodes[child_id]["labels_neo4j"],
+                    datas=datas,
+                    props=self.gm.graph.nodes[child_id].get("properties", {}),
+                )
                 # Loop over multiple nodes in Neo4j
                 for data in datas:
                     # Get parent object in graph
@@ -284,6 +465,38 @@ class SbmlFromNeo4j(Sbml):
                                     child_id=child_id,
                                 )
 
+    def cast_nodes(
+        self, label: str, datas: List[Dict[str, Any]], props: Dict[str, Any]
+    ) -> None:
+        """Cast the properties of the nodes of a label, a column by property.
+        The type of a column is inferred once by label and property, the values casted
+        are stored into the records under the key "cast".
+
+        Parameters
+        ----------
+        label: str
+            Label of the nodes in Neo4j
+        datas: List[Dict[str, Any]]
+            Query from Neo4j regarding the nodes
+        props: Dict[str, Any]
+            Properties of a graph_method node
+
+        Return
+        ------
+        None
+        """
+        for data in datas:
+            data["cast"] = {}
+        for prop in props.keys():
+            values = [x["node"].get(prop) for x in datas]
+            kind, casted = Sbml.cast_column(
+                values=values, kind=self._cast_kinds.get((label, prop))
+            )
+            self._cast_kinds[(label, prop)] = kind
+            for data, value in zip(datas, casted):
+                if value is not None:
+                    data["cast"][prop] = value
+
     def create_obj(
         self, parent_obj: Any, label: str, data: Dict[str, Any], child_id: int
     ) -> None:
@@ -344,6 +557,7 @@ class SbmlFromNeo4j(Sbml):
         ------
         None
         """
+        casted = data.get("cast")
         for prop in props.keys():
             # Check if Modelisation's property is in database
             if prop in data["node"].keys():
@@ -351,23 +565,20 @@ class SbmlFromNeo4j(Sbml):
                 methods = Sbml.find_method(obj=current, label=prop, start="set")
                 if len(methods) != 1:
                     continue
-                # Check if Neo4j's data has the method
-                for key, value in data["node"].items():
-                    if prop == key:
-                        # Add property
-                        nvalue = Sbml.cast_properties(value=value)
-                        # Check if property is empty
-                        if nvalue is not None:
-                            if key.lower() == "math":
-                                ast_value = libsbml.parseL3Formula(
-                                    nvalue
-                                )  # Throw F841 error, local variable is assigned to but never used
-                                eval("current.%s(ast_value)" % (methods[0],))
-                            elif value == nvalue:
-                                eval('current.%s("%s")' % (methods[0], value))
-                            else:
-                                eval("current.%s(%s)" % (methods[0], nvalue))
-                        break
+                # Add property, casted by column with cast_nodes() or else by value
+                value = data["node"][prop]
+                if casted is not None:
+                    nvalue = casted.get(prop)
+                elif isinstance(value, str):
+                    nvalue = Sbml.cast_properties(value=value)
+                else:
+                    nvalue = value
+                # Check if property is empty
+                if nvalue is None:
+                    continue
+                if prop.lower() == "math":
+                    nvalue = libsbml.parseL3Formula(str(nvalue))
+                getattr(current, methods[0])(nvalue)
 
     def add_neighbor_properties(
         self,
@@ -461,9 +672,10 @@ class SbmlFromNeo4j(Sbml):
     @classmethod
     def from_specifications(
         cls,
-        connection: connect.Connect,
+        connection: backend.Backend,
         level: int = 3,
         version: int = 2,
+        gm: Optional[graph_method.GraphMethod] = None,
     ) -> "SbmlFromNeo4j":
         """Create an SbmlFromNeo4j object given the version of the specifications.
 
@@ -473,31 +685,55 @@ class SbmlFromNeo4j(Sbml):
             Number of the level
         version: int
             Number of the version
-        connection: connect.Connect
+        connection: backend.Backend
             Connection object
+        gm: Optional[graph_method.GraphMethod] (default: None)
+            graph of the specifications, built from the document if None
 
         Return
         ------
         SbmlFromNeo4j
         """
         doc = libsbml.SBMLDocument(level, version)
-        return SbmlFromNeo4j(connection=connection, document=doc)
+        return SbmlFromNeo4j(connection=connection, document=doc, gm=gm)
 
     def to_sbml(self, path: str) -> None:
-        """Export the document attribute to a SBML file
+        """Export the document attribute to a SBML file, written by libsbml without building the XML in python.
+        The file is compressed according to its extension: gz, bz2, zip, xz or zst.
+        libsbml compresses gz, bz2 and zip itself, the other formats and the standard output
+        are copied by chunks from a temporary file.
 
         Parameters
         ----------
         path: str
-            The path of the file
+            The path of the file, "-" for the standard output
+
+        Raises
+        ------
+        ValueError
+            if libsbml fails to write the file
 
         Return
         ------
         None
         """
-        data = libsbml.writeSBMLToString(self.document)
-        with open(path, "w") as fd:
-            fd.write(data)
+        kind = None if path == "-" else compressed.compression(path=path)
+        native = kind is None
+        if kind in ["gzip", "zip"]:
+            native = libsbml.SBMLWriter.hasZlib()
+        elif kind == "bz2":
+            native = libsbml.SBMLWriter.hasBzip2()
+        if native and path != "-":
+            if libsbml.writeSBMLToFile(self.document, path) != 1:
+                raise ValueError("Unable to write the SBML file: %s" % (path,))
+            return None
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = os.path.join(tmpdir, "model.xml")
+            if libsbml.writeSBMLToFile(self.document, tmp) != 1:
+                raise ValueError("Unable to write the SBML file: %s" % (path,))
+            with open(tmp, "rb") as fid, compressed.open_output(path=path) as fod:
+                shutil.copyfileobj(fid, fod, compressed.CHUNK_SIZE)
+        return None
 
 
 class SbmlToNeo4j(Sbml):
@@ -520,21 +756,41 @@ class SbmlToNeo4j(Sbml):
     __init__(document: libsbml.SBML_DOCUMENT, tag: Optional[str])
         Instanciate a new object. tag parameter is optional
 
-    format_nodes(nodes: List[arrows.Node]) -> List[Dict[str, Any]]
+    format_nodes(nodes: List[arrows.Node], processes: int, as_batch: bool) -> Union[List[snode.SNode], batch.NodeBatch]
         Create nodes, from the schema and the values in the SBML file.
 
-    format_relationships(relationships: List[arrows.Relationship]) -> List[Dict[str, Any]]:
+    format_node(arrow_node: snode.SNode) -> List[Tuple[int, snode.SNode]]
+        Create nodes matching one label of the schema
+
+    map(method: str, values: List[Any], processes: int) -> List[Any]
+        Apply a method over values, sequentially or in a pool of workers
+
+    format_relationships(relationships: List[arrows.Relationship], processes: int, as_batch: bool) -> Union[List[srelationship.SRelationship], batch.RelationshipBatch]
         Create relationships, from the schema and the values in the SBML file
 
+    format_relationship(arrow_rel: srelationship.SRelationship) -> List[srelationship.SRelationship]
+        Create relationships matching one relationship of the schema
+
     validate_id(value: Any) -> bool
         Check if an ID is in the SBML document
 
     candidate_obj_plugin(obj: Any) -> List[Any]
-        Check if an object can activate one or several plugins
+        Return an object followed by the plugin objects it carries
+
+    plugin_objects(obj: Any) -> Tuple[Tuple[str, Any], ...]
+        Return the plugin objects carried by an object, resolved once by object
 
     @classmethod
     from_sbml(path: str, tag: Optional[str] = None) -> "SbmlToNeo4j"
         Create an Sbml object given a SBML file
+
+    @classmethod
+    from_string(data: str, tag: Optional[str] = None) -> "SbmlToNeo4j"
+        Create an Sbml object given the content of a SBML file
+
+    @classmethod
+    from_archive(path: str, tag: Optional[str] = None, extensions: Optional[List[str]] = None) -> Generator[Tuple[str, "SbmlToNeo4j"], None, None]
+        Create an Sbml object by SBML file of an archive
     """
 
     def __init__(self, tag: Optional[str] = None, *args, **kwargs) -> None:
@@ -545,6 +801,12 @@ class SbmlToNeo4j(Sbml):
         self.node_map_label: Dict[str, str] = {}
         self.elements: Dict[str, Any] = {}
         self.element_alls: Dict[str, Any] = {}  # speed up element retrievial
+        # IDs by pointer of element, positions of the children by pointer of parent
+        self._ids: Dict[int, str] = {}
+        self._positions: Dict[int, Dict[int, int]] = {}
+        # Plugin objects by pointer of element, plugins carried by class of element
+        self._plugin_objs: Dict[int, Tuple[Tuple[str, Any], ...]] = {}
+        self._plugin_names: Dict[Tuple[str, int], Tuple[str, ...]] = {}
 
         if self.model is None:
             raise ValueError("No model found")
@@ -553,102 +815,189 @@ class SbmlToNeo4j(Sbml):
             if self.document.getPlugin(plugin) is not None:
                 self.plugins.append(plugin)
 
-    def format_nodes(self, nodes: List[snode.SNode]) -> List[snode.SNode]:
+    def format_nodes(
+        self, nodes: List[snode.SNode], processes: int = 1, as_batch: bool = False
+    ) -> Union[List[snode.SNode], batch.NodeBatch]:
         """Create nodes, from the schema and the values in the SBML file.
+        Each label of the schema is independent, with processes greater than 1
+        labels are formatted in a pool of forked workers sharing a snapshot
+        of the document. Results are merged following the order of the schema.
+        With as_batch, nodes are appended into a batch.NodeBatch label by label,
+        without keeping the list of all the nodes.
 
         Parameters
         ----------
         nodes: List[snode.SNode]
             the nodes stored into the Arrows object
+        processes: int (default: 1)
+            number of workers
+        as_batch: bool (default: False)
+            return a batch.NodeBatch instead of a list
 
         Return
         ------
-        List[node.Node]
+        Union[List[node.Node], batch.NodeBatch]
         """
-        res = []
+        res: Union[List[snode.SNode], batch.NodeBatch] = []
+        if as_batch:
+            res = batch.NodeBatch()
+        arrow_nodes = []
         for arrow_node in nodes:
             if len(arrow_node.labels) < 1:
                 logging.warning("None label is found for a node: %s" % (arrow_node.id,))
                 continue
-            label = arrow_node.labels[0]
-            self.node_map_label[arrow_node.id] = label
-            for ix, item in enumerate(self.document.getListOfAllElements()):
-                if item.getElementName().lower() != label.lower():
-                    continue
-                dbb_node = snode.SNode(id="", labels=arrow_node.labels, properties={})
-                data: Dict[str, Any] = {}
-
-                # Iterate over plugin oject
-                objs = self.candidate_obj_plugin(obj=item)
-                for prop in arrow_node.properties:
-                    prop_found = False
-                    for ix, element in enumerate(objs):
-                        methods = Sbml.find_method(obj=element, label=prop)
-                        if len(methods) < 1:
-                            continue
-                        if len(methods) > 1:
-                            msg = (
-                                "Several methods found for label: %s with the property: %s, %s"
-                                % (label, prop, " ".join(methods))
-                            )
-                            if ix > 1:
-                                msg += ", corresponding to the plugin: %s" % (
-                                    self.plugins[ix],
-                                )
-                            logging.warning(msg)
-                            continue
-                        if prop.lower() == "id":
-                            prop = "id"
-                        # Check if value need to be formatted: str, math, ... (?)
-                        value = eval("element.%s()" % (methods[0],))
-                        if type(value) == libsbml.XMLNode:
-                            try:
-                                value = value.toXMLString()
-                            except Exception:
-                                pass
-                        elif type(value) == libsbml.ASTNode:
-                            try:
-                                value = libsbml.formulaToL3String(value)
-                            except Exception:
-                                pass
-                        data[prop] = value
-                        prop_found = True
-                        break
-                    if prop_found is False:
-                        logging.warning(
-                            "No method found for label: %s with the property: %s"
-                            % (label, prop)
-                        )
-
-                # Fill tag if needed
-                if self.tag is not None:
-                    data["tag"] = self.tag
-                # Overwrite id attribute
-                data["id"] = self.create_id(value=item)
-                # Add name attribute
-                if data.get("name", None) is None or data.get("name", "") == "":
-                    data["name"] = data["id"]
+            arrow_nodes.append(arrow_node)
+
+        items = list(self.document.getListOfAllElements())
+        # Resolve the plugins once, before the workers are forked
+        for item in items:
+            self.plugin_objects(obj=item)
+        records: Iterable[List[Tuple[int, snode.SNode]]]
+        if processes > 1:
+            records = self.map(
+                method="format_node", values=arrow_nodes, processes=processes
+            )
+        else:
+            # One label at a time
+            records = (self.format_node(arrow_node=x) for x in arrow_nodes)
+        for arrow_node, record in zip(arrow_nodes, records):
+            self.node_map_label[arrow_node.id] = arrow_node.labels[0]
+            for ix, dbb_node in record:
                 # Update map
                 if arrow_node.id not in self.node_map_item.keys():
                     self.node_map_item[arrow_node.id] = []
-                self.node_map_item[arrow_node.id].append(data["id"])
-                self.elements[data["id"]] = item
-
-                dbb_node.id = data.pop("id")
-                dbb_node.properties = data
-                dbb_node.clean_properties()
-
-                res.append(dbb_node)
+                self.node_map_item[arrow_node.id].append(dbb_node.id)
+                self.elements[dbb_node.id] = items[ix]
+                logging.debug(dbb_node)
+                if isinstance(res, batch.NodeBatch):
+                    res.append(
+                        id=dbb_node.id,
+                        labels=dbb_node.labels,
+                        properties=dbb_node.properties,
+                    )
+                else:
+                    res.append(dbb_node)
 
         # Populate element_alls
-        for item in self.document.getListOfAllElements():
+        for item in items:
             self.element_alls[self.create_id(value=item)] = item
 
-        for record in res:
-            logging.debug(record)
+        return res
+
+    def format_node(self, arrow_node: snode.SNode) -> List[Tuple[int, snode.SNode]]:
+        """Create nodes matching one label of the schema.
+
+        Parameters
+        ----------
+        arrow_node: snode.SNode
+            a node stored into the Arrows object
+
+        Return
+        ------
+        List[Tuple[int, snode.SNode]]
+            the index of the element into the list of all elements and its node
+        """
+        res = []
+        label = arrow_node.labels[0]
+        for ix, item in enumerate(self.document.getListOfAllElements()):
+            if item.getElementName().lower() != label.lower():
+                continue
+            dbb_node = snode.SNode(id="", labels=arrow_node.labels, properties={})
+            data: Dict[str, Any] = {}
+
+            # Iterate over plugin oject
+            objs = [("", item)] + list(self.plugin_objects(obj=item))
+            for prop in arrow_node.properties:
+                prop_found = False
+                for plugin, element in objs:
+                    methods = Sbml.find_method(obj=element, label=prop)
+                    if len(methods) < 1:
+                        continue
+                    if len(methods) > 1:
+                        msg = (
+                            "Several methods found for label: %s with the property: %s, %s"
+                            % (label, prop, " ".join(methods))
+                        )
+                        if plugin != "":
+                            msg += ", corresponding to the plugin: %s" % (plugin,)
+                        logging.warning(msg)
+                        continue
+                    if prop.lower() == "id":
+                        prop = "id"
+                    # Check if value need to be formatted: str, math, ... (?)
+                    value = eval("element.%s()" % (methods[0],))
+                    if type(value) == libsbml.XMLNode:
+                        try:
+                            value = value.toXMLString()
+                        except Exception:
+                            pass
+                    elif type(value) == libsbml.ASTNode:
+                        try:
+                            value = libsbml.formulaToL3String(value)
+                        except Exception:
+                            pass
+                    data[prop] = value
+                    prop_found = True
+                    break
+                if prop_found is False:
+                    logging.warning(
+                        "No method found for label: %s with the property: %s"
+                        % (label, prop)
+                    )
+
+            # Fill tag if needed
+            if self.tag is not None:
+                data["tag"] = self.tag
+            # Overwrite id attribute
+            data["id"] = self.create_id(value=item)
+            # Add name attribute
+            if data.get("name", None) is None or data.get("name", "") == "":
+                data["name"] = data["id"]
 
+            dbb_node.id = data.pop("id")
+            dbb_node.properties = data
+            dbb_node.clean_properties()
+
+            res.append((ix, dbb_node))
         return res
 
+    def map(self, method: str, values: List[Any], processes: int = 1) -> List[Any]:
+        """Apply a method over values, sequentially or in a pool of workers.
+        Workers are forked to share the document, libsbml objects can not be pickled.
+        The object is handed to each worker by the initializer of its pool,
+        pools of several objects can run concurrently from different threads.
+        The order of the values is kept.
+
+        Parameters
+        ----------
+        method: str
+            name of the method to call
+        values: List[Any]
+            arguments passed one by one to the method
+        processes: int (default: 1)
+            number of workers
+
+        Return
+        ------
+        List[Any]
+        """
+        if processes > 1 and len(values) > 1:
+            if "fork" not in multiprocessing.get_all_start_methods():
+                logging.warning("Start method fork is not available, run sequentially")
+            else:
+                ctx = multiprocessing.get_context("fork")
+                with ctx.Pool(
+                    processes=min(processes, len(values)),
+                    initializer=_init_snapshot,
+                    initargs=(self,),
+                ) as pool:
+                    return pool.map(
+                        _call_snapshot,
+                        [(method, value) for value in values],
+                        chunksize=1,
+                    )
+        return [getattr(self, method)(value) for value in values]
+
     def find_by_label(
         self,
         arrow_label: str,
@@ -968,105 +1317,148 @@ class SbmlToNeo4j(Sbml):
         return res
 
     def format_relationships(
-        self, relationships: List[srelationship.SRelationship]
-    ) -> List[srelationship.SRelationship]:
+        self,
+        relationships: List[srelationship.SRelationship],
+        processes: int = 1,
+        as_batch: bool = False,
+    ) -> Union[List[srelationship.SRelationship], batch.RelationshipBatch]:
         """Create relationships, from the schema and the values in the SBML file.
+        Relationships of the schema only read the document and the maps
+        built by format_nodes(), with processes greater than 1 they are evaluated
+        in a pool of forked workers. Results are merged following the order of the schema.
+        With as_batch, relationships are appended into a batch.RelationshipBatch
+        relationship of the schema by relationship of the schema.
 
         Parameters
         ----------
         relationships: List[relationship.Relationship]
             the relationships stored into the Arrows object
+        processes: int (default: 1)
+            number of workers
+        as_batch: bool (default: False)
+            return a batch.RelationshipBatch instead of a list
 
         Return
         ------
-        List[relationship.Relationship]
+        Union[List[relationship.Relationship], batch.RelationshipBatch]
         """
-        res: List[srelationship.SRelationship] = []
-        for arrow_rel in relationships:
-            from_label = self.node_map_label[arrow_rel.from_id]
-            to_label = self.node_map_label[arrow_rel.to_id]
-
-            from_ids = self.node_map_item.get(arrow_rel.from_id)
-            to_ids = self.node_map_item.get(arrow_rel.to_id)
-            if from_ids is None or to_ids is None:
-                logging.warning(
-                    "No relationship between: %s - %s"
-                    % (
-                        from_label,
-                        to_label,
+        res: Union[List[srelationship.SRelationship], batch.RelationshipBatch] = []
+        if as_batch:
+            res = batch.RelationshipBatch()
+        records: Iterable[List[srelationship.SRelationship]]
+        if processes > 1:
+            records = self.map(
+                method="format_relationship", values=relationships, processes=processes
+            )
+        else:
+            # One relationship of the schema at a time
+            records = (self.format_relationship(arrow_rel=x) for x in relationships)
+        for record in records:
+            for srelation in record:
+                if self.tag is not None:
+                    srelation.add_property(label="tag", value=self.tag)
+                logging.debug(srelation)
+                if isinstance(res, batch.RelationshipBatch):
+                    res.append(
+                        id=srelation.id,
+                        label=srelation.label,
+                        from_label=srelation.from_label,
+                        to_label=srelation.to_label,
+                        from_id=srelation.from_id,
+                        to_id=srelation.to_id,
+                        properties=srelation.properties,
                     )
+                else:
+                    res.append(srelation)
+
+        return res
+
+    def format_relationship(
+        self, arrow_rel: srelationship.SRelationship
+    ) -> List[srelationship.SRelationship]:
+        """Create relationships matching one relationship of the schema.
+        Strategies are tried one after another until one finds relationships.
+
+        Parameters
+        ----------
+        arrow_rel: srelationship.SRelationship
+            a relationship stored into the Arrows object
+
+        Return
+        ------
+        List[srelationship.SRelationship]
+        """
+        from_label = self.node_map_label[arrow_rel.from_id]
+        to_label = self.node_map_label[arrow_rel.to_id]
+
+        from_ids = self.node_map_item.get(arrow_rel.from_id)
+        to_ids = self.node_map_item.get(arrow_rel.to_id)
+        if from_ids is None or to_ids is None:
+            logging.warning(
+                "No relationship between: %s - %s"
+                % (
+                    from_label,
+                    to_label,
                 )
-                continue
-            # Find by label
-            srel = self.find_by_label(
-                arrow_label=arrow_rel.label,
-                from_label=from_label,
-                to_label=to_label,
-                from_ids=from_ids,
-                to_ids=to_ids,
             )
-            if len(srel) > 0:
-                logging.info(
-                    "Map entities by their label: %s - %s" % (from_label, to_label)
-                )
-                res.extend(srel)
-                continue
-            # Find by relationships
-            srel = self.find_by_relationships(
-                arrow_label=arrow_rel.label,
-                from_label=from_label,
-                to_label=to_label,
-                from_ids=from_ids,
-                to_ids=to_ids,
-            )
-            if len(srel) > 0:
-                logging.info(
-                    "Map entities by the relationship's name: %s - %s"
-                    % (from_label, to_label)
-                )
-                res.extend(srel)
-                continue
-            srel = self.find_by_relationships_listof(
-                arrow_label=arrow_rel.label,
-                from_label=from_label,
-                to_label=to_label,
-                from_ids=from_ids,
-                to_ids=to_ids,
+            return []
+        # Find by label
+        srel = self.find_by_label(
+            arrow_label=arrow_rel.label,
+            from_label=from_label,
+            to_label=to_label,
+            from_ids=from_ids,
+            to_ids=to_ids,
+        )
+        if len(srel) > 0:
+            logging.info(
+                "Map entities by their label: %s - %s" % (from_label, to_label)
             )
-            if len(srel) > 0:
-                logging.info(
-                    "Map entities by the relationship's name (listOf): %s - %s"
-                    % (from_label, to_label)
-                )
-                res.extend(srel)
-                continue
-            # Find by all elements
-            srel = self.find_by_all_elements(
-                arrow_label=arrow_rel.label,
-                from_label=from_label,
-                to_label=to_label,
-                from_ids=from_ids,
-                to_ids=to_ids,
+            return srel
+        # Find by relationships
+        srel = self.find_by_relationships(
+            arrow_label=arrow_rel.label,
+            from_label=from_label,
+            to_label=to_label,
+            from_ids=from_ids,
+            to_ids=to_ids,
+        )
+        if len(srel) > 0:
+            logging.info(
+                "Map entities by the relationship's name: %s - %s"
+                % (from_label, to_label)
             )
-            if len(srel) > 0:
-                logging.info(
-                    "Map entities by their id: %s - %s" % (from_label, to_label)
-                )
-                res.extend(srel)
-                continue
-
-            logging.warning(
-                "No method was found for entities: %s and %s, belongs to the relationships: %s"
-                % (from_label, to_label, arrow_rel.label)
+            return srel
+        srel = self.find_by_relationships_listof(
+            arrow_label=arrow_rel.label,
+            from_label=from_label,
+            to_label=to_label,
+            from_ids=from_ids,
+            to_ids=to_ids,
+        )
+        if len(srel) > 0:
+            logging.info(
+                "Map entities by the relationship's name (listOf): %s - %s"
+                % (from_label, to_label)
             )
-        if self.tag is not None:
-            for srelation in res:
-                srelation.add_property(label="tag", value=self.tag)
-
-        for record in res:
-            logging.debug(record)
+            return srel
+        # Find by all elements
+        srel = self.find_by_all_elements(
+            arrow_label=arrow_rel.label,
+            from_label=from_label,
+            to_label=to_label,
+            from_ids=from_ids,
+            to_ids=to_ids,
+        )
+        if len(srel) > 0:
+            logging.info("Map entities by their id: %s - %s" % (from_label, to_label))
+            return srel
 
-        return res
+        logging.warning(
+            "No method was found for entities: %s and %s, belongs to the relationships: %s"
+            % (from_label, to_label, arrow_rel.label)
+        )
+        return []
 
     def validate_id(self, value: str) -> bool:
         """Check if an ID is in the SBML document.
@@ -1112,7 +1504,9 @@ class SbmlToNeo4j(Sbml):
 
     def create_id(self, value: Any) -> str:
         """Sometimes an element of the model has no ID.
-        If the ID exists it will be returned otherwise, an hash computed on the string representation is used.
+        If the ID exists it will be returned otherwise, an hash computed on the path of the element
+        into the document is used: ID of its parent, name and position of the element.
+        IDs are computed once by element.
 
         Parameters
         -----------
@@ -1124,21 +1518,47 @@ class SbmlToNeo4j(Sbml):
         str
             The ID of the element
         """
+        # Same C++ object, same pointer whatever the python proxy
+        key = int(value.this)
+        ident = self._ids.get(key)
+        if ident is not None:
+            return ident
         # Use Id or IdAttribute if it set
         ident = value.getId()
         if Sbml.has_method(obj=value, method="getIdAttribute"):
             id_attribute = value.getIdAttribute()
             if id_attribute != "" and id_attribute != ident:
                 ident += "-" + id_attribute
-        if ident and ident != "":
-            return ident
-        # Use str representation
-        value_str = value.toXMLNode().toXMLString()
-        ident = hashlib.md5(value_str.encode("utf8")).hexdigest()
+        if not ident:
+            # Use the path of the element
+            parent = value.getParentSBMLObject()
+            path = value.getElementName()
+            if parent is not None:
+                path = "%s/%s[%s]" % (
+                    self.create_id(value=parent),
+                    path,
+                    self._position(parent=parent, value=value),
+                )
+            ident = hashlib.blake2b(path.encode("utf8"), digest_size=16).hexdigest()
+        # A temporary object may be freed and its pointer reused
+        if value.getSBMLDocument() is not None:
+            self._ids[key] = ident
         return ident
 
+    def _position(self, parent: Any, value: Any) -> int:
+        # Position of an element among the children of its parent, computed once by parent
+        key = int(parent.this)
+        if key not in self._positions.keys():
+            positions: Dict[int, int] = {}
+            for child in parent.getListOfAllElements():
+                child_parent = child.getParentSBMLObject()
+                if child_parent is not None and int(child_parent.this) == key:
+                    positions[int(child.this)] = len(positions)
+            self._positions[key] = positions
+        return self._positions[key].get(int(value.this), 0)
+
     def candidate_obj_plugin(self, obj: Any) -> List[Any]:
-        """Check if an object can activate one or several plugins
+        """Return an object followed by the plugin objects it carries.
 
         Parameters
         ----------
@@ -1149,14 +1569,42 @@ class SbmlToNeo4j(Sbml):
         ------
         List[Any]
         """
-        candidates = [obj]
-        for plugin in self.plugins:
-            candidates.append(obj.getPlugin(plugin))
-        return candidates
+        return [obj] + [x for _, x in self.plugin_objects(obj=obj)]
+
+    def plugin_objects(self, obj: Any) -> Tuple[Tuple[str, Any], ...]:
+        """Return the plugin objects carried by an object, resolved once by object.
+        The plugins a class can not carry are not requested.
+
+        Parameters
+        ----------
+        obj: Any
+            an object to activate some plugins
+
+        Return
+        ------
+        Tuple[Tuple[str, Any], ...]
+            the name of the plugin and the plugin object
+        """
+        key = int(obj.this)
+        objs = self._plugin_objs.get(key)
+        if objs is not None:
+            return objs
+        kind = (obj.getPackageName(), obj.getTypeCode())
+        names = self._plugin_names.get(kind)
+        if names is None:
+            names = tuple(x for x in self.plugins if obj.getPlugin(x) is not None)
+            self._plugin_names[kind] = names
+        objs = tuple((x, obj.getPlugin(x)) for x in names)
+        # A temporary object may be freed and its pointer reused
+        if obj.getSBMLDocument() is not None:
+            self._plugin_objs[key] = objs
+        return objs
 
     @classmethod
     def from_sbml(cls, path: str, tag: Optional[str] = None) -> "SbmlToNeo4j":
         """Create an Sbml object given a SBML file.
+        A compressed file (gzip, bz2, xz, zstd, zip) or a member of an archive ("models.zip/model.xml")
+        is decompressed on the fly, not by libsbml.
 
         Parameters
         ----------
@@ -1173,9 +1621,73 @@ class SbmlToNeo4j(Sbml):
         ------
         SbmlToNeo4j
         """
+        archive, member = compressed.split(path=path)
+        if member is not None or compressed.compression(path=archive) is not None:
+            return SbmlToNeo4j.from_string(
+                data=compressed.read_text(path=path), tag=tag
+            )
         doc = libsbml.readSBML(path)
         errors = doc.getNumErrors()
         if errors > 0:
             logging.error(doc.printErrors())
             raise ValueError("Error when parsing SBML -> abort")
         return SbmlToNeo4j(tag=tag, document=doc)
+
+    @classmethod
+    def from_string(cls, data: str, tag: Optional[str] = None) -> "SbmlToNeo4j":
+        """Create an Sbml object given the content of a SBML file.
+
+        Parameters
+        ----------
+        data: str
+            content of a SBML file
+        tag: Optional[str] (default: None)
+            an extra identifier for the node
+
+        Raises
+        ------
+        ValueError
+            if an error is encountered during the loading of the content
+        Return
+        ------
+        SbmlToNeo4j
+        """
+        doc = libsbml.readSBMLFromString(data)
+        errors = doc.getNumErrors()
+        if errors > 0:
+            logging.error(doc.printErrors())
+            raise ValueError("Error when parsing SBML -> abort")
+        return SbmlToNeo4j(tag=tag, document=doc)
+
+    @classmethod
+    def from_archive(
+        cls,
+        path: str,
+        tag: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+    ) -> Generator[Tuple[str, "SbmlToNeo4j"], None, None]:
+        """Create an Sbml object by SBML file of a zip or tar archive.
+        Members are decompressed one by one, without being extracted to the disk.
+
+        Parameters
+        ----------
+        path: str
+            a zip or tar archive
+        tag: Optional[str] (default: None)
+            an extra identifier for the node, shared by the members
+        extensions: Optional[List[str]] (default: None)
+            extensions of the members read, default: .xml and .sbml
+
+        Raises
+        ------
+        ValueError
+            if an error is encountered during the loading of a member
+        Return
+        ------
+        Generator[Tuple[str, SbmlToNeo4j], None, None]
+            the path of the member and its Sbml object
+        """
+        extensions = extensions or [".xml", ".sbml"]
+        for name, fid in compressed.iter_members(path=path, extensions=extensions):
+            data = fid.read().decode("utf-8")
+            yield name, SbmlToNeo4j.from_string(data=data, tag=tag)
@@ -0,0 +1,389 @@
+import copy
+import http.server
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import libsbml
+from neo4jsbml import arrows, backend, compressed, graph_method, pipeline, sbml
+
+
+class Server(object):
+    """Serve import and export jobs over a local HTTP API, keeping warm
+    the connection, the modelisations and the graphs of the SBML specifications.
+    Jobs are queued into a bounded queue consumed by a pool of threads,
+    a job submitted while the queue is full is rejected.
+
+    Endpoints
+    ---------
+    GET /health
+        status, number of jobs queued
+    POST /import
+        JSON: model, arrows, tag, dry_run, processes, skip_unchanged, incremental, streaming
+    POST /export
+        JSON: arrows, output, level, version
+    GET /jobs/<id>
+        status and result of a job
+
+    Attributes
+    ----------
+    connection: backend.Backend
+        Connection object
+    host: str
+        address to listen to
+    port: int
+        port to listen to, 0 to pick a free port
+    workers: int
+        number of jobs run concurrently
+    queue_size: int
+        number of jobs waiting at most
+
+    Methods
+    -------
+    __init__(connection: backend.Backend, host: str = "127.0.0.1", port: int = 0, workers: int = 1, queue_size: int = 16)
+        Instanciate a new object
+
+    start() -> None
+        Start the workers and listen into a thread
+
+    serve_forever() -> None
+        Start the workers and listen until interruption
+
+    stop() -> None
+        Stop listening and the workers
+
+    submit(kind: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]
+        Queue a job, None if the queue is full
+
+    get_job(ident: str) -> Optional[Dict[str, Any]]
+        Return a job
+
+    load_arrows(path: str, add_id: bool = True) -> arrows.Arrows
+        Return a copy of a modelisation, parsed once by file
+
+    load_graph_method(level: int, version: int) -> graph_method.GraphMethod
+        Return a copy of the graph of a specification, built once by level and version
+    """
+
+    KINDS = ["import", "export"]
+    # Finished jobs kept to be queried
+    HISTORY = 1000
+
+    def __init__(
+        self,
+        connection: backend.Backend,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        workers: int = 1,
+        queue_size: int = 16,
+    ) -> None:
+        self.connection = connection
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._serving = False
+        self._arrows: Dict[Tuple[str, float, bool], arrows.Arrows] = {}
+        self._graph_methods: Dict[Tuple[int, int], graph_method.GraphMethod] = {}
+        self.httpd = http.server.ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.app = self  # type: ignore
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    def load_arrows(self, path: str, add_id: bool = True) -> arrows.Arrows:
+        """Return a copy of a modelisation, parsed once by file until it is modified.
+
+        Parameters
+        ----------
+        path: str
+            an Arrows file
+        add_id: bool (default: True)
+            add the property id to each node
+
+        Return
+        ------
+        arrows.Arrows
+        """
+        key = (os.path.abspath(path), os.path.getmtime(path), add_id)
+        with self._lock:
+            if key not in self._arrows.keys():
+                self._arrows[key] = arrows.Arrows.from_json(path=path, add_id=add_id)
+            return copy.deepcopy(self._arrows[key])
+
+    def load_graph_method(self, level: int, version: int) -> graph_method.GraphMethod:
+        """Return a copy of the graph of a specification, built once by level and version.
+
+        Parameters
+        ----------
+        level: int
+            Number of the level
+        version: int
+            Number of the version
+
+        Return
+        ------
+        graph_method.GraphMethod
+        """
+        key = (level, version)
+        with self._lock:
+            if key not in self._graph_methods.keys():
+                document = libsbml.SBMLDocument(level, version)
+                self._graph_methods[key] = graph_method.GraphMethod.from_document(
+                    document=document
+                )
+            return copy.deepcopy(self._graph_methods[key])
+
+    def _run_import(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return pipeline.import_model(
+            connection=self.connection,
+            modelisation=self.load_arrows(path=params["arrows"]),
+            path=params["model"],
+            tag=params.get("tag"),
+            dry_run=params.get("dry_run", False),
+            processes=params.get("processes", 1),
+            skip_unchanged=params.get("skip_unchanged", False),
+            incremental=params.get("incremental", False),
+            streaming=params.get("streaming", False),
+        )
+
+    def _run_export(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        level, version = params.get("level", 3), params.get("version", 2)
+        sfn = sbml.SbmlFromNeo4j.from_specifications(
+            connection=self.connection,
+            level=level,
+            version=version,
+            gm=self.load_graph_method(level=level, version=version),
+        )
+        sfn.annotate(modelisation=self.load_arrows(path=params["arrows"], add_id=False))
+        sfn.conciliate_labels()
+        sfn.extract_entities()
+        sfn.to_sbml(path=params["output"])
+        return dict(output=params["output"])
+
+    @classmethod
+    def check(cls, kind: str, params: Any) -> Optional[str]:
+        """Check the parameters of a job.
+
+        Parameters
+        ----------
+        kind: str
+            import or export
+        params: Any
+            parameters of the job
+
+        Return
+        ------
+        Optional[str]
+            an error, None if the parameters are valid
+        """
+        if kind not in cls.KINDS:
+            return "Unknown job: %s" % (kind,)
+        if not isinstance(params, dict):
+            return "Parameters must be a JSON object"
+        required = ["model", "arrows"] if kind == "import" else ["arrows", "output"]
+        for key in required:
+            if not isinstance(params.get(key), str):
+                return "Parameter missing: %s" % (key,)
+        for key in ["model", "arrows"]:
+            if key in params.keys() and not compressed.exists(path=params[key]):
+                return "File does not exist: %s" % (params[key],)
+        return None
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Queue a job.
+
+        Parameters
+        ----------
+        kind: str
+            import or export
+        params: Dict[str, Any]
+            parameters of the job
+
+        Return
+        ------
+        Optional[Dict[str, Any]]
+            the job, None if the queue is full
+        """
+        job = dict(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            params=params,
+            status="queued",
+            result=None,
+            error=None,
+            submitted=time.time(),
+            duration=None,
+        )
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                return None
+            self.jobs[job["id"]] = job
+            self._prune()
+        return dict(job)
+
+    def _prune(self) -> None:
+        finished = [x for x in self.jobs.values() if x["duration"] is not None]
+        for job in finished[: max(0, len(finished) - self.HISTORY)]:
+            del self.jobs[job["id"]]
+
+    def get_job(self, ident: str) -> Optional[Dict[str, Any]]:
+        """Return a job.
+
+        Parameters
+        ----------
+        ident: str
+            id of the job
+
+        Return
+        ------
+        Optional[Dict[str, Any]]
+        """
+        with self._lock:
+            job = self.jobs.get(ident)
+            if job is None:
+                return None
+            return dict(job)
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            logging.info("Start job: %s %s" % (job["kind"], job["id"]))
+            with self._lock:
+                job["status"] = "running"
+            start = time.perf_counter()
+            try:
+                if job["kind"] == "import":
+                    result = self._run_import(params=job["params"])
+                else:
+                    result = self._run_export(params=job["params"])
+                status, error = "success", None
+            except Exception as exc:
+                logging.error("Job failed: %s, %s" % (job["id"], exc))
+                result, status, error = None, "failure", str(exc)
+            with self._lock:
+                job["result"] = result
+                job["status"] = status
+                job["error"] = error
+                job["duration"] = time.perf_counter() - start
+            logging.info("End job: %s %s" % (job["id"], status))
+            self._queue.task_done()
+
+    def _start_workers(self) -> None:
+        self._serving = True
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._workers.append(thread)
+
+    def start(self) -> None:
+        """Start the workers and listen into a thread.
+
+        Return
+        ------
+        None
+        """
+        self._start_workers()
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.start()
+        return None
+
+    def serve_forever(self) -> None:
+        """Start the workers and listen until interruption.
+
+        Return
+        ------
+        None
+        """
+        self._start_workers()
+        logging.info("Listen on http://%s:%s" % self.address)
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            logging.info("Interrupted")
+        finally:
+            self.stop()
+        return None
+
+    def stop(self) -> None:
+        """Stop listening, let the workers finish the jobs queued.
+
+        Return
+        ------
+        None
+        """
+        if self._serving is False:
+            return None
+        self._serving = False
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for _ in self._workers:
+            self._queue.put(None)
+        for thread in self._workers:
+            thread.join()
+        self._workers = []
+        return None
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def _reply(self, code: int, data: Any) -> None:
+        body = json.dumps(data).encode("utf8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        app: Server = self.server.app  # type: ignore
+        if self.path == "/health":
+            self._reply(
+                200,
+                dict(status="ok", queued=app._queue.qsize(), workers=app.workers),
+            )
+        elif self.path.startswith("/jobs/"):
+            job = app.get_job(ident=self.path[len("/jobs/") :])
+            if job is None:
+                self._reply(404, dict(error="Unknown job"))
+            else:
+                self._reply(200, job)
+        else:
+            self._reply(404, dict(error="Unknown path: %s" % (self.path,)))
+
+    def do_POST(self) -> None:
+        app: Server = self.server.app  # type: ignore
+        kind = self.path.strip("/")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._reply(400, dict(error="Body must be JSON"))
+            return
+        error = Server.check(kind=kind, params=params)
+        if error and kind not in Server.KINDS:
+            self._reply(404, dict(error=error))
+            return
+        elif error:
+            self._reply(400, dict(error=error))
+            return
+        job = app.submit(kind=kind, params=params)
+        if job is None:
+            self._reply(503, dict(error="Queue is full"))
+            return
+        self._reply(202, job)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.info("%s - %s" % (self.address_string(), format % args))
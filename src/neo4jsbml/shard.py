@@ -0,0 +1,213 @@
+import concurrent.futures
+import configparser
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from neo4jsbml import backend, metrics
+
+# Fields holding a count into the statistics, the others identify a row
+COUNT_KEYS = ["value.count", "count"]
+
+
+class Shards(object):
+    """Route the models to several databases by tag.
+    A tag listed into the routes goes to its shard, the others go to the shard
+    chosen by a stable hash of the tag: a tag is always written to the same database.
+
+    Attributes
+    ----------
+    connections: Dict[str, backend.Backend]
+        connection by name of shard
+    routes: Dict[str, str]
+        name of shard by tag, overriding the hash
+
+    Methods
+    -------
+    __init__(connections: Dict[str, backend.Backend], routes: Optional[Dict[str, str]] = None)
+        Instanciate a new object
+
+    route(tag: Optional[str]) -> str
+        Return the name of the shard of a tag
+
+    connection(tag: Optional[str]) -> backend.Backend
+        Return the connection of the shard of a tag
+
+    is_connected() -> bool
+        Test if all shards are reachable
+
+    query_statistics(by_tag: bool, properties: bool, workers: int) -> Dict[str, List[Dict[str, Any]]]
+        Count nodes by label and relationships by type, summed over the shards
+
+    @classmethod
+    merge_statistics(datas: List[Dict[str, List[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]
+        Sum the statistics of several databases
+
+    @classmethod
+    from_config(path: str) -> "Shards"
+        Create a Shards from an .ini file
+    """
+
+    SECTION_PREFIX = "shard:"
+    SECTION_ROUTING = "routing"
+    # Arguments of connect.Connect read from a section of shard
+    KEYS = ["protocol", "url", "port", "user", "database", "password", "password_path"]
+
+    def __init__(
+        self,
+        connections: Dict[str, backend.Backend],
+        routes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if len(connections) < 1:
+            raise ValueError("At least one shard is required")
+        self.connections = connections
+        self.routes = routes or {}
+        for tag, name in self.routes.items():
+            if name not in self.connections.keys():
+                raise ValueError("Unknown shard for the tag %s: %s" % (tag, name))
+        self._names = list(self.connections.keys())
+
+    def route(self, tag: Optional[str]) -> str:
+        """Return the name of the shard of a tag.
+
+        Parameters
+        ----------
+        tag: Optional[str]
+            a tag, models without tag are routed as the empty tag
+
+        Return
+        ------
+        str
+        """
+        key = tag or ""
+        if key in self.routes.keys():
+            return self.routes[key]
+        digest = hashlib.sha1(key.encode("utf8")).hexdigest()
+        return self._names[int(digest, 16) % len(self._names)]
+
+    def connection(self, tag: Optional[str]) -> backend.Backend:
+        """Return the connection of the shard of a tag.
+
+        Parameters
+        ----------
+        tag: Optional[str]
+            a tag
+
+        Return
+        ------
+        backend.Backend
+        """
+        return self.connections[self.route(tag=tag)]
+
+    def is_connected(self) -> bool:
+        """Test if all shards are reachable.
+
+        Return
+        ------
+        bool
+        """
+        return all(x.is_connected() for x in self.connections.values())
+
+    @metrics.measure()
+    def query_statistics(
+        self, by_tag: bool = False, properties: bool = False, workers: int = 8
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Count nodes by label and relationships by type, summed over the shards.
+        Shards are queried concurrently.
+
+        Parameters
+        ----------
+        by_tag: bool (default: False)
+            count entities by tag
+        properties: bool (default: False)
+            count nodes having each property, by label
+        workers: int (default: 8)
+            number of queries issued concurrently by shard
+
+        Return
+        ------
+        Dict[str, List[Dict[str, Any]]]
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self.connections)
+        ) as executor:
+            datas = list(
+                executor.map(
+                    metrics.METRICS.bind(
+                        lambda x: x.query_statistics(
+                            by_tag=by_tag, properties=properties, workers=workers
+                        )
+                    ),
+                    self.connections.values(),
+                )
+            )
+        return Shards.merge_statistics(datas=datas)
+
+    @classmethod
+    def merge_statistics(
+        cls, datas: List[Dict[str, List[Dict[str, Any]]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Sum the statistics of several databases, rows are matched on their fields other than the count.
+
+        Parameters
+        ----------
+        datas: List[Dict[str, List[Dict[str, Any]]]]
+            statistics returned by query_statistics()
+
+        Return
+        ------
+        Dict[str, List[Dict[str, Any]]]
+        """
+        merged: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        for data in datas:
+            for section, rows in data.items():
+                merged_rows = merged.setdefault(section, {})
+                for row in rows:
+                    ident = tuple(
+                        (k, v) for k, v in sorted(row.items()) if k not in COUNT_KEYS
+                    )
+                    if ident not in merged_rows.keys():
+                        merged_rows[ident] = dict(row)
+                        continue
+                    for key in COUNT_KEYS:
+                        if key in row.keys():
+                            merged_rows[ident][key] += row[key]
+        return {k: list(v.values()) for k, v in merged.items()}
+
+    @classmethod
+    def from_config(cls, path: str) -> "Shards":
+        """Create a Shards from an .ini file.
+        Each section [shard:<name>] defines a database with the keys protocol, url, port,
+        user, database, password or password_path.
+        The optional section [routing] assigns a tag to a shard: <tag> = <name>.
+
+        Parameters
+        ----------
+        path: str
+            a path of an .ini file
+
+        Return
+        ------
+        Shards
+        """
+        from neo4jsbml import connect
+
+        config = configparser.ConfigParser()
+        # Keep the case of the tags
+        config.optionxform = str  # type: ignore
+        config.read(path)
+        connections: Dict[str, backend.Backend] = {}
+        for section in config.sections():
+            if not section.startswith(cls.SECTION_PREFIX):
+                continue
+            data = {k: v for k, v in config[section].items() if k in cls.KEYS}
+            connections[section[len(cls.SECTION_PREFIX) :]] = connect.Connect(**data)
+        routes: Dict[str, str] = {}
+        if config.has_section(cls.SECTION_ROUTING):
+            routes = dict(config[cls.SECTION_ROUTING].items())
+        return Shards(connections=connections, routes=routes)
+
+    def __repr__(self):
+        msg = []
+        for name, con in self.connections.items():
+            msg.append("Shard %s: %s" % (name, repr(con).replace("\n", ", ")))
+        return "\n".join(msg)
@@ -1,8 +1,11 @@
+import threading
+from abc import ABCMeta
 from typing import Any, Dict
 
 
-class Singleton(type):
-    """Implementation of the singleton pattern as a meta class."""
+class Singleton(ABCMeta):
+    """Implementation of the singleton pattern as a meta class.
+    It derives from ABCMeta to be used by classes having abstract methods."""
 
     _instances: Dict[Any, Any] = {}
 
@@ -14,5 +17,30 @@ class Singleton(type):
 
     @classmethod
     def clean(cls) -> None:
-        cls._instances = {}
+        Singleton._instances = {}
+        return None
+
+
+class Registry(Singleton):
+    """Implementation of a registry of instances as a meta class: an instance by key.
+    The key is built by the classmethod registry_key() of the inheriting class
+    from the arguments of the call."""
+
+    _lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs) -> Any:
+        """Override an inheriting class' call."""
+        key = (cls, cls.registry_key(*args, **kwargs))
+        with Registry._lock:
+            if key not in cls._instances:
+                cls._instances[key] = type.__call__(cls, *args, **kwargs)
+            return cls._instances[key]
+
+    @classmethod
+    def discard(cls, instance: Any) -> None:
+        """Remove an instance from the registry."""
+        with Registry._lock:
+            for key, value in list(Singleton._instances.items()):
+                if value is instance:
+                    del Singleton._instances[key]
         return None
@@ -1,4 +1,3 @@
-import copy
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -37,6 +36,8 @@ class SNode(entity.Entity):
 
     LABEL_ID = "id"
 
+    __slots__ = ("labels",)
+
     def __init__(self, labels: List[str], *args, **kwargs) -> None:
         super(SNode, self).__init__(*args, **kwargs)
         self.labels = labels
@@ -72,7 +73,7 @@ class SNode(entity.Entity):
         return SNode(
             id=data["id"],
             labels=data["labels"],
-            properties=copy.deepcopy(data["properties"]),
+            properties=SNode.copy_properties(properties=data["properties"]),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -1,4 +1,3 @@
-import copy
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -46,6 +45,8 @@ class SRelationship(entity.Entity):
         Represent a SRelationship as a dictionary
     """
 
+    __slots__ = ("from_label", "to_label", "from_id", "to_id", "label")
+
     def __init__(
         self,
         from_label: str,
@@ -121,7 +122,7 @@ class SRelationship(entity.Entity):
             from_id=data["from_id"],
             to_id=data["to_id"],
             label=data["label"],
-            properties=copy.deepcopy(data["properties"]),
+            properties=SRelationship.copy_properties(properties=data["properties"]),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -0,0 +1,189 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from neo4jsbml import backend
+
+
+def _modules() -> Tuple[Any, Any]:
+    """Import numpy and scipy.sparse, only needed to build a matrix"""
+    try:
+        import numpy
+        from scipy import sparse
+    except ImportError:
+        raise ImportError(
+            "Packages numpy and scipy are required to build the stoichiometry matrix"
+        )
+    return numpy, sparse
+
+
+class Stoichiometry(object):
+    """Stoichiometry matrix of a model: a row by species, a column by reaction.
+    Substrates have negative coefficients, products positive ones.
+
+    Attributes
+    ----------
+    matrix: scipy.sparse.csr_matrix
+        coefficients, species by reactions
+    species: numpy.ndarray
+        id of the species of each row, sorted
+    reactions: numpy.ndarray
+        id of the reaction of each column, sorted
+
+    Methods
+    -------
+    __init__(matrix: scipy.sparse.csr_matrix, species: numpy.ndarray, reactions: numpy.ndarray)
+        Instanciate a new object
+
+    to_npz(path: str) -> None
+        Save the matrix and its ids into a .npz file
+
+    @classmethod
+    from_rows(rows: List[Dict[str, Any]], substrates: Optional[List[str]] = None) -> "Stoichiometry"
+        Build the matrix from the rows of query_stoichiometry()
+
+    @classmethod
+    from_backend(connection: backend.Backend, tag: Optional[str] = None, substrates: Optional[List[str]] = None, products: Optional[List[str]] = None) -> "Stoichiometry"
+        Query the relationships of a model in bulk and build its matrix
+
+    @classmethod
+    from_npz(path: str) -> "Stoichiometry"
+        Load a matrix saved by to_npz()
+    """
+
+    # Types of the relationships linking a reaction to its substrates, or to its products
+    SUBSTRATES = ["HAS_REACTANT", "IS_REACTANT", "HAS_SUBSTRATE"]
+    PRODUCTS = ["HAS_PRODUCT"]
+
+    def __init__(self, matrix: Any, species: Any, reactions: Any) -> None:
+        self.matrix = matrix
+        self.species = species
+        self.reactions = reactions
+
+    def to_npz(self, path: str) -> None:
+        """Save the matrix and its ids into an uncompressed .npz file.
+        The file is also readable by scipy.sparse.load_npz().
+
+        Parameters
+        ----------
+        path: str
+            a .npz file, the extension is appended if missing
+
+        Return
+        ------
+        None
+        """
+        numpy, _ = _modules()
+        numpy.savez(
+            path,
+            format=numpy.array(b"csr"),
+            shape=numpy.array(self.matrix.shape),
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            species=self.species,
+            reactions=self.reactions,
+        )
+        return None
+
+    @classmethod
+    def from_rows(
+        cls, rows: List[Dict[str, Any]], substrates: Optional[List[str]] = None
+    ) -> "Stoichiometry":
+        """Build the matrix from the rows of query_stoichiometry().
+        Coefficients of the same species and reaction are summed.
+
+        Parameters
+        ----------
+        rows: List[Dict[str, Any]]
+            keys: reaction, species, type, stoichiometry
+        substrates: Optional[List[str]] (default: None)
+            types of the relationships of the substrates, SUBSTRATES by default
+
+        Return
+        ------
+        Stoichiometry
+        """
+        numpy, sparse = _modules()
+        if substrates is None:
+            substrates = cls.SUBSTRATES
+        rows = [
+            x for x in rows if x["reaction"] is not None and x["species"] is not None
+        ]
+        species, species_ix = numpy.unique(
+            numpy.array([x["species"] for x in rows], dtype=str), return_inverse=True
+        )
+        reactions, reactions_ix = numpy.unique(
+            numpy.array([x["reaction"] for x in rows], dtype=str), return_inverse=True
+        )
+        coefficients = numpy.array(
+            [x["stoichiometry"] for x in rows], dtype=numpy.float64
+        )
+        signs = numpy.array([x["type"] in substrates for x in rows], dtype=bool)
+        coefficients[signs] *= -1
+        matrix = sparse.csr_matrix(
+            (coefficients, (species_ix, reactions_ix)),
+            shape=(len(species), len(reactions)),
+        )
+        matrix.eliminate_zeros()
+        return Stoichiometry(matrix=matrix, species=species, reactions=reactions)
+
+    @classmethod
+    def from_backend(
+        cls,
+        connection: backend.Backend,
+        tag: Optional[str] = None,
+        substrates: Optional[List[str]] = None,
+        products: Optional[List[str]] = None,
+    ) -> "Stoichiometry":
+        """Query the relationships of a model in bulk and build its matrix.
+
+        Parameters
+        ----------
+        connection: backend.Backend
+            a connection
+        tag: Optional[str] (default: None)
+            tag of the model
+        substrates: Optional[List[str]] (default: None)
+            types of the relationships of the substrates, SUBSTRATES by default
+        products: Optional[List[str]] (default: None)
+            types of the relationships of the products, PRODUCTS by default
+
+        Return
+        ------
+        Stoichiometry
+        """
+        if substrates is None:
+            substrates = cls.SUBSTRATES
+        if products is None:
+            products = cls.PRODUCTS
+        rows = connection.query_stoichiometry(types=substrates + products, tag=tag)
+        return Stoichiometry.from_rows(rows=rows, substrates=substrates)
+
+    @classmethod
+    def from_npz(cls, path: str) -> "Stoichiometry":
+        """Load a matrix saved by to_npz().
+
+        Parameters
+        ----------
+        path: str
+            a .npz file
+
+        Return
+        ------
+        Stoichiometry
+        """
+        numpy, sparse = _modules()
+        with numpy.load(path) as data:
+            matrix = sparse.csr_matrix(
+                (data["data"], data["indices"], data["indptr"]),
+                shape=tuple(data["shape"]),
+            )
+            return Stoichiometry(
+                matrix=matrix, species=data["species"], reactions=data["reactions"]
+            )
+
+    def __repr__(self):
+        return "Species: %s\nReactions: %s\nCoefficients: %s" % (
+            self.matrix.shape[0],
+            self.matrix.shape[1],
+            self.matrix.nnz,
+        )
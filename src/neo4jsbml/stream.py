@@ -0,0 +1,530 @@
+import hashlib
+import logging
+import re
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from neo4jsbml import compressed, snode, srelationship
+
+# Properties read from a child element instead of an attribute
+CHILD_PROPERTIES = ["notes", "annotation"]
+# Namespace of the mathematical expressions, which are not SBML elements
+MATHML = "{http://www.w3.org/1998/Math/MathML}"
+# Namespaces of the layout package, elements libsbml creates without being written
+LAYOUT = [
+    "http://www.sbml.org/sbml/level3/version1/layout/version1",
+    "http://projects.eml.org/bcb/sbml/level2",
+]
+# Order of the children of an element given by libsbml, if it differs from the XML
+CHILD_ORDER = {
+    "reaction": ["kineticlaw", "listofreactants", "listofproducts", "listofmodifiers"],
+}
+# Attribute returned by libsbml as the id of an element, "id" by default
+ID_ATTRIBUTES = {
+    "assignmentrule": "variable",
+    "raterule": "variable",
+    "eventassignment": "variable",
+    "initialassignment": "symbol",
+}
+
+
+def _local(name: str) -> str:
+    """Remove the namespace of a tag or an attribute"""
+    return name.rsplit("}", 1)[-1]
+
+
+def _element_id(local: str, attrs: Dict[str, str]) -> str:
+    """ID of an element as returned by libsbml, empty if none"""
+    ident = attrs.get(ID_ATTRIBUTES.get(local.lower(), "id"), "")
+    id_attribute = attrs.get("id", "")
+    if id_attribute != "" and id_attribute != ident:
+        ident += "-" + id_attribute
+    return ident
+
+
+def _namespace(name: str) -> str:
+    """Namespace of a tag, empty if none"""
+    return name[1:].split("}", 1)[0] if name.startswith("{") else ""
+
+
+class _Frame(object):
+    """Element opened during the pass"""
+
+    __slots__ = (
+        "elem",
+        "local",
+        "arrow_ids",
+        "id",
+        "attrs",
+        "children",
+        "keep",
+        "sbase",
+        "kids",
+    )
+
+    def __init__(self, elem: ElementTree.Element, local: str) -> None:
+        self.elem = elem
+        self.local = local
+        self.arrow_ids: List[str] = []
+        self.id: Optional[str] = None
+        self.attrs: Dict[str, str] = {}
+        self.children: Dict[str, str] = {}
+        self.keep = False
+        # Read by libsbml as an SBML element, and the SBML elements nested: rank, order and id
+        self.sbase = True
+        self.kids: List[Tuple[Tuple[bool, int], int, str]] = []
+
+
+class SbmlStream(object):
+    """Map a modelisation to a SBML file in one pass over the XML, without building the document.
+    Elements selected by the labels of the modelisation are turned into nodes, then dropped:
+    the memory used depends on the number of nodes and relationships, not on the size of the file.
+    Relationships are resolved at the end of the pass from the references collected,
+    with the strategies of sbml.SbmlToNeo4j: attribute named as the label of the other node,
+    attribute named as the relationship, listOf named as the relationship, then nesting.
+
+    Differences with sbml.SbmlToNeo4j: properties are read from the XML attributes,
+    unset attributes are not stored instead of the default values of libsbml,
+    sboTerm is stored as an integer, mathematical expressions are not available,
+    an element without id is identified as by sbml.SbmlToNeo4j.create_id(), its position among
+    the children of its parent is known at the end of the parent and resolved at the end of the pass.
+    The layout package is not supported: libsbml creates elements not written in the file.
+
+    Attributes
+    ----------
+    path: str
+        a SBML file, compressed or not, or a member of an archive
+    tag: Optional[str]
+        an extra identifier for the entities
+
+    Methods
+    -------
+    __init__(path: str, tag: Optional[str] = None)
+        Instanciate a new object
+
+    format(nodes: List[snode.SNode], relationships: List[srelationship.SRelationship]) -> Tuple[List[snode.SNode], List[srelationship.SRelationship]]
+        Create nodes and relationships from the schema and the values in the SBML file
+
+    @classmethod
+    cast(key: str, value: str) -> Any
+        Cast the value of an attribute
+
+    @classmethod
+    create_id(local: str, attrs: Dict[str, str], parent_id: Optional[str] = None, position: int = 0) -> str
+        Identify an element as sbml.SbmlToNeo4j.create_id()
+    """
+
+    REGEX_INT = re.compile(r"^-?\d+$")
+    REGEX_FLOAT = re.compile(r"^-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+
+    def __init__(self, path: str, tag: Optional[str] = None) -> None:
+        self.path = path
+        self.tag = tag
+
+    @classmethod
+    def cast(cls, key: str, value: str) -> Any:
+        """Cast the value of an attribute: boolean, integer, float or string.
+
+        Parameters
+        ----------
+        key: str
+            name of the attribute
+        value: str
+            value of the attribute
+
+        Return
+        ------
+        Any
+        """
+        if key.lower() == "sboterm" and value.startswith("SBO:"):
+            return int(value[4:])
+        if value in ["true", "false"]:
+            return value == "true"
+        if cls.REGEX_INT.match(value):
+            return int(value)
+        if cls.REGEX_FLOAT.match(value):
+            return float(value)
+        return value
+
+    @classmethod
+    def create_id(
+        cls,
+        local: str,
+        attrs: Dict[str, str],
+        parent_id: Optional[str] = None,
+        position: int = 0,
+    ) -> str:
+        """Identify an element as sbml.SbmlToNeo4j.create_id().
+        If the element has no id, a hash computed on its path into the document is used:
+        ID of its parent, name and position of the element among the SBML elements of its parent.
+
+        Parameters
+        ----------
+        local: str
+            name of the element, without namespace
+        attrs: Dict[str, str]
+            attributes of the element, lowercased and without namespace
+        parent_id: Optional[str] (default: None)
+            ID of the parent, None for the root
+        position: int (default: 0)
+            position of the element among the SBML elements of its parent
+
+        Return
+        ------
+        str
+        """
+        ident = _element_id(local=local, attrs=attrs)
+        if not ident:
+            path = local
+            if parent_id is not None:
+                path = "%s/%s[%s]" % (parent_id, local, position)
+            ident = hashlib.blake2b(path.encode("utf8"), digest_size=16).hexdigest()
+        return ident
+
+    def _node(self, arrow_node: snode.SNode, frame: _Frame) -> snode.SNode:
+        data: Dict[str, Any] = {}
+        for prop in arrow_node.properties:
+            key = prop.lower()
+            if key == "id":
+                continue
+            if key in frame.attrs.keys():
+                data[prop] = SbmlStream.cast(key=key, value=frame.attrs[key])
+            elif key in frame.children.keys():
+                data[prop] = frame.children[key]
+        if self.tag is not None:
+            data["tag"] = self.tag
+        if data.get("name", None) is None or data.get("name", "") == "":
+            data["name"] = frame.id
+        node = snode.SNode(id=frame.id, labels=arrow_node.labels, properties=data)
+        node.clean_properties()
+        return node
+
+    def format(
+        self,
+        nodes: List[snode.SNode],
+        relationships: Optional[List[srelationship.SRelationship]] = None,
+    ) -> Tuple[List[snode.SNode], List[srelationship.SRelationship]]:
+        """Create nodes and relationships from the schema and the values in the SBML file.
+
+        Parameters
+        ----------
+        nodes: List[snode.SNode]
+            the nodes stored into the Arrows object
+        relationships: Optional[List[srelationship.SRelationship]] (default: None)
+            the relationships stored into the Arrows object
+
+        Return
+        ------
+        Tuple[List[snode.SNode], List[srelationship.SRelationship]]
+        """
+        relationships = relationships or []
+        arrow_nodes: Dict[str, snode.SNode] = {}
+        by_element: Dict[str, List[str]] = {}
+        for arrow_node in nodes:
+            if len(arrow_node.labels) < 1:
+                logging.warning("None label is found for a node: %s" % (arrow_node.id,))
+                continue
+            arrow_nodes[arrow_node.id] = arrow_node
+            by_element.setdefault(arrow_node.labels[0].lower(), []).append(
+                arrow_node.id
+            )
+        # Arrow nodes related to each arrow node
+        partners: Dict[str, Set[str]] = {x: set() for x in arrow_nodes.keys()}
+        for arrow_rel in relationships:
+            if arrow_rel.from_id in partners and arrow_rel.to_id in partners:
+                partners[arrow_rel.from_id].add(arrow_rel.to_id)
+                partners[arrow_rel.to_id].add(arrow_rel.from_id)
+        wanted = {
+            x: set(p.lower() for p in y.properties) & set(CHILD_PROPERTIES)
+            for x, y in arrow_nodes.items()
+        }
+
+        res_nodes: Dict[str, List[snode.SNode]] = {x: [] for x in arrow_nodes.keys()}
+        # Attributes of the elements mapped, by arrow node
+        attrs: Dict[str, List[Tuple[str, Dict[str, str]]]] = {
+            x: [] for x in arrow_nodes.keys()
+        }
+        # Elements nested into an element mapped: (arrow id, element id, listOf, arrow id nested or None, attributes)
+        nested: List[Tuple[str, str, str, Optional[str], Any]] = []
+        stack: List[_Frame] = []
+        # Elements without id: ID of the parent, name and position
+        paths: Dict[str, List[Any]] = {}
+        count = 0
+        with compressed.open_binary(path=self.path) as fid:
+            for event, elem in ElementTree.iterparse(fid, events=("start", "end")):
+                if event == "start":
+                    count += 1
+                    frame = _Frame(elem=elem, local=_local(elem.tag))
+                    parent = stack[-1] if stack else None
+                    if parent is not None:
+                        frame.keep = parent.keep or (
+                            len(parent.arrow_ids) > 0
+                            and frame.local.lower() in parent.children
+                        )
+                        frame.sbase = (
+                            parent.sbase
+                            and frame.local.lower() not in CHILD_PROPERTIES
+                            and not elem.tag.startswith(MATHML)
+                        )
+                    frame.arrow_ids = by_element.get(frame.local.lower(), [])
+                    if frame.arrow_ids and _namespace(elem.tag) in LAYOUT:
+                        raise ValueError(
+                            "Layout package is not supported in streaming mode: %s"
+                            % (frame.local,)
+                        )
+                    frame.attrs = {_local(k).lower(): v for k, v in elem.items()}
+                    if frame.sbase or frame.arrow_ids:
+                        frame.id = _element_id(local=frame.local, attrs=frame.attrs)
+                        if frame.id == "":
+                            # Position of an element out of SBML is unique, not resolved
+                            frame.id = "#%s" % (len(paths),)
+                            paths[frame.id] = [
+                                parent.id if parent is not None else None,
+                                frame.local,
+                                count,
+                            ]
+                    if frame.arrow_ids:
+                        for arrow_id in frame.arrow_ids:
+                            for key in wanted[arrow_id]:
+                                frame.children[key] = ""
+                    self._collect(frame=frame, stack=stack, nested=nested)
+                    stack.append(frame)
+                    continue
+                frame = stack.pop()
+                parent = stack[-1] if stack else None
+                # Position of the children, in the order of libsbml
+                for position, (_, _, ident) in enumerate(sorted(frame.kids)):
+                    if ident in paths:
+                        paths[ident][2] = position
+                # As libsbml, an empty listOf is not an element of its parent
+                if (
+                    parent is not None
+                    and frame.sbase
+                    and (len(frame.kids) > 0 or not frame.local.startswith("listOf"))
+                ):
+                    order = CHILD_ORDER.get(parent.local.lower(), [])
+                    rank = (
+                        _namespace(elem.tag) != _namespace(parent.elem.tag),
+                        (
+                            order.index(frame.local.lower())
+                            if frame.local.lower() in order
+                            else len(order)
+                        ),
+                    )
+                    parent.kids.append((rank, len(parent.kids), frame.id))
+                frame.kids = []
+                for arrow_id in frame.arrow_ids:
+                    attrs[arrow_id].append((frame.id, frame.attrs))
+                    res_nodes[arrow_id].append(
+                        self._node(arrow_node=arrow_nodes[arrow_id], frame=frame)
+                    )
+                if (
+                    parent is not None
+                    and parent.arrow_ids
+                    and frame.local.lower() in parent.children
+                ):
+                    parent.children[frame.local.lower()] = ElementTree.tostring(
+                        elem, encoding="unicode"
+                    ).strip()
+                elif frame.keep:
+                    continue
+                elem.clear()
+                if parent is not None:
+                    parent.elem.remove(elem)
+
+        if paths:
+            self._resolve(paths=paths, res_nodes=res_nodes, attrs=attrs, nested=nested)
+        ids = {x: set(n.id for n in y) for x, y in res_nodes.items()}
+        res_rels: List[srelationship.SRelationship] = []
+        for arrow_rel in relationships:
+            if arrow_rel.from_id not in ids or arrow_rel.to_id not in ids:
+                logging.warning("No relationship for: %s" % (arrow_rel.label,))
+                continue
+            res_rels.extend(
+                self._relationships(
+                    arrow_rel=arrow_rel,
+                    arrow_nodes=arrow_nodes,
+                    ids=ids,
+                    attrs=attrs,
+                    nested=nested,
+                )
+            )
+        if self.tag is not None:
+            for rel in res_rels:
+                rel.add_property(label="tag", value=self.tag)
+        return [y for x in res_nodes.values() for y in x], res_rels
+
+    @classmethod
+    def _resolve(
+        cls,
+        paths: Dict[str, List[Any]],
+        res_nodes: Dict[str, List[snode.SNode]],
+        attrs: Dict[str, List[Tuple[str, Dict[str, str]]]],
+        nested: List[Tuple[str, str, str, Optional[str], Any]],
+    ) -> None:
+        # Replace the temporary ids of the elements without id by the hash of their path
+        resolved: Dict[str, str] = {}
+
+        def resolve(ident: Any) -> Any:
+            if ident not in paths:
+                return ident
+            if ident not in resolved:
+                parent_id, local, position = paths[ident]
+                resolved[ident] = SbmlStream.create_id(
+                    local=local,
+                    attrs={},
+                    parent_id=resolve(parent_id),
+                    position=position,
+                )
+            return resolved[ident]
+
+        for values in res_nodes.values():
+            for node in values:
+                if node.properties.get("name") == node.id:
+                    node.properties["name"] = resolve(node.id)
+                node.id = resolve(node.id)
+        for values in attrs.values():
+            values[:] = [(resolve(x), y) for x, y in values]
+        nested[:] = [
+            (a, resolve(b), c, d, resolve(e) if d is not None else e)
+            for a, b, c, d, e in nested
+        ]
+
+    def _collect(
+        self,
+        frame: _Frame,
+        stack: List[_Frame],
+        nested: List[Tuple[str, str, str, Optional[str], Any]],
+    ) -> None:
+        # Record the element for the mapped elements containing it,
+        # with the listOf holding it if this listOf is a child of the mapped element
+        parent = stack[-1].local.lower() if stack else ""
+        for depth, ancestor in enumerate(reversed(stack)):
+            listof = parent if depth == 1 and parent.startswith("listof") else ""
+            if ancestor.arrow_ids:
+                for arrow_id in ancestor.arrow_ids:
+                    if frame.arrow_ids:
+                        for nested_id in frame.arrow_ids:
+                            nested.append(
+                                (arrow_id, ancestor.id, listof, nested_id, frame.id)
+                            )
+                    elif frame.attrs:
+                        nested.append(
+                            (arrow_id, ancestor.id, listof, None, frame.attrs)
+                        )
+                if not frame.arrow_ids:
+                    # References belong to the closest element mapped
+                    break
+
+    def _relationships(
+        self,
+        arrow_rel: srelationship.SRelationship,
+        arrow_nodes: Dict[str, snode.SNode],
+        ids: Dict[str, Set[str]],
+        attrs: Dict[str, List[Tuple[str, Dict[str, str]]]],
+        nested: List[Tuple[str, str, str, Optional[str], Any]],
+    ) -> List[srelationship.SRelationship]:
+        names = [arrow_rel.label] + arrow_rel.label.split("_")
+        names = [x.lower() for x in names if x != ""]
+        strategies = [
+            ("label", self._by_label),
+            ("relationship's name", self._by_name),
+            ("relationship's name (listOf)", self._by_listof),
+            ("nesting", self._by_nesting),
+        ]
+        for name, strategy in strategies:
+            for a, b, swap in [
+                (arrow_rel.from_id, arrow_rel.to_id, False),
+                (arrow_rel.to_id, arrow_rel.from_id, True),
+            ]:
+                pairs = strategy(
+                    a=a,
+                    b=b,
+                    label_b=arrow_nodes[b].labels[0].lower(),
+                    names=names,
+                    ids=ids,
+                    attrs=attrs,
+                    nested=nested,
+                )
+                if len(pairs) < 1:
+                    continue
+                logging.info(
+                    "Map entities by %s: %s - %s"
+                    % (
+                        name,
+                        arrow_nodes[arrow_rel.from_id].labels[0],
+                        arrow_nodes[arrow_rel.to_id].labels[0],
+                    )
+                )
+                res = []
+                for from_id, to_id in pairs:
+                    if swap:
+                        from_id, to_id = to_id, from_id
+                    res.append(
+                        srelationship.SRelationship(
+                            id="",
+                            from_label=arrow_nodes[arrow_rel.from_id].labels[0],
+                            to_label=arrow_nodes[arrow_rel.to_id].labels[0],
+                            from_id=from_id,
+                            to_id=to_id,
+                            label=arrow_rel.label,
+                            properties={},
+                        )
+                    )
+                return res
+        logging.warning(
+            "No method was found for entities: %s and %s, belongs to the relationships: %s"
+            % (
+                arrow_nodes[arrow_rel.from_id].labels[0],
+                arrow_nodes[arrow_rel.to_id].labels[0],
+                arrow_rel.label,
+            )
+        )
+        return []
+
+    @classmethod
+    def _by_label(cls, a, b, label_b, names, ids, attrs, nested) -> List[Tuple]:
+        res = []
+        for ident, values in attrs[a]:
+            value = values.get(label_b)
+            if value in ids[b]:
+                res.append((ident, value))
+        return res
+
+    @classmethod
+    def _by_name(cls, a, b, label_b, names, ids, attrs, nested) -> List[Tuple]:
+        res = []
+        for ident, values in attrs[a]:
+            for name in names:
+                found = [v for k, v in values.items() if name in k and v in ids[b]]
+                if found:
+                    res.append((ident, found[0]))
+                    break
+        return res
+
+    @classmethod
+    def _by_listof(cls, a, b, label_b, names, ids, attrs, nested) -> List[Tuple]:
+        res = []
+        prefixes = ["listof" + x for x in names]
+        for arrow_id, ident, listof, nested_id, value in nested:
+            if arrow_id != a or not any(listof.startswith(x) for x in prefixes):
+                continue
+            if nested_id == b:
+                res.append((ident, value))
+            elif nested_id is None:
+                found = [v for v in value.values() if v in ids[b]]
+                if found:
+                    res.append((ident, found[0]))
+        return res
+
+    @classmethod
+    def _by_nesting(cls, a, b, label_b, names, ids, attrs, nested) -> List[Tuple]:
+        res = []
+        for arrow_id, ident, listof, nested_id, value in nested:
+            if arrow_id != a:
+                continue
+            if nested_id == b:
+                res.append((ident, value))
+            elif nested_id is None and value.get(label_b) in ids[b]:
+                res.append((ident, value[label_b]))
+        return res
@@ -1,7 +1,9 @@
 import json
 import os
 import sys
+import tarfile
 import xml.etree.ElementTree as ElementTree
+import zipfile
 
 import pytest
 from neo4jsbml import cmd, connect, sbml, singleton
@@ -55,6 +57,32 @@ def sbml_toy(iml_toy_path):
     return sbml.SbmlToNeo4j.from_sbml(path=iml_toy_path)
 
 
+@pytest.fixture(scope="session")
+def archive_models(data_dir):
+    return [
+        os.path.join(data_dir, "model", "L3V2.7-1.xml"),
+        os.path.join(data_dir, "model", "L2V5.7-1.xml"),
+    ]
+
+
+@pytest.fixture(scope="session")
+def zip_path(tmp_path_factory, archive_models):
+    path = str(tmp_path_factory.mktemp("archive") / "models.zip")
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as fod:
+        for model in archive_models:
+            fod.write(model, arcname=os.path.basename(model))
+    return path
+
+
+@pytest.fixture(scope="session")
+def tar_path(tmp_path_factory, archive_models):
+    path = str(tmp_path_factory.mktemp("archive") / "models.tar.gz")
+    with tarfile.open(path, "w:gz") as fod:
+        for model in archive_models:
+            fod.add(model, arcname=os.path.basename(model))
+    return path
+
+
 @pytest.fixture(scope="session")
 def pathway_one_path(data_dir):
     return os.path.join(data_dir, "arrows", "PathwayModelisation-1.0.0.json")
@@ -65,6 +93,11 @@ def pathway_two_path(data_dir):
     return os.path.join(data_dir, "arrows", "PathwayModelisation-2.0.2.json")
 
 
+@pytest.fixture(scope="session")
+def enumerate_pathway_path(data_dir):
+    return os.path.join(data_dir, "arrows", "EnumeratePathway.json")
+
+
 @pytest.fixture(scope="function")
 def node_one_dict():
     return dict(
@@ -0,0 +1,82 @@
+import csv
+import tempfile
+
+from neo4jsbml import batch, memory, snode, srelationship
+
+
+class TestBatch:
+    def test_node_batch(self):
+        nodes = [
+            snode.SNode(id="a", labels=["Species"], properties=dict(name='x \\"y\\"')),
+            snode.SNode(id="b", labels=["Species"], properties=dict(tag="t", charge=1)),
+            snode.SNode(id="c", labels=["Compartment"], properties=dict(tag="t")),
+        ]
+        nodes_batch = batch.NodeBatch.from_nodes(nodes=nodes)
+        assert len(nodes_batch) == 3
+        assert nodes_batch.columns["charge"] == [None, 1, None]
+        assert [x.to_dict() for x in nodes_batch] == [x.to_dict() for x in nodes]
+
+        groups = {}
+        for key, chunk in nodes_batch.to_parameters(size=10):
+            groups.setdefault(key, []).extend(chunk)
+        assert sorted(groups.keys()) == [
+            (("Compartment",), True),
+            (("Species",), False),
+            (("Species",), True),
+        ]
+        assert groups[(("Species",), False)] == [
+            dict(id="a", tag=None, properties=dict(name='x "y"'))
+        ]
+        assert groups[(("Species",), True)][0]["properties"]["charge"] == 1
+
+        with tempfile.NamedTemporaryFile(suffix=".csv") as fod:
+            nodes_batch.to_csv(path=fod.name)
+            with open(fod.name) as fid:
+                rows = list(csv.reader(fid))
+        assert rows[0] == ["id", "labels", "name", "tag", "charge"]
+        assert rows[2] == ["b", "Species", "", "t", "1"]
+
+    def test_relationship_batch(self):
+        rels = [
+            srelationship.SRelationship(
+                id="r%s" % (x,),
+                from_label="Species",
+                to_label="Compartment",
+                from_id="s%s" % (x,),
+                to_id="c",
+                label="IN_COMPARTMENT",
+                properties=dict(tag="t"),
+            )
+            for x in range(5)
+        ]
+        rels_batch = batch.RelationshipBatch.from_relationships(relationships=rels)
+        groups = list(rels_batch.to_parameters(size=2))
+        assert [x for x, _ in groups] == [
+            ("Species", "IN_COMPARTMENT", "Compartment", True)
+        ] * 3
+        assert [len(x) for _, x in groups] == [2, 2, 1]
+        assert [x["from_id"] for _, y in groups for x in y] == [
+            "s%s" % (x,) for x in range(5)
+        ]
+        chunks = list(batch.chunks(rows=list(range(5)), size=2))
+        assert chunks == [[0, 1], [2, 3], [4]]
+
+        mem = memory.Memory()
+        mem.create_nodes(
+            nodes=batch.NodeBatch.from_nodes(
+                nodes=[
+                    snode.SNode(
+                        id=x.from_id, labels=["Species"], properties=dict(tag="t")
+                    )
+                    for x in rels
+                ]
+                + [
+                    snode.SNode(
+                        id="c", labels=["Compartment"], properties=dict(tag="t")
+                    )
+                ]
+            )
+        )
+        mem.create_relationships(relationships=rels_batch)
+        assert len(mem.nodes) == 6
+        assert len(mem.relationships) == 5
@@ -1,3 +1,4 @@
+import json
 import sys
 import tempfile
 
@@ -28,3 +29,56 @@ class TestAnalyzingModel:
 
         ret = run(args, show_output=True)
         assert ret.returncode == 0
+
+    def test_metrics(self, iml_toy_path, config_path, pathway_one_path):
+        with tempfile.NamedTemporaryFile(suffix=".json") as fod:
+            args = ["python", "-m", __app_name__, "sbml-to-neo4j"]
+            args += ["--input-config-ini", config_path]
+            args += ["--input-arrows-json", pathway_one_path]
+            args += ["--input-model-sbml", iml_toy_path]
+            args += ["--parameter-dry-run"]
+            args += ["--output-metrics-json", fod.name]
+
+            ret = run(args, show_output=True)
+            assert ret.returncode == 0
+            with open(fod.name) as fid:
+                data = json.load(fid)
+        paths = [x["path"] for x in data["phases"]]
+        assert "sbml-to-neo4j" in paths
+        assert "sbml-to-neo4j/format_nodes" in paths
+        assert data["counters"]["nodes"] > 0
+        assert data["cache"]["cache.find_method"]["hits"] > 0
+
+
+class TestStartup:
+    HEAVY_MODULES = ["libsbml", "networkx", "neo4j", "numpy", "scipy"]
+
+    @classmethod
+    def imported_modules(cls, args):
+        ret = run(["python", "-X", "importtime", "-m", __app_name__] + args)
+        modules = []
+        for line in ret.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                modules.append(line.split("|")[-1].strip())
+        return ret, modules
+
+    def test_version(self):
+        ret, modules = TestStartup.imported_modules(args=["version"])
+        assert ret.returncode == 0
+        assert "neo4jsbml.options" in modules
+        for module in TestStartup.HEAVY_MODULES:
+            assert module not in modules
+
+    def test_help(self):
+        for command in [
+            "sbml-to-neo4j",
+            "statistics",
+            "clean",
+            "convert-properties",
+            "stoichiometry",
+            "serve",
+        ]:
+            ret, modules = TestStartup.imported_modules(args=[command, "--help"])
+            assert ret.returncode == 0
+            for module in TestStartup.HEAVY_MODULES:
+                assert module not in modules
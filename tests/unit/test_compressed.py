@@ -0,0 +1,98 @@
+import bz2
+import gzip
+import lzma
+import os
+
+import pytest
+from neo4jsbml import compressed
+
+
+class TestCompressed:
+    def test_compression(self, data_dir, zip_path, tar_path, tmp_path):
+        assert compressed.compression(path="model.xml.gz") == "gzip"
+        assert compressed.compression(path="model.xml.bz2") == "bz2"
+        assert compressed.compression(path="model.xml.xz") == "xz"
+        assert compressed.compression(path="model.xml.zst") == "zstd"
+        assert compressed.compression(path=zip_path) == "zip"
+        assert compressed.compression(path=tar_path) == "tar"
+        assert (
+            compressed.compression(path=os.path.join(data_dir, "model", "L3V2.7-1.xml"))
+            is None
+        )
+        # Detection by leading bytes
+        path = str(tmp_path / "model")
+        with gzip.open(path, "wb") as fod:
+            fod.write(b"<sbml/>")
+        assert compressed.compression(path=path) == "gzip"
+
+    def test_split(self, zip_path, tar_path, iml_toy_path):
+        assert compressed.split(path=iml_toy_path) == (iml_toy_path, None)
+        member = os.path.join(zip_path, "L3V2.7-1.xml")
+        assert compressed.split(path=member) == (zip_path, "L3V2.7-1.xml")
+        assert compressed.exists(path=member)
+        assert compressed.exists(path=os.path.join(tar_path, "L2V5.7-1.xml"))
+        assert compressed.exists(path=os.path.join(zip_path, "missing.xml")) is False
+        assert (
+            compressed.exists(path=os.path.join(iml_toy_path, "missing.xml")) is False
+        )
+
+    @pytest.mark.parametrize(
+        "extension, writer",
+        [(".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)],
+    )
+    def test_open_binary(self, extension, writer, archive_models, tmp_path):
+        with open(archive_models[0], "rb") as fid:
+            data = fid.read()
+        path = str(tmp_path / ("model.xml" + extension))
+        with writer(path, "wb") as fod:
+            fod.write(data)
+        with compressed.open_binary(path=path) as fid:
+            assert fid.read() == data
+        assert compressed.read_text(path=archive_models[0]) == data.decode("utf-8")
+
+    @pytest.mark.parametrize("extension", [".xml", ".xml.gz", ".xml.bz2", ".xml.xz"])
+    def test_open_output(self, extension, tmp_path):
+        path = str(tmp_path / ("model" + extension))
+        with compressed.open_output(path=path) as fod:
+            fod.write(b"<sbml/>")
+        assert compressed.read_text(path=path) == "<sbml/>"
+        with pytest.raises(ValueError):
+            compressed.open_output(path=str(tmp_path / "models.zip"))
+
+    def test_open_zstd(self, archive_models, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        with open(archive_models[0], "rb") as fid:
+            data = fid.read()
+        path = str(tmp_path / "model.xml.zst")
+        with open(path, "wb") as fod:
+            fod.write(zstandard.ZstdCompressor().compress(data))
+        assert compressed.read_text(path=path) == data.decode("utf-8")
+        path = str(tmp_path / "output.xml.zst")
+        with compressed.open_output(path=path) as fod:
+            fod.write(data)
+        assert compressed.read_text(path=path) == data.decode("utf-8")
+
+    def test_open_member(self, zip_path, tar_path, archive_models):
+        for archive in [zip_path, tar_path]:
+            for model in archive_models:
+                with open(model, "rb") as fid:
+                    data = fid.read()
+                path = os.path.join(archive, os.path.basename(model))
+                with compressed.open_binary(path=path) as fid:
+                    assert fid.read() == data
+            with pytest.raises(ValueError):
+                compressed.open_binary(path=archive)
+
+    def test_iter_members(self, zip_path, tar_path, archive_models):
+        names = [os.path.basename(x) for x in archive_models]
+        for archive in [zip_path, tar_path]:
+            sizes = {}
+            for path, fid in compressed.iter_members(path=archive):
+                sizes[path] = len(fid.read())
+            assert sorted(sizes.keys()) == sorted(
+                os.path.join(archive, x) for x in names
+            )
+            for model in archive_models:
+                path = os.path.join(archive, os.path.basename(model))
+                assert sizes[path] == os.path.getsize(model)
+        assert list(compressed.iter_members(path=zip_path, extensions=[".sbml"])) == []
@@ -3,7 +3,7 @@ import os
 import pytest
 from neo4j import GraphDatabase
 
-from neo4jsbml import connect, singleton, snode
+from neo4jsbml import connect, options, singleton, snode
 from conftest import is_connected, is_not_connected
 
 
@@ -21,6 +21,9 @@ class TestConnect:
     def test_uri(self, init_driver):
         assert init_driver.uri == "neo4j://localhost:7687"
 
+    def test_protocols(self):
+        assert options.PROTOCOLS == connect.Connect.PROTOCOLS
+
     @is_connected
     def test_is_connected(self, init_driver):
         assert init_driver.is_connected() is True
@@ -60,3 +63,107 @@ class TestConnect:
         assert con_c.user == "neo4j"
         assert con_c.database == "Instance01"
         assert con_c.password == "thepassword"
+
+    def test_registry(self, init_driver):
+        con_a = connect.Connect(
+            protocol="neo4j", url="localhost", port="7687", user="neo4j"
+        )
+        con_b = connect.Connect(
+            protocol="neo4j",
+            url="localhost",
+            port=7687,
+            user="neo4j",
+            database="other",
+        )
+        assert con_a is init_driver
+        assert con_b is not init_driver
+        assert con_b.database == "other"
+        con_b.close()
+        con_c = connect.Connect(
+            protocol="neo4j",
+            url="localhost",
+            port=7687,
+            user="neo4j",
+            database="other",
+        )
+        assert con_c is not con_b
+
+    def test_create_indexes(self, init_driver, monkeypatch):
+        queries = []
+        monkeypatch.setattr(
+            init_driver, "query", lambda value, **kwargs: queries.append(value)
+        )
+        init_driver.create_indexes(labels=["Species", "Compartment", "Species"])
+        assert queries == [
+            "CREATE INDEX IF NOT EXISTS FOR (n:`Compartment`) ON (n.tag)",
+            "CREATE INDEX IF NOT EXISTS FOR (n:`Compartment`) ON (n.tag, n.id)",
+            "CREATE INDEX IF NOT EXISTS FOR (n:`Species`) ON (n.tag)",
+            "CREATE INDEX IF NOT EXISTS FOR (n:`Species`) ON (n.tag, n.id)",
+        ]
+
+    def test_clean(self, init_driver, monkeypatch):
+        calls = []
+        # Nodes deleted by each query of Species, chunks of 10 nodes
+        deleted = {"Species": [10, 10, 5], "Compartment": [0]}
+
+        def _query(value, parameters=None, **kwargs):
+            calls.append((value, parameters))
+            if value.startswith("CALL db.labels()"):
+                return [dict(label="Species"), dict(label="Compartment")]
+            if "DETACH DELETE" not in value:
+                return [dict(count=25)]
+            label = "Species" if "Species" in value else "Compartment"
+            return [dict(count=deleted[label].pop(0))]
+
+        monkeypatch.setattr(init_driver, "query", _query)
+        init_driver.clean(tag="a", chunk_size=1)
+        counts = [x for x in calls if x[0].endswith("RETURN count(n) AS count")]
+        counts = [x for x in counts if "DETACH DELETE" not in x[0]]
+        assert counts == [
+            ("MATCH (n) WHERE n.tag = $tag RETURN count(n) AS count", dict(tag="a"))
+        ]
+        deletes = [x for x in calls if "DETACH DELETE" in x[0]]
+        assert len(deletes) == 4
+        assert deletes[0][0] == (
+            "MATCH (n:`Species`) WHERE n.tag = $tag WITH n LIMIT $limit"
+            " CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF $size ROWS"
+            " RETURN count(n) AS count"
+        )
+        assert deletes[0][1] == dict(tag="a", limit=10, size=1)
+        assert deletes[-1][0].startswith("MATCH (n:`Compartment`) WHERE n.tag = $tag")
+        assert deleted == {"Species": [], "Compartment": []}
+
+        calls.clear()
+        deleted = {"Species": [3], "Compartment": [0]}
+        init_driver.clean(chunk_size=1)
+        assert [x[0].split(" RETURN")[0] for x in calls] == [
+            "MATCH (n)",
+            "MATCH (n) WITH n LIMIT $limit CALL { WITH n DETACH DELETE n }"
+            " IN TRANSACTIONS OF $size ROWS",
+        ]
+
+    def test_query_stoichiometry(self, init_driver, monkeypatch):
+        calls = []
+        row = dict(reaction="R1", species="A", type="HAS_REACTANT", stoichiometry=2.0)
+
+        def _query(value, parameters=None, **kwargs):
+            calls.append((value, parameters))
+            return [row]
+
+        monkeypatch.setattr(init_driver, "query", _query)
+        types = ["HAS_REACTANT", "HAS_PRODUCT"]
+        assert init_driver.query_stoichiometry(types=types, tag="a") == [row]
+        que, params = calls[-1]
+        # Undirected, the species references may point to the reaction
+        assert que.startswith(
+            "MATCH (r:Reaction)-[rel]-(s) WHERE type(rel) IN $types AND r.tag = $tag "
+        )
+        assert "OPTIONAL MATCH (s)-[:HAS_SPECIES]->(sp:Species)" in que
+        assert "coalesce(sp.id, s.id) AS species" in que
+        assert "coalesce(s.stoichiometry, rel.stoichiometry, 1)" in que
+        assert params == dict(types=types, tag="a")
+
+        init_driver.query_stoichiometry(types=types)
+        que, params = calls[-1]
+        assert "r.tag" not in que
+        assert params["tag"] is None
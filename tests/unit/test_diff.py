@@ -0,0 +1,61 @@
+from neo4jsbml import diff, snode, srelationship
+
+
+class TestDiff:
+    def test_from_nodes(self):
+        nodes = [
+            snode.SNode(id="a", labels=["Species"], properties=dict(name="A", tag="t")),
+            snode.SNode(id="b", labels=["Species"], properties=dict(name="B", tag="t")),
+            snode.SNode(
+                id="c", labels=["Species"], properties=dict(sboTerm=1, tag="t")
+            ),
+        ]
+        records = [
+            dict(labels=["Species"], properties=dict(id="a", name="A", tag="t")),
+            dict(labels=["Species"], properties=dict(id="b", name="b", tag="t")),
+            dict(labels=["Species"], properties=dict(id="d", name="D", tag="t")),
+        ]
+        res = diff.Diff.from_nodes(nodes=nodes, records=records)
+        assert [x.id for x in res.creates] == ["c"]
+        assert [x.id for x in res.updates] == ["b"]
+        assert [x.id for x in res.deletes] == ["d"]
+        assert res.is_empty() is False
+
+    def test_from_nodes_string(self):
+        nodes = [
+            snode.SNode(
+                id="a", labels=["Compartment"], properties=dict(size=1.0, tag="t")
+            )
+        ]
+        records = [
+            dict(labels=["Compartment"], properties=dict(id="a", size="1.0", tag="t"))
+        ]
+        res = diff.Diff.from_nodes(nodes=nodes, records=records)
+        assert res.is_empty()
+
+    def test_from_relationships(self):
+        rels = [
+            srelationship.SRelationship(
+                id="",
+                from_label="Species",
+                to_label="Compartment",
+                from_id="a",
+                to_id="c",
+                label="IN_COMPARTMENT",
+                properties=dict(tag="t"),
+            )
+        ]
+        records = [
+            dict(
+                label="IN_COMPARTMENT",
+                from_label="Species",
+                to_label="Compartment",
+                from_id="b",
+                to_id="c",
+                properties=dict(tag="t"),
+            )
+        ]
+        res = diff.Diff.from_relationships(relationships=rels, records=records)
+        assert [x.from_id for x in res.creates] == ["a"]
+        assert res.updates == []
+        assert [x.from_id for x in res.deletes] == ["b"]
@@ -0,0 +1,230 @@
+import os
+import tempfile
+
+import libsbml
+import pytest
+from neo4jsbml import (
+    arrows,
+    backend,
+    compressed,
+    memory,
+    pipeline,
+    sbml,
+    snode,
+    srelationship,
+)
+
+
+class TestMemory:
+    def test_backend(self):
+        assert isinstance(memory.Memory(), backend.Backend)
+
+        class Incomplete(backend.Backend):
+            def is_connected(self) -> bool:
+                return True
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_create(self):
+        mem = memory.Memory()
+        nodes = [
+            snode.SNode(id="a", labels=["Species"], properties=dict(name='x "y"')),
+            snode.SNode(id="c", labels=["Compartment"], properties=dict(size=1.0)),
+        ]
+        rel = srelationship.SRelationship(
+            id="r",
+            from_label="Species",
+            to_label="Compartment",
+            from_id="a",
+            to_id="c",
+            label="IN_COMPARTMENT",
+            properties={},
+        )
+        mem.create_nodes(nodes=nodes)
+        mem.create_nodes(nodes=nodes)
+        mem.create_relationships(relationships=[rel, rel])
+        assert len(mem.nodes) == 2
+        assert len(mem.relationships) == 1
+        datas = mem.query_node(label="Compartment")
+        assert datas[0]["node"] == dict(id="c", size=1.0)
+        neighbors = mem.query_neighbor(elementId=datas[0]["nodeId"])
+        assert neighbors[0]["nodeLabels"] == ["Species"]
+        assert neighbors[0]["nodeNeighbor"]["name"] == 'x "y"'
+        assert neighbors[0]["relationship"][0][1] == "IN_COMPARTMENT"
+        mem.delete_nodes(nodes=nodes[:1])
+        assert len(mem.nodes) == 1
+        assert len(mem.relationships) == 0
+        assert mem.query_neighbor(elementId=datas[0]["nodeId"]) == []
+
+    def test_clean(self):
+        mem = memory.Memory()
+        for tag in ["a", "b"]:
+            mem.create_nodes(
+                nodes=[
+                    snode.SNode(id="s", labels=["Species"], properties=dict(tag=tag)),
+                    snode.SNode(
+                        id="c", labels=["Compartment"], properties=dict(tag=tag)
+                    ),
+                ]
+            )
+            mem.create_relationships(
+                relationships=[
+                    srelationship.SRelationship(
+                        id="r",
+                        from_label="Species",
+                        to_label="Compartment",
+                        from_id="s",
+                        to_id="c",
+                        label="IN_COMPARTMENT",
+                        properties=dict(tag=tag),
+                    )
+                ]
+            )
+        assert len(mem.nodes) == 4
+        assert len(mem.relationships) == 2
+        mem.clean(tag="a", chunk_size=1)
+        assert sorted(x["properties"]["tag"] for x in mem.nodes.values()) == ["b", "b"]
+        assert [x["properties"]["tag"] for x in mem.relationships.values()] == ["b"]
+        assert mem.query_tagged_nodes(tag="a") == []
+        mem.clean()
+        assert len(mem.nodes) == 0
+        assert len(mem.relationships) == 0
+
+    def test_convert_properties(self):
+        mem = memory.Memory()
+        nodes = [
+            snode.SNode(
+                id="1",
+                labels=["Species"],
+                properties=dict(tag="t", name="12", charge="-1", constant="true"),
+            ),
+            snode.SNode(
+                id="2",
+                labels=["Species"],
+                properties=dict(tag="t", name="glc", charge="2", constant="False"),
+            ),
+            snode.SNode(
+                id="c",
+                labels=["Compartment"],
+                properties=dict(tag="u", size="1.0", volume="nan"),
+            ),
+        ]
+        mem.create_nodes(nodes=nodes)
+        assert mem.convert_properties(tag="t") == 4
+        species = {x["node"]["id"]: x["node"] for x in mem.query_node(label="Species")}
+        assert species["1"] == dict(
+            id="1", tag="t", name="12", charge=-1, constant=True
+        )
+        assert species["2"]["constant"] is False
+        # Other tags are left as is
+        compartment = mem.query_node(label="Compartment")[0]["node"]
+        assert compartment["size"] == "1.0"
+        assert mem.convert_properties() == 1
+        compartment = mem.query_node(label="Compartment")[0]["node"]
+        assert compartment == dict(id="c", tag="u", size=1.0, volume="nan")
+        assert mem.convert_properties() == 0
+
+    def test_round_trip(self, iml_toy_path, pathway_two_path):
+        mem = memory.Memory()
+        arr = arrows.Arrows.from_json(path=pathway_two_path)
+        pipeline.import_model(connection=mem, modelisation=arr, path=iml_toy_path)
+        stats = mem.query_statistics()
+        counts = {x["label"]: x["value.count"] for x in stats["nodes"]}
+        assert counts["Species"] == 4
+        assert counts["Compartment"] == 3
+
+        sfn = sbml.SbmlFromNeo4j.from_specifications(connection=mem)
+        sfn.annotate(
+            modelisation=arrows.Arrows.from_json(path=pathway_two_path, add_id=False)
+        )
+        sfn.conciliate_labels()
+        sfn.extract_entities()
+        with tempfile.NamedTemporaryFile(suffix=".xml") as fod:
+            sfn.to_sbml(path=fod.name)
+            model = libsbml.readSBMLFromFile(fod.name).getModel()
+        expect = libsbml.readSBMLFromFile(iml_toy_path).getModel()
+        assert model.getId() == expect.getId()
+        assert sorted(x.getId() for x in model.getListOfSpecies()) == sorted(
+            x.getId() for x in expect.getListOfSpecies()
+        )
+        assert model.getSpecies("M_dhap_c").getCompartment() == "c"
+
+    def test_round_trip_quotes(self, iml_toy_path, pathway_two_path):
+        mem = memory.Memory()
+        arr = arrows.Arrows.from_json(path=pathway_two_path)
+        pipeline.import_model(connection=mem, modelisation=arr, path=iml_toy_path)
+        name = 'DHAP "c" \\ 1'
+        for node in mem.nodes.values():
+            if node["properties"].get("id") == "M_dhap_c":
+                node["properties"]["name"] = name
+
+        # Export the name, with the quote and the backslash
+        modelisation = arrows.Arrows.from_json(path=pathway_two_path, add_id=False)
+        for node in modelisation.nodes:
+            if "Species" in node.labels:
+                node.properties["name"] = ""
+        sfn = sbml.SbmlFromNeo4j.from_specifications(connection=mem)
+        sfn.annotate(modelisation=modelisation)
+        sfn.conciliate_labels()
+        sfn.extract_entities()
+        with tempfile.NamedTemporaryFile(suffix=".xml") as fod:
+            sfn.to_sbml(path=fod.name)
+            model = libsbml.readSBMLFromFile(fod.name).getModel()
+        assert model.getSpecies("M_dhap_c").getName() == name
+        assert model.getSpecies("M_octapb_c").getName() == "M_octapb_c"
+
+    def test_to_sbml(self, iml_toy_path, pathway_two_path, tmp_path, capfd):
+        mem = memory.Memory()
+        arr = arrows.Arrows.from_json(path=pathway_two_path)
+        pipeline.import_model(connection=mem, modelisation=arr, path=iml_toy_path)
+        sfn = sbml.SbmlFromNeo4j.from_specifications(connection=mem)
+        sfn.annotate(
+            modelisation=arrows.Arrows.from_json(path=pathway_two_path, add_id=False)
+        )
+        sfn.conciliate_labels()
+        sfn.extract_entities()
+        for extension in [".xml.gz", ".xml.bz2", ".xml.xz"]:
+            path = os.path.join(str(tmp_path), "model" + extension)
+            sfn.to_sbml(path=path)
+            doc = libsbml.readSBMLFromString(compressed.read_text(path=path))
+            assert doc.getModel().getNumSpecies() == 4
+        sfn.to_sbml(path="-")
+        doc = libsbml.readSBMLFromString(capfd.readouterr().out)
+        assert doc.getModel().getNumSpecies() == 4
+
+    def test_import_tag(self, iml_toy_path, pathway_two_path):
+        mem = memory.Memory()
+        arr = arrows.Arrows.from_json(path=pathway_two_path)
+        for tag in ["a", "b"]:
+            pipeline.import_model(
+                connection=mem, modelisation=arr, path=iml_toy_path, tag=tag
+            )
+        total = len(mem.nodes)
+        report = pipeline.import_model(
+            connection=mem,
+            modelisation=arr,
+            path=iml_toy_path,
+            tag="a",
+            skip_unchanged=True,
+        )
+        assert report["skipped"] is False
+        report = pipeline.import_model(
+            connection=mem,
+            modelisation=arr,
+            path=iml_toy_path,
+            tag="a",
+            skip_unchanged=True,
+        )
+        assert report["skipped"] is True
+        pipeline.import_model(
+            connection=mem,
+            modelisation=arr,
+            path=iml_toy_path,
+            tag="b",
+            incremental=True,
+        )
+        assert len(mem.nodes) == total + 1
+        mem.clean(tag="a")
+        assert len(mem.query_tagged_nodes(tag="a")) == 0
+        assert len(mem.query_tagged_nodes(tag="b")) > 0
@@ -0,0 +1,46 @@
+import concurrent.futures
+
+from neo4jsbml import metrics
+
+
+class TestMetrics:
+    def test_disabled(self):
+        met = metrics.Metrics()
+        with met.phase(name="a"):
+            met.count(key="x")
+        assert met.to_dict() == dict(phases=[], counters={}, cache={})
+
+    def test_phase(self):
+        met = metrics.Metrics(enabled=True)
+        with met.phase(name="a"):
+            met.count(key="x")
+            for _ in range(3):
+                with met.phase(name="b"):
+                    met.count(key="x", value=2)
+                    met.count(key="cache.c" + metrics.Metrics.CACHE_HIT)
+            met.count(key="cache.c" + metrics.Metrics.CACHE_MISS)
+        data = met.to_dict()
+        phases = {x["path"]: x for x in data["phases"]}
+        assert phases["a"]["calls"] == 1
+        assert phases["a"]["counters"]["x"] == 7
+        assert phases["a/b"]["calls"] == 3
+        assert phases["a/b"]["counters"]["x"] == 6
+        assert phases["a"]["wall_time"] >= phases["a/b"]["wall_time"]
+        assert data["counters"]["x"] == 7
+        assert data["cache"]["cache.c"] == dict(hits=3, misses=1, rate=0.75)
+        met.reset()
+        assert met.to_dict()["phases"] == []
+
+    def test_bind(self):
+        met = metrics.Metrics(enabled=True)
+
+        def _work(value):
+            with met.phase(name="b"):
+                met.count(key="x", value=value)
+
+        with met.phase(name="a"):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(met.bind(_work), [1, 2, 3]))
+        phases = {x["path"]: x for x in met.to_dict()["phases"]}
+        assert phases["a"]["counters"]["x"] == 6
+        assert phases["a/b"]["calls"] == 3
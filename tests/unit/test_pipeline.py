@@ -0,0 +1,78 @@
+import os
+import tempfile
+
+from neo4jsbml import arrows, pipeline
+
+
+class TestPipeline:
+    def test_model_tag(self):
+        assert pipeline.model_tag(path="/a/iML1515.xml.gz") == "iML1515"
+        assert pipeline.model_tag(path="L3V2.7-1.xml") == "L3V2.7-1"
+        assert pipeline.model_tag(path="model.sbml") == "model"
+
+    def test_list_models(self, data_dir):
+        models = pipeline.list_models(path=os.path.join(data_dir, "model"))
+        tags = [tag for _, tag in models]
+        assert "iML1515.toy" in tags
+        assert "e_coli_core" in tags
+
+    def test_list_archive(self, zip_path, tar_path):
+        for archive in [zip_path, tar_path]:
+            models = pipeline.list_archive(path=archive)
+            assert sorted(models) == [
+                (os.path.join(archive, "L2V5.7-1.xml"), "L2V5.7-1"),
+                (os.path.join(archive, "L3V2.7-1.xml"), "L3V2.7-1"),
+            ]
+        models = pipeline.list_models(path=os.path.dirname(zip_path))
+        assert (os.path.join(zip_path, "L3V2.7-1.xml"), "L3V2.7-1") in models
+
+    def test_import_archive(self, zip_path, data_dir):
+        arr = arrows.Arrows.from_json(
+            path=os.path.join(data_dir, "arrows", "L3V2.7-1.json")
+        )
+        reports = pipeline.import_models(
+            connection=None,
+            modelisation=arr,
+            models=pipeline.list_archive(path=zip_path),
+            dry_run=True,
+        )
+        assert [x["status"] for x in reports] == ["success", "success"]
+        assert reports[0]["nodes"] > 0
+
+    def test_read_manifest(self, iml_toy_path):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".tsv") as fod:
+            fod.write("# comment\n")
+            fod.write(iml_toy_path + "\ttoy\n")
+            fod.write("missing.xml\n")
+            fod.flush()
+            models = pipeline.read_manifest(path=fod.name)
+            assert models[0] == (iml_toy_path, "toy")
+            assert models[1] == (
+                os.path.join(os.path.dirname(fod.name), "missing.xml"),
+                "missing",
+            )
+
+    def test_import_models(self, iml_toy_path, pathway_one_path):
+        arr = arrows.Arrows.from_json(path=pathway_one_path)
+        reports = pipeline.import_models(
+            connection=None,
+            modelisation=arr,
+            models=[(iml_toy_path, "toy"), ("missing.xml", "missing")],
+            dry_run=True,
+            workers=2,
+        )
+        assert reports[0]["status"] == "success"
+        assert reports[0]["nodes"] > 0
+        assert reports[1]["status"] == "failure"
+        assert reports[1]["error"] is not None
+
+    def test_fingerprint(self, iml_toy_path, ecore_path, pathway_one_path):
+        arr = arrows.Arrows.from_json(path=pathway_one_path)
+        ident = pipeline.fingerprint(path=iml_toy_path, modelisation=arr, tag="a")
+        assert ident == pipeline.fingerprint(
+            path=iml_toy_path, modelisation=arr, tag="a"
+        )
+        assert ident != pipeline.fingerprint(
+            path=iml_toy_path, modelisation=arr, tag="b"
+        )
+        assert ident != pipeline.fingerprint(path=ecore_path, modelisation=arr, tag="a")
@@ -0,0 +1,46 @@
+import os
+import pstats
+import tempfile
+import tracemalloc
+
+import pytest
+from neo4jsbml import metrics, profiler
+
+
+class TestProfiler:
+    def test_phase_path(self):
+        assert (
+            profiler.Profiler.phase_path(path="/a/run.pstats", phase="cmd/format_nodes")
+            == "/a/run.cmd.format_nodes.pstats"
+        )
+
+    @pytest.mark.parametrize("reset_peak", [True, False])
+    def test_profile(self, monkeypatch, reset_peak):
+        if not reset_peak:
+            # As python 3.8
+            monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cpu_path = os.path.join(tmpdir, "run.pstats")
+            memory_path = os.path.join(tmpdir, "memory.txt")
+            prof = profiler.Profiler(cpu_path=cpu_path, memory_path=memory_path)
+            prof.start()
+            try:
+                with metrics.phase(name="a"):
+                    with metrics.phase(name="b"):
+                        data = [str(x) for x in range(10000)]
+                    data.clear()
+            finally:
+                prof.stop()
+                metrics.METRICS.enabled = False
+                metrics.METRICS.reset()
+            assert pstats.Stats(cpu_path).total_calls > 0
+            stats = pstats.Stats(
+                profiler.Profiler.phase_path(path=cpu_path, phase="a/b")
+            )
+            assert stats.total_calls > 0
+            with open(memory_path) as fid:
+                content = fid.read()
+            assert "# Phase: a/b, calls: 1" in content
+            assert "# Phase: a, calls: 1" in content
+            assert prof._peaks["a"] >= prof._peaks["a/b"] > 0
+            assert prof not in metrics.METRICS.listeners
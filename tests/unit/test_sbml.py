@@ -1,5 +1,8 @@
+import os
+
 import pytest
 
+from neo4jsbml import batch
 from neo4jsbml.sbml import Sbml, SbmlToNeo4j
 from neo4jsbml.snode import SNode
 from neo4jsbml.srelationship import SRelationship
@@ -23,6 +26,76 @@ class TestSbml:
         sbml = SbmlToNeo4j.from_sbml(path=iml_path, tag="test")
         assert sbml.tag == "test"
 
+    def test_load_compressed(self, data_dir, zip_path, tar_path, archive_models):
+        sbml = SbmlToNeo4j.from_sbml(
+            path=os.path.join(data_dir, "model", "e_coli_core.xml.gz")
+        )
+        assert sbml.model.getId() == "e_coli_core"
+        expected = [SbmlToNeo4j.from_sbml(path=x).model.getId() for x in archive_models]
+        for archive in [zip_path, tar_path]:
+            sbml = SbmlToNeo4j.from_sbml(
+                path=os.path.join(archive, os.path.basename(archive_models[0])),
+                tag="test",
+            )
+            assert sbml.model.getId() == expected[0]
+            assert sbml.tag == "test"
+            ids = [x.model.getId() for _, x in SbmlToNeo4j.from_archive(path=archive)]
+            assert sorted(ids) == sorted(expected)
+
+    def test_create_id(self, ecore_path):
+        sbml = SbmlToNeo4j.from_sbml(path=ecore_path)
+        species = sbml.model.getSpecies(0)
+        assert sbml.create_id(value=species) == species.getId()
+        elements = list(sbml.document.getListOfAllElements())
+        ids = [sbml.create_id(value=x) for x in elements]
+        # Anonymous elements, e.g. fbc:and, have distinct ids
+        assert len(set(ids)) == len(elements)
+        # Computed once by element, whatever the python object
+        again = list(sbml.document.getListOfAllElements())
+        assert [sbml.create_id(value=x) for x in again] == ids
+        # Stable from a load to another
+        other = SbmlToNeo4j.from_sbml(path=ecore_path)
+        assert [
+            other.create_id(value=x) for x in other.document.getListOfAllElements()
+        ] == ids
+
+    def test_plugin_objects(self, data_dir):
+        sbml = SbmlToNeo4j.from_sbml(
+            path=os.path.join(data_dir, "model", "L3V1.qual.V1R1.4-2.xml")
+        )
+        assert sbml.plugins == ["qual"]
+        objs = sbml.plugin_objects(obj=sbml.model)
+        assert [x for x, _ in objs] == ["qual"]
+        assert objs[0][1].getPackageName() == "qual"
+        assert sbml.plugin_objects(obj=sbml.document.getModel()) is objs
+        # A compartment can not carry the qual plugin
+        compartment = sbml.model.getCompartment(0)
+        assert sbml.plugin_objects(obj=compartment) == ()
+        assert sbml.candidate_obj_plugin(obj=compartment) == [compartment]
+
+    def test_cast_column(self):
+        kind, values = Sbml.cast_column(values=["1", "-2", "", None])
+        assert kind == "int"
+        assert values == [1, -2, None, None]
+        kind, values = Sbml.cast_column(values=["1", "0.5", "1e-05", "nan"])
+        assert kind == "float"
+        assert values == [1.0, 0.5, 1e-05, None]
+        assert all(isinstance(x, float) for x in values[:3])
+        kind, values = Sbml.cast_column(values=["true", "False", True])
+        assert kind == "bool"
+        assert values == [True, False, True]
+        # A column is typed as a whole
+        kind, values = Sbml.cast_column(values=["12", "cytosol"])
+        assert kind == "str"
+        assert values == ["12", "cytosol"]
+        # The type given is used, unless it no longer matches
+        assert Sbml.cast_column(values=["1", "2"], kind="float") == (
+            "float",
+            [1.0, 2.0],
+        )
+        assert Sbml.cast_column(values=["a"], kind="int") == ("str", ["a"])
+        assert Sbml.cast_column(values=[None, ""]) == ("none", [None, None])
+
     def test_method(self, sbml_iml):
         methods = SbmlToNeo4j.find_method(obj=sbml_iml.document, label="notes")
         assert methods == ["getNotes"]
@@ -67,6 +140,16 @@ class TestSbml:
 
         assert lnodes == res
 
+    def test_format_nodes_processes(self, iml_toy_path, node_two, node_three):
+        sbml_seq = SbmlToNeo4j.from_sbml(path=iml_toy_path, tag="test")
+        nodes_seq = sbml_seq.format_nodes(nodes=[node_two, node_three])
+        sbml_par = SbmlToNeo4j.from_sbml(path=iml_toy_path, tag="test")
+        nodes_par = sbml_par.format_nodes(nodes=[node_two, node_three], processes=2)
+        assert [x.to_dict() for x in nodes_par] == [x.to_dict() for x in nodes_seq]
+        assert sbml_par.node_map_item == sbml_seq.node_map_item
+        assert sbml_par.node_map_label == sbml_seq.node_map_label
+        assert sorted(sbml_par.elements.keys()) == sorted(sbml_seq.elements.keys())
+
     def test_format_relationships_forward(
         self, sbml_toy, rel_one_dict, node_two, node_three
     ):
@@ -106,6 +189,40 @@ class TestSbml:
         ]
         assert lrels == res
 
+    def test_format_relationships_processes(
+        self, iml_toy_path, rel_one_dict, rel_two_dict, node_two, node_three
+    ):
+        rel_one = SRelationship.from_dict(data=rel_one_dict)
+        rel_two = SRelationship.from_dict(data=rel_two_dict)
+        sbml_seq = SbmlToNeo4j.from_sbml(path=iml_toy_path, tag="test")
+        sbml_seq.format_nodes(nodes=[node_two, node_three])
+        rels_seq = sbml_seq.format_relationships(relationships=[rel_one, rel_two])
+        sbml_par = SbmlToNeo4j.from_sbml(path=iml_toy_path, tag="test")
+        sbml_par.format_nodes(nodes=[node_two, node_three])
+        rels_par = sbml_par.format_relationships(
+            relationships=[rel_one, rel_two], processes=2
+        )
+        assert [x.to_dict() for x in rels_par] == [x.to_dict() for x in rels_seq]
+        assert all(x.properties["tag"] == "test" for x in rels_par)
+
+    def test_format_as_batch(
+        self, iml_toy_path, rel_one_dict, rel_two_dict, node_two, node_three
+    ):
+        rels = [SRelationship.from_dict(data=x) for x in [rel_one_dict, rel_two_dict]]
+        sbml_list = SbmlToNeo4j.from_sbml(path=iml_toy_path, tag="test")
+        nodes_list = sbml_list.format_nodes(nodes=[node_two, node_three])
+        rels_list = sbml_list.format_relationships(relationships=rels)
+        sbml_batch = SbmlToNeo4j.from_sbml(path=iml_toy_path, tag="test")
+        nodes_batch = sbml_batch.format_nodes(
+            nodes=[node_two, node_three], as_batch=True
+        )
+        rels_batch = sbml_batch.format_relationships(relationships=rels, as_batch=True)
+        assert isinstance(nodes_batch, batch.NodeBatch)
+        assert isinstance(rels_batch, batch.RelationshipBatch)
+        assert [x.to_dict() for x in nodes_batch] == [x.to_dict() for x in nodes_list]
+        assert [x.to_dict() for x in rels_batch] == [x.to_dict() for x in rels_list]
+        assert sbml_batch.node_map_item == sbml_list.node_map_item
+
     def test_format_relationships_reverse(
         self, sbml_toy, rel_two_dict, node_two, node_three
     ):
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import libsbml
+import pytest
+from neo4jsbml import arrows, memory, pipeline, server
+
+
+@pytest.fixture(scope="function")
+def app():
+    serv = server.Server(connection=memory.Memory(), port=0)
+    serv.start()
+    yield serv
+    serv.stop()
+
+
+class TestServer:
+    @classmethod
+    def request(cls, app, path, data=None):
+        url = "http://%s:%s%s" % (app.address + (path,))
+        body = None if data is None else json.dumps(data).encode("utf8")
+        try:
+            with urllib.request.urlopen(url, data=body, timeout=10) as fid:
+                return fid.status, json.load(fid)
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.load(exc)
+
+    @classmethod
+    def wait(cls, app, job, timeout=60):
+        start = time.time()
+        while time.time() - start < timeout:
+            code, job = TestServer.request(app=app, path="/jobs/" + job["id"])
+            assert code == 200
+            if job["status"] in ["success", "failure"]:
+                return job
+            time.sleep(0.05)
+        raise TimeoutError(job["id"])
+
+    def test_round_trip(self, app, iml_toy_path, pathway_two_path):
+        code, data = TestServer.request(app=app, path="/health")
+        assert code == 200
+        assert data["status"] == "ok"
+
+        params = dict(model=iml_toy_path, arrows=pathway_two_path)
+        code, job = TestServer.request(app=app, path="/import", data=params)
+        assert code == 202
+        job = TestServer.wait(app=app, job=job)
+        assert job["status"] == "success"
+        assert job["result"]["nodes"] > 0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            params = dict(arrows=pathway_two_path, output=os.path.join(tmp, "a.xml"))
+            for _ in range(2):
+                code, job = TestServer.request(app=app, path="/export", data=params)
+                assert code == 202
+                job = TestServer.wait(app=app, job=job)
+                assert job["status"] == "success"
+                model = libsbml.readSBMLFromFile(params["output"]).getModel()
+                assert model.getNumSpecies() == 4
+        assert len(app._arrows) == 2
+        assert len(app._graph_methods) == 1
+
+    def test_errors(self, app, pathway_two_path):
+        params = dict(model="missing.xml", arrows=pathway_two_path)
+        code, data = TestServer.request(app=app, path="/import", data=params)
+        assert code == 400
+        assert "missing.xml" in data["error"]
+        code, data = TestServer.request(app=app, path="/export", data={})
+        assert code == 400
+        code, data = TestServer.request(app=app, path="/unknown", data={})
+        assert code == 404
+        code, data = TestServer.request(app=app, path="/jobs/unknown")
+        assert code == 404
+
+    def test_concurrent_processes(self, iml_toy_path, ecore_path, pathway_two_path):
+        # Jobs mapping different models in pools of workers at the same time
+        expected = {}
+        for path in [iml_toy_path, ecore_path]:
+            expected[path] = pipeline.import_model(
+                connection=memory.Memory(),
+                modelisation=arrows.Arrows.from_json(path=pathway_two_path),
+                path=path,
+                dry_run=True,
+            )
+        app = server.Server(connection=memory.Memory(), workers=2)
+        app.start()
+        try:
+            jobs = []
+            for path in [iml_toy_path, ecore_path] * 4:
+                params = dict(
+                    model=path, arrows=pathway_two_path, dry_run=True, processes=2
+                )
+                code, job = TestServer.request(app=app, path="/import", data=params)
+                assert code == 202
+                jobs.append((path, job))
+            for path, job in jobs:
+                job = TestServer.wait(app=app, job=job)
+                assert job["status"] == "success", job["error"]
+                assert job["result"]["nodes"] == expected[path]["nodes"]
+                assert job["result"]["relationships"] == expected[path]["relationships"]
+        finally:
+            app.stop()
+
+    def test_queue_full(self, iml_toy_path, pathway_two_path):
+        app = server.Server(connection=memory.Memory(), queue_size=1)
+        event = threading.Event()
+        app._run_import = lambda params: event.wait()
+        app.start()
+        try:
+            params = dict(model=iml_toy_path, arrows=pathway_two_path)
+            codes = [
+                TestServer.request(app=app, path="/import", data=params)[0]
+                for _ in range(3)
+            ]
+            assert codes[0] == 202
+            assert codes[-1] == 503
+        finally:
+            event.set()
+            app.stop()
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+from neo4jsbml import arrows, memory, pipeline, shard, singleton
+
+
+@pytest.fixture(scope="function")
+def shards():
+    return shard.Shards(
+        connections=dict(a=memory.Memory(), b=memory.Memory(), c=memory.Memory()),
+        routes=dict(fixed="a"),
+    )
+
+
+class TestShards:
+    def test_route(self, shards):
+        names = [shards.route(tag="tag%s" % (x,)) for x in range(30)]
+        assert names == [shards.route(tag="tag%s" % (x,)) for x in range(30)]
+        assert set(names) == set(["a", "b", "c"])
+        assert shards.route(tag="fixed") == "a"
+        assert shards.connection(tag="fixed") is shards.connections["a"]
+        with pytest.raises(ValueError):
+            shard.Shards(connections=dict(a=memory.Memory()), routes=dict(x="b"))
+
+    def test_merge_statistics(self):
+        datas = [
+            dict(
+                nodes=[{"label": "Species", "value.count": 2}],
+                nodes_by_tag=[dict(label="Species", tag="x", count=2)],
+            ),
+            dict(
+                nodes=[
+                    {"label": "Species", "value.count": 3},
+                    {"label": "Reaction", "value.count": 1},
+                ],
+                nodes_by_tag=[dict(label="Species", tag="y", count=3)],
+            ),
+        ]
+        data = shard.Shards.merge_statistics(datas=datas)
+        assert data["nodes"] == [
+            {"label": "Species", "value.count": 5},
+            {"label": "Reaction", "value.count": 1},
+        ]
+        assert len(data["nodes_by_tag"]) == 2
+
+    def test_import_models(self, shards, iml_toy_path, pathway_two_path):
+        arr = arrows.Arrows.from_json(path=pathway_two_path)
+        models = [(iml_toy_path, "tag%s" % (x,)) for x in range(6)]
+        reports = pipeline.import_models(
+            connection=shards, modelisation=arr, models=models, workers=2
+        )
+        assert all(x["status"] == "success" for x in reports)
+        for report in reports:
+            con = shards.connections[report["shard"]]
+            assert len(con.query_tagged_nodes(tag=report["tag"])) > 0
+        stats = shards.query_statistics(by_tag=True)
+        counts = {x["label"]: x["value.count"] for x in stats["nodes"]}
+        assert counts["Species"] == 4 * len(models)
+        tags = set(x["tag"] for x in stats["nodes_by_tag"])
+        assert tags == set(x[1] for x in models)
+
+    def test_from_config(self, data_dir):
+        singleton.Singleton.clean()
+        shards = shard.Shards.from_config(
+            path=os.path.join(data_dir, "database", "shards.ini")
+        )
+        assert list(shards.connections.keys()) == ["a", "b"]
+        assert shards.connections["a"].database == "models_a"
+        assert shards.connections["a"] is not shards.connections["b"]
+        assert shards.route(tag="iML1515") == "b"
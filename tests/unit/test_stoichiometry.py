@@ -0,0 +1,59 @@
+import libsbml
+import pytest
+from neo4jsbml import arrows, memory, pipeline
+from neo4jsbml.stoichiometry import Stoichiometry
+
+pytest.importorskip("numpy")
+sparse = pytest.importorskip("scipy.sparse")
+
+
+class TestStoichiometry:
+    def test_from_rows(self):
+        rows = [
+            dict(reaction="R1", species="A", type="HAS_REACTANT", stoichiometry=2.0),
+            dict(reaction="R1", species="B", type="HAS_PRODUCT", stoichiometry=1.0),
+            dict(reaction="R2", species="B", type="IS_REACTANT", stoichiometry=1.0),
+            dict(reaction="R2", species="B", type="IS_REACTANT", stoichiometry=1.0),
+            dict(reaction="R2", species="C", type="HAS_PRODUCT", stoichiometry=1.0),
+        ]
+        sto = Stoichiometry.from_rows(rows=rows)
+        assert sto.species.tolist() == ["A", "B", "C"]
+        assert sto.reactions.tolist() == ["R1", "R2"]
+        assert sto.matrix.format == "csr"
+        assert sto.matrix.toarray().tolist() == [[-2.0, 0.0], [1.0, -2.0], [0.0, 1.0]]
+
+    def test_from_backend(self, ecore_path, enumerate_pathway_path, tmp_path):
+        mem = memory.Memory()
+        arr = arrows.Arrows.from_json(path=enumerate_pathway_path)
+        pipeline.import_model(
+            connection=mem, modelisation=arr, path=ecore_path, tag="a"
+        )
+        sto = Stoichiometry.from_backend(connection=mem, tag="a")
+        expected = {}
+        model = libsbml.readSBMLFromFile(ecore_path).getModel()
+        for reaction in model.getListOfReactions():
+            for sign, refs in [
+                (-1, reaction.getListOfReactants()),
+                (1, reaction.getListOfProducts()),
+            ]:
+                for ref in refs:
+                    key = (ref.getSpecies(), reaction.getId())
+                    expected[key] = expected.get(key, 0) + sign * ref.getStoichiometry()
+        coo = sto.matrix.tocoo()
+        found = {
+            (sto.species[x], sto.reactions[y]): z
+            for x, y, z in zip(coo.row, coo.col, coo.data)
+        }
+        assert found == expected
+        assert Stoichiometry.from_backend(connection=mem, tag="b").matrix.shape == (
+            0,
+            0,
+        )
+
+        path = str(tmp_path / "ecore.npz")
+        sto.to_npz(path=path)
+        loaded = Stoichiometry.from_npz(path=path)
+        assert loaded.species.tolist() == sto.species.tolist()
+        assert loaded.reactions.tolist() == sto.reactions.tolist()
+        assert (loaded.matrix != sto.matrix).nnz == 0
+        assert (sparse.load_npz(path) != sto.matrix).nnz == 0
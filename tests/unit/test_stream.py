@@ -0,0 +1,90 @@
+import collections
+import os
+
+import pytest
+from neo4jsbml import arrows, sbml, stream
+
+MODELS = ["L2V5.7-%s" % (x,) for x in range(1, 12)] + [
+    "L3V2.7-%s" % (x,) for x in range(1, 15)
+]
+MODELS += ["L3V1.fbc.V2R1.4-1", "L3V1.groups.V1R1.5-2", "L3V1.qual.V1R1.4-2"]
+
+
+def by_label(entities):
+    data = collections.defaultdict(set)
+    for entity in entities:
+        data[entity.labels[0]].add(entity.id)
+    return data
+
+
+def triples(relationships):
+    return set((x.from_id, x.label, x.to_id) for x in relationships)
+
+
+class TestSbmlStream:
+    def test_cast(self):
+        assert stream.SbmlStream.cast(key="sboTerm", value="SBO:0000247") == 247
+        assert stream.SbmlStream.cast(key="constant", value="true") is True
+        assert stream.SbmlStream.cast(key="constant", value="false") is False
+        assert stream.SbmlStream.cast(key="value", value="-10") == -10
+        assert stream.SbmlStream.cast(key="value", value="8.39") == 8.39
+        assert stream.SbmlStream.cast(key="value", value="1e-3") == 0.001
+        assert stream.SbmlStream.cast(key="name", value="ATP") == "ATP"
+
+    @pytest.mark.parametrize("modelisation", ["pathway_one_path", "pathway_two_path"])
+    def test_format(self, request, modelisation, iml_toy_path, sbml_toy):
+        arr = arrows.Arrows.from_json(path=request.getfixturevalue(modelisation))
+        nodes, rels = stream.SbmlStream(path=iml_toy_path, tag="toy").format(
+            nodes=arr.nodes, relationships=arr.relationships
+        )
+        sbml_toy.tag = "toy"
+        expected_nodes = sbml_toy.format_nodes(nodes=arr.nodes)
+        expected_rels = sbml_toy.format_relationships(relationships=arr.relationships)
+        assert by_label(nodes) == by_label(expected_nodes)
+        assert triples(rels) == triples(expected_rels)
+        assert all(x.properties["tag"] == "toy" for x in nodes + rels)
+        expected = {x.id: x for x in expected_nodes}
+        for node in nodes:
+            assert node.properties["name"] == expected[node.id].properties["name"]
+
+    @pytest.mark.parametrize("name", MODELS)
+    def test_format_model(self, data_dir, name):
+        arr = arrows.Arrows.from_json(
+            path=os.path.join(data_dir, "arrows", name + ".json")
+        )
+        path = os.path.join(data_dir, "model", name + ".xml")
+        nodes, rels = stream.SbmlStream(path=path).format(
+            nodes=arr.nodes, relationships=arr.relationships
+        )
+        expected = sbml.SbmlToNeo4j.from_sbml(path=path)
+        expected_nodes = expected.format_nodes(nodes=arr.nodes)
+        expected_rels = expected.format_relationships(relationships=arr.relationships)
+        assert by_label(nodes) == by_label(expected_nodes)
+        assert triples(rels) == triples(expected_rels)
+
+    def test_create_id(self, data_dir):
+        path = os.path.join(data_dir, "model", "L2V5.7-10.xml")
+        expected = sbml.SbmlToNeo4j.from_sbml(path=path)
+        event = expected.model.getEvent(1)
+        assert stream.SbmlStream.create_id(
+            local="event",
+            attrs={},
+            parent_id=expected.create_id(value=event.getParentSBMLObject()),
+            position=1,
+        ) == expected.create_id(value=event)
+        assert (
+            stream.SbmlStream.create_id(
+                local="eventAssignment", attrs=dict(variable="G2", id="a")
+            )
+            == "G2-a"
+        )
+
+    def test_format_layout(self, data_dir):
+        name = "L3V1.layout.V1R1.4-5"
+        arr = arrows.Arrows.from_json(
+            path=os.path.join(data_dir, "arrows", name + ".json")
+        )
+        with pytest.raises(ValueError):
+            stream.SbmlStream(
+                path=os.path.join(data_dir, "model", name + ".xml")
+            ).format(nodes=arr.nodes, relationships=arr.relationships)